@@ -6,8 +6,7 @@ de expedientes de insolvencia.
 
 __version__ = '1.0.0'
 
-# Importar componentes principales para facilitar su uso
-from .procesador import ProcesadorExpedientes
+__all__ = ['ProcesadorExpedientes', 'init_app']
 
 # Configuración inicial del paquete
 import os
@@ -40,4 +39,14 @@ def init_app():
         print(f"App inicializada en: {APP_DIR}")
         print(f"Versión: {__version__}")
     
-    return True
\ No newline at end of file
+    return True
+
+def __getattr__(nombre):
+    """
+    Importa los componentes principales al primer uso, para no cargar
+    python-docx ni lxml al arrancar la aplicación.
+    """
+    if nombre == 'ProcesadorExpedientes':
+        from .procesador import ProcesadorExpedientes
+        return ProcesadorExpedientes
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""
+Permite ejecutar el procesador sin interfaz gráfica con: python -m app
+"""
+
+import sys
+import multiprocessing
+
+from .cli import main
+
+if __name__ == "__main__":
+    # Necesario para el pool de procesos en ejecutables congelados
+    multiprocessing.freeze_support()
+    sys.exit(main())
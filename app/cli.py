@@ -0,0 +1,186 @@
+"""
+Interfaz de línea de comandos para procesar expedientes sin interfaz gráfica.
+Permite ejecutar lotes programados en un servidor: escribe un registro JSON por
+línea (NDJSON) para cada expediente y termina con un código de salida útil para
+otras herramientas.
+
+Uso:
+    python -m app procesar [opciones]
+    python -m app simular [opciones]
+    python -m app planificar [opciones]
+    python -m app expediente RUTA [opciones]
+    python -m app vigilar [opciones]
+
+Códigos de salida:
+    0: Todos los expedientes terminaron sin error
+    1: Al menos un expediente terminó con error
+    2: Argumentos o configuración inválidos
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from .config import load_config, config_procesador
+from .procesador import ProcesadorExpedientes, ESTADO_ERROR
+from .utils.metricas import MetricasProcesamiento
+from .utils.plan import MOTIVO_ERROR
+
+# Códigos de salida
+SALIDA_OK = 0
+SALIDA_ERRORES = 1
+SALIDA_USO = 2
+
+def crear_parser():
+    """
+    Crea el analizador de argumentos de la línea de comandos.
+
+    Returns:
+        argparse.ArgumentParser: Analizador configurado
+    """
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument("--config", help="Archivo config.ini a usar (por defecto se busca en las ubicaciones habituales)")
+    comun.add_argument("--ruta-expedientes", help="Carpeta que contiene los expedientes")
+    comun.add_argument("--ruta-formatos", help="Carpeta de formatos de los operadores")
+    comun.add_argument("--ruta-log", help="Carpeta de los archivos de log")
+    comun.add_argument("--nivel-log", help="Nivel de log (DEBUG, INFO, WARNING, ERROR, CRITICAL)")
+    comun.add_argument("--workers", type=int, help="Número de procesos en paralelo (0 = todos los núcleos)")
+    comun.add_argument("--force", "--forzar", dest="forzar", action="store_true",
+                       help="Procesar también los expedientes que no cambiaron desde la última ejecución")
+    comun.add_argument("--resume", "--reanudar", dest="reanudar", action="store_true",
+                       help="Continuar el lote interrumpido, omitiendo los expedientes que ya terminó")
+    comun.add_argument("--salida", help="Archivo donde escribir los registros NDJSON (por defecto, la salida estándar)")
+    comun.add_argument("--metricas", dest="archivo_metricas",
+                       help="Archivo JSON donde guardar el resumen de rendimiento de la ejecución")
+    comun.add_argument("--coordinacion", choices=["concesiones", "particion"],
+                       help="Repartir los expedientes con otros equipos que procesan la misma carpeta")
+    comun.add_argument("--nodo", help="Nombre de este equipo en las concesiones (por defecto, el nombre en la red)")
+    comun.add_argument("--nodos", type=int, help="Número de equipos que se reparten el lote (modo partición)")
+    comun.add_argument("--numero-nodo", type=int, help="Número de este equipo, de 1 a --nodos (modo partición)")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app",
+        description="Procesador de expedientes de insolvencia (modo sin interfaz gráfica)"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    subparsers.add_parser("procesar", parents=[comun],
+                          help="Procesar todos los expedientes de la ruta")
+    subparsers.add_parser("simular", aliases=["dry-run"], parents=[comun],
+                          help="Extraer la información sin generar documentos")
+    planificar = subparsers.add_parser("planificar", aliases=["plan"], parents=[comun],
+                                       help="Informar qué se haría con cada expediente, por motivo, "
+                                            "sin generar documentos (usa todos los núcleos)")
+    planificar.add_argument("--reporte", help="Archivo JSON donde guardar el plan")
+    expediente = subparsers.add_parser("expediente", parents=[comun],
+                                       help="Procesar un único expediente")
+    expediente.add_argument("ruta", help="Ruta de la carpeta del expediente")
+    expediente.add_argument("--simular", action="store_true", help="No generar documentos")
+    vigilar = subparsers.add_parser("vigilar", parents=[comun],
+                                    help="Procesar los expedientes a medida que aparecen (hasta Ctrl+C)")
+    vigilar.add_argument("--sin-pendientes", action="store_true",
+                         help="No procesar los expedientes pendientes antes de empezar a vigilar")
+    return parser
+
+def construir_config(args):
+    """
+    Construye la configuración del procesador desde config.ini y los argumentos.
+
+    Args:
+        args (argparse.Namespace): Argumentos de la línea de comandos
+
+    Returns:
+        dict: Configuración para ProcesadorExpedientes
+    """
+    config = config_procesador(load_config(args.config) if args.config else None)
+    for clave in ('ruta_expedientes', 'ruta_formatos', 'ruta_log', 'nivel_log', 'workers', 'archivo_metricas',
+                  'coordinacion', 'nodo', 'nodos', 'numero_nodo'):
+        valor = getattr(args, clave)
+        if valor is not None:
+            config[clave] = valor
+
+    config['forzar'] = args.forzar
+    if args.reanudar:
+        config['reanudar'] = True
+    config['simular'] = args.comando in ('simular', 'dry-run') or getattr(args, 'simular', False)
+    # La salida estándar queda reservada para los registros NDJSON
+    config['log_consola'] = False
+    return config
+
+def escribir_registro(salida, resultado):
+    """
+    Escribe el resultado de un expediente como una línea JSON.
+
+    Args:
+        salida (file): Flujo de texto de destino
+        resultado (dict): Resultado del procesamiento del expediente
+    """
+    salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    salida.flush()
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argv (list): Argumentos (por defecto, sys.argv[1:])
+
+    Returns:
+        int: Código de salida
+    """
+    args = crear_parser().parse_args(argv)
+
+    if args.config and not os.path.exists(args.config):
+        print(f"No existe el archivo de configuración: {args.config}", file=sys.stderr)
+        return SALIDA_USO
+
+    config = construir_config(args)
+    ruta_revisar = args.ruta if args.comando == "expediente" else config['ruta_expedientes']
+    if not os.path.isdir(ruta_revisar):
+        print(f"La ruta no existe o no es una carpeta: {ruta_revisar}", file=sys.stderr)
+        return SALIDA_USO
+
+    salida = open(args.salida, 'w', encoding='utf-8') if args.salida else sys.stdout
+    try:
+        procesador = ProcesadorExpedientes(config)
+
+        if args.comando == "vigilar":
+            try:
+                procesador.vigilar(
+                    al_procesar=lambda resultado: escribir_registro(salida, resultado),
+                    procesar_pendientes=not args.sin_pendientes
+                )
+            except KeyboardInterrupt:
+                pass
+            return SALIDA_OK
+
+        if args.comando == "expediente":
+            resultado = procesador.procesar_expediente_resultado(os.path.abspath(args.ruta))
+            escribir_registro(salida, resultado)
+            if args.archivo_metricas:
+                metricas = MetricasProcesamiento()
+                metricas.agregar_resultado(resultado)
+                metricas.finalizar()
+                metricas.guardar(args.archivo_metricas)
+            return SALIDA_ERRORES if resultado['estado'] == ESTADO_ERROR else SALIDA_OK
+
+        if args.comando in ("planificar", "plan"):
+            plan = procesador.planificar(
+                al_procesar=lambda resultado: escribir_registro(salida, resultado),
+                workers=args.workers
+            )
+            print(plan.reporte(), file=sys.stderr)
+            if args.reporte:
+                plan.guardar(args.reporte)
+            return SALIDA_ERRORES if plan.resumen()['motivos'][MOTIVO_ERROR] else SALIDA_OK
+
+        procesados, ignorados, errores = procesador.procesar_expedientes(
+            al_procesar=lambda resultado: escribir_registro(salida, resultado)
+        )
+        print(f"Procesados: {procesados}, Al día: {procesador.expedientes_al_dia}, "
+              f"Ignorados: {ignorados}, Errores: {errores}", file=sys.stderr)
+        return SALIDA_ERRORES if errores else SALIDA_OK
+
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
@@ -5,11 +5,12 @@ Contiene módulos y variables para la configuración global de la aplicación.
 
 import os
 import sys
+import threading
 import configparser
 from pathlib import Path
 
 # Importar configuraciones principales
-from .settings import DEBUG, LOG_LEVEL, DEFAULT_PATHS
+from .settings import DEBUG, LOG_LEVEL, DEFAULT_PATHS, OPERATOR_CONFIG
 try:
     from .version import VERSION
 except ImportError:
@@ -53,5 +54,84 @@ def load_config(config_file=None):
     
     return config
 
-# Cargar configuración inicial
-CONFIG = load_config()
\ No newline at end of file
+# Configuración inicial, cargada al primer acceso a CONFIG
+_CONFIG = None
+_bloqueo_config = threading.Lock()
+
+def obtener_config():
+    """
+    Obtiene la configuración inicial, cargándola la primera vez.
+    Es seguro llamarla desde varios hilos.
+    
+    Returns:
+        configparser.ConfigParser: Objeto con la configuración cargada
+    """
+    global _CONFIG
+    if _CONFIG is None:
+        with _bloqueo_config:
+            if _CONFIG is None:
+                _CONFIG = load_config()
+    return _CONFIG
+
+def __getattr__(nombre):
+    """Permite seguir usando 'from app.config import CONFIG' con carga diferida."""
+    if nombre == 'CONFIG':
+        return obtener_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+def config_procesador(config=None):
+    """
+    Construye el diccionario de configuración de ProcesadorExpedientes a partir
+    de un archivo .ini cargado.
+    
+    Args:
+        config (configparser.ConfigParser): Configuración cargada. Si es None,
+                                           se usa CONFIG.
+    
+    Returns:
+        dict: Configuración con rutas y parámetros para el procesador
+    """
+    if config is None:
+        config = obtener_config()
+    
+    # Las rutas relativas se interpretan desde la carpeta raíz de la aplicación
+    raiz = os.path.dirname(DEFAULT_PATHS["LOGS"])
+    ruta_log = config.get("RUTAS", "ruta_log", fallback="") or DEFAULT_PATHS["LOGS"]
+    if not os.path.isabs(ruta_log):
+        ruta_log = os.path.join(raiz, ruta_log)
+    
+    return {
+        'ruta_expedientes': config.get("RUTAS", "ruta_expedientes", fallback="") or DEFAULT_PATHS["EXPEDIENTES"],
+        'ruta_formatos': config.get("RUTAS", "ruta_formatos", fallback="") or DEFAULT_PATHS["FORMATOS"],
+        'ruta_log': ruta_log,
+        'nivel_log': config.get("PROCESAMIENTO", "nivel_log", fallback=LOG_LEVEL),
+        'log_asincrono': config.getboolean("PROCESAMIENTO", "log_asincrono", fallback=True),
+        'log_max_mb': config.getfloat("PROCESAMIENTO", "log_max_mb", fallback=10),
+        'workers': config.getint("PROCESAMIENTO", "workers", fallback=1),
+        'max_tareas_worker': config.getint("PROCESAMIENTO", "max_tareas_worker", fallback=500),
+        'memoria_maxima': config.getfloat("AVANZADO", "memoria_maxima", fallback=0),
+        'timeout_conexion': config.getfloat("AVANZADO", "timeout_conexion", fallback=30),
+        'intentos_reconexion': config.getint("AVANZADO", "intentos_reconexion", fallback=3),
+        'metricas': config.getboolean("PROCESAMIENTO", "metricas", fallback=True),
+        'guardar_metricas': config.getboolean("PROCESAMIENTO", "guardar_metricas", fallback=False),
+        'cache_extraccion': config.getboolean("PROCESAMIENTO", "cache_extraccion", fallback=True),
+        'cache_max_dias': config.getfloat("PROCESAMIENTO", "cache_max_dias", fallback=90),
+        'cache_max_entradas': config.getint("PROCESAMIENTO", "cache_max_entradas", fallback=50000),
+        'diario_lote': config.getboolean("PROCESAMIENTO", "diario_lote", fallback=True),
+        'reanudar': config.getboolean("PROCESAMIENTO", "reanudar", fallback=False),
+        'canalizacion': config.getboolean("PROCESAMIENTO", "canalizacion", fallback=True),
+        'hilos_lectura': config.getint("PROCESAMIENTO", "hilos_lectura", fallback=4),
+        'max_anticipados': config.getint("PROCESAMIENTO", "max_anticipados", fallback=8),
+        'intervalo_vigilancia': config.getfloat("PROCESAMIENTO", "intervalo_vigilancia", fallback=5),
+        'espera_vigilancia': config.getfloat("PROCESAMIENTO", "espera_vigilancia", fallback=3),
+        'coordinacion': config.get("COORDINACION", "modo", fallback=""),
+        'nodo': config.get("COORDINACION", "nodo", fallback=""),
+        'ruta_concesiones': config.get("COORDINACION", "ruta_concesiones", fallback=""),
+        'duracion_concesion': config.getfloat("COORDINACION", "duracion_concesion", fallback=300),
+        'nodos': config.getint("COORDINACION", "nodos", fallback=1),
+        'numero_nodo': config.getint("COORDINACION", "numero_nodo", fallback=1),
+        'archivo_documentos': config.get("DOCUMENTOS", "archivo_documentos", fallback=""),
+        'archivo_mapeo': config.get("OPERADORES", "archivo_mapeo", fallback=""),
+        'actualizacion_mapeo': config.getfloat("OPERADORES", "actualizacion_mapeo",
+                                               fallback=OPERATOR_CONFIG["AUTO_REFRESH"])
+    }
@@ -69,11 +69,93 @@ DOCUMENT_CONFIG = {
     "ACCEPTANCE_FILE_PATTERN": "Aceptación de solicitud",
     
     # Patrones de texto para extracción de información
+    # (se pueden reemplazar desde la sección [PATRONES] de config.ini)
     "PATTERNS": {
         "DEUDOR": r'Deudora?\s*\n*\s*([A-Z\s]+)\s*\n*\s*CC No',
+        "DEUDOR_ALTERNATIVO": r'[A-Z\s]{10,}',
         "CEDULA": r'CC No\.\s*(\d+(?:\.\d+)*)',
+        "CEDULA_ALTERNATIVA": r'cédula de ciudadanía número\s*(\d+(?:\.\d+)*)',
         "RADICADO": r'Radicado:\s*([0-9-]+)',
-        "OPERADOR": r'([A-Z\s]{10,}GUERRERO|[A-Z\s]{10,})'
+        "FECHA_PRESENTACION": r'presentó solicitud de negociación de sus deudas.*?el día (\d+ de [a-zA-Z]+ de \d+)',
+        "FECHA_AUDIENCIA": r'audiencia de negociación de pasivos\s*.*?el día (\d+.*?\d+)',
+        "OPERADOR": r'([A-Z\s]{10,}GUERRERO|[A-Z\s]{10,})',
+        "OPERADOR_FIRMA": r'DIANA PATRICIA MANGA GUERRERO|[A-Z][A-Z ]{9,}GUERRERO'
+    },
+    
+    # Campos extraídos del archivo de aceptación. Cada campo prueba sus reglas en
+    # orden; una regla aplica un patrón de PATTERNS solo dentro de una ventana de
+    # texto: alrededor de un texto literal ('ancla', con 'antes'/'despues'
+    # caracteres) o al inicio/final del documento ('posicion' y 'longitud').
+    # 'ultima' toma la última coincidencia de la ventana en lugar de la primera.
+    "EXTRACTION_FIELDS": {
+        "nombre_deudor": {
+            "requerido": True,
+            "reglas": [
+                {"patron": "DEUDOR", "ancla": "CC No", "antes": 300, "despues": 5},
+                {"patron": "DEUDOR_ALTERNATIVO", "posicion": "inicio", "longitud": 3000}
+            ]
+        },
+        "cedula": {
+            "requerido": True,
+            "reglas": [
+                {"patron": "CEDULA", "ancla": "CC No", "despues": 40},
+                {"patron": "CEDULA_ALTERNATIVA", "ancla": "cédula de ciudadanía número", "despues": 60}
+            ]
+        },
+        "radicado": {
+            "requerido": True,
+            "reglas": [
+                {"patron": "RADICADO", "ancla": "Radicado:", "despues": 60}
+            ]
+        },
+        "fecha_presentacion": {
+            "requerido": False,
+            "reglas": [
+                {"patron": "FECHA_PRESENTACION", "ancla": "presentó solicitud de negociación de sus deudas",
+                 "despues": 400}
+            ]
+        },
+        "fecha_audiencia": {
+            "requerido": False,
+            "reglas": [
+                {"patron": "FECHA_AUDIENCIA", "ancla": "audiencia de negociación de pasivos", "despues": 400}
+            ]
+        },
+        "operador": {
+            "requerido": True,
+            "reglas": [
+                {"patron": "OPERADOR_FIRMA", "posicion": "final", "longitud": 3000, "ultima": True}
+            ]
+        }
+    },
+    
+    # Conjuntos de reemplazos para los tipos de documento. 'nuevo' puede usar los
+    # campos extraídos entre llaves; el reemplazo se omite si el campo no se extrajo
+    "REPLACEMENT_SETS": {
+        "NOTIFICACION": [
+            {"original": "Señores", "nuevo": "Señor(a)"},
+            {"original": "**Deudor:**", "nuevo": "**Deudor:** {nombre_deudor}"},
+            {"original": "**C.C.**", "nuevo": "**C.C.** {cedula}"},
+            {"original": "**Radicado:**", "nuevo": "**Radicado:** {radicado}"},
+            {"original": "el día **\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_**",
+             "nuevo": "el día **{fecha_presentacion}**"},
+            {"original": "el día **\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_-**",
+             "nuevo": "el día **{fecha_audiencia}**"}
+        ]
+    },
+    
+    # Documentos generados para cada expediente con una sola extracción, en orden
+    # (el primero es el principal). 'formato' es un formato común (ruta relativa a
+    # la carpeta de formatos); si es None se usa el del operador según el mapeo.
+    # 'operadores' asigna un formato propio a algunos operadores. Se pueden añadir
+    # tipos desde el JSON indicado en [DOCUMENTOS] archivo_documentos de config.ini
+    "DOCUMENT_TYPES": {
+        "notificacion": {
+            "formato": None,
+            "operadores": {},
+            "reemplazos": "NOTIFICACION",
+            "salida": "Notificación_{nombre_deudor}.docx"
+        }
     }
 }
 
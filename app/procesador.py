@@ -3,22 +3,136 @@ Módulo principal para el procesamiento de expedientes.
 Contiene la clase ProcesadorExpedientes que maneja la lógica de negocio.
 """
 
+import io
+import gc
 import os
-import re
 import json
+import time
+import hashlib
 import logging
-from docx import Document
+import threading
+import multiprocessing
 import traceback
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Importar utilidades propias
 try:
-    from .utils.docx_helper import replace_text_in_doc, save_document
-    from .utils.logger import setup_logger
+    from .config import CONFIG
+    from .config.settings import DOCUMENT_CONFIG, OPERATOR_CONFIG
+    from .utils.docx_helper import replace_text_in_doc, save_document, extract_paragraph_texts
+    from .utils.logger import (setup_logger, obtener_cola_log, configurar_logger_worker, MAX_MB_LOG,
+                               LOGGERS_MODULOS)
+    from .utils.manifiesto import ManifiestoProcesamiento, huella_archivo
+    from .utils.plantillas import CachePlantillas
+    from .utils.extraccion import MotorExtraccion
+    from .utils.operadores import IndiceOperadores, VERSION_DETECCION
+    from .utils.mapeo_operadores import MapeoOperadores
+    from .utils.cache_extraccion import CacheExtraccion, MAX_DIAS_CACHE, MAX_ENTRADAS_CACHE
+    from .utils.metricas import MetricasProcesamiento, Etapa, SIN_MEDICION
+    from .utils.directorios import IndiceExpedientes, escanear_expediente, CARPETA_NOTIFICACIONES
+    from .utils.vigilancia import crear_observador
+    from .utils.canalizacion import HilosES, HILOS_LECTURA, MAX_ANTICIPADOS
+    from .utils.documentos import cargar_tipos_documento, leer_archivo_documentos, firma_tipos
+    from .utils.acceso_archivos import AccesoArchivos, TiempoAgotado, TIMEOUT_CONEXION, INTENTOS_RECONEXION
+    from .utils.coordinacion import (ConcesionesExpedientes, en_particion, MODO_CONCESIONES, MODO_PARTICION,
+                                    CARPETA_CONCESIONES, DURACION_CONCESION)
+    from .utils.diario import DiarioLote, leer_lote_interrumpido
+    from .utils.memoria import ControlMemoria, memoria_actual_mb, MAX_TAREAS_WORKER, INTERVALO_MEDICION
+    from .utils.plan import (PlanProcesamiento, MOTIVO_GENERAR, MOTIVO_AL_DIA, MOTIVO_IGNORADO_00,
+                             MOTIVO_SIN_CUADERNO, MOTIVO_SIN_ACEPTACION, MOTIVO_DATOS_FALTANTES,
+                             MOTIVO_OPERADOR_DESCONOCIDO, MOTIVO_TIEMPO_AGOTADO, MOTIVO_OTRO_NODO,
+                             MOTIVO_ERROR)
 except ImportError:
     # En caso de ejecutarse directamente
-    from utils.docx_helper import replace_text_in_doc, save_document
-    from utils.logger import setup_logger
+    from config import CONFIG
+    from config.settings import DOCUMENT_CONFIG, OPERATOR_CONFIG
+    from utils.docx_helper import replace_text_in_doc, save_document, extract_paragraph_texts
+    from utils.logger import (setup_logger, obtener_cola_log, configurar_logger_worker, MAX_MB_LOG,
+                              LOGGERS_MODULOS)
+    from utils.manifiesto import ManifiestoProcesamiento, huella_archivo
+    from utils.plantillas import CachePlantillas
+    from utils.extraccion import MotorExtraccion
+    from utils.operadores import IndiceOperadores, VERSION_DETECCION
+    from utils.mapeo_operadores import MapeoOperadores
+    from utils.cache_extraccion import CacheExtraccion, MAX_DIAS_CACHE, MAX_ENTRADAS_CACHE
+    from utils.metricas import MetricasProcesamiento, Etapa, SIN_MEDICION
+    from utils.directorios import IndiceExpedientes, escanear_expediente, CARPETA_NOTIFICACIONES
+    from utils.vigilancia import crear_observador
+    from utils.canalizacion import HilosES, HILOS_LECTURA, MAX_ANTICIPADOS
+    from utils.documentos import cargar_tipos_documento, leer_archivo_documentos, firma_tipos
+    from utils.acceso_archivos import AccesoArchivos, TiempoAgotado, TIMEOUT_CONEXION, INTENTOS_RECONEXION
+    from utils.coordinacion import (ConcesionesExpedientes, en_particion, MODO_CONCESIONES, MODO_PARTICION,
+                                   CARPETA_CONCESIONES, DURACION_CONCESION)
+    from utils.diario import DiarioLote, leer_lote_interrumpido
+    from utils.memoria import ControlMemoria, memoria_actual_mb, MAX_TAREAS_WORKER, INTERVALO_MEDICION
+    from utils.plan import (PlanProcesamiento, MOTIVO_GENERAR, MOTIVO_AL_DIA, MOTIVO_IGNORADO_00,
+                            MOTIVO_SIN_CUADERNO, MOTIVO_SIN_ACEPTACION, MOTIVO_DATOS_FALTANTES,
+                            MOTIVO_OPERADOR_DESCONOCIDO, MOTIVO_TIEMPO_AGOTADO, MOTIVO_OTRO_NODO,
+                            MOTIVO_ERROR)
+
+# Estados posibles del procesamiento de un expediente
+ESTADO_PROCESADO = "procesado"
+ESTADO_SIMULADO = "simulado"
+ESTADO_AL_DIA = "al_dia"
+ESTADO_IGNORADO = "ignorado"
+ESTADO_OTRO_NODO = "otro_nodo"
+ESTADO_ERROR = "error"
+
+# Instancia del procesador propia de cada proceso del pool y evento de
+# cancelación compartido con el proceso principal (ver _inicializar_worker)
+_procesador_worker = None
+_cancelar_worker = None
+
+def _inicializar_worker(config, cola_log=None, cancelar=None):
+    """
+    Inicializa el estado de un proceso del pool creando su propio procesador.
+    
+    Args:
+        config (dict): Configuración con rutas y parámetros
+        cola_log (multiprocessing.Queue): Cola del logger del proceso principal.
+                                         Si se indica, el worker no escribe el
+                                         archivo de log directamente.
+        cancelar (multiprocessing.Event): Evento que indica al worker que no
+                                         inicie más expedientes (opcional)
+    """
+    global _procesador_worker, _cancelar_worker
+    _cancelar_worker = cancelar
+    if cola_log is not None:
+        configurar_logger_worker("procesador", cola_log, config.get('nivel_log', 'INFO'), LOGGERS_MODULOS)
+    _procesador_worker = ProcesadorExpedientes(config, workers=1)
+
+def _procesar_lote_worker(rutas_expedientes, entradas):
+    """
+    Procesa un lote de expedientes dentro de un proceso del pool, solapando
+    la E/S con el procesamiento si la canalización está activa. Al terminar,
+    si el worker supera su parte del límite de memoria libera sus cachés.
+    
+    Args:
+        rutas_expedientes (list): Rutas de los expedientes del lote.
+        entradas (list): Estructura de cada expediente según el índice de carpetas
+        
+    Returns:
+        tuple: (resultados en el mismo orden de las rutas, pid del worker,
+                memoria residente del worker en MB o None)
+    """
+    procesador = _procesador_worker
+    if procesador.canalizacion and len(rutas_expedientes) > 1:
+        resultados = list(procesador._procesar_canalizado(rutas_expedientes, entradas, _cancelar_worker))
+    else:
+        resultados = list(procesador._procesar_en_secuencia(rutas_expedientes, entradas, _cancelar_worker))
+    # Las concesiones las cierra el proceso que las tomó
+    for resultado in resultados:
+        procesador._cerrar_concesion(resultado)
+    
+    memoria_mb = memoria_actual_mb()
+    limite_mb = procesador.config.get('memoria_worker')
+    if limite_mb and memoria_mb is not None and memoria_mb > limite_mb:
+        procesador._liberar_memoria()
+        memoria_mb = memoria_actual_mb()
+    return resultados, os.getpid(), memoria_mb
 
 class ProcesadorExpedientes:
     """
@@ -26,57 +140,375 @@ class ProcesadorExpedientes:
     Maneja la extracción de información y generación de documentos.
     """
     
-    def __init__(self, config):
+    def __init__(self, config, workers=None, forzar=None):
         """
         Inicializa el procesador de expedientes.
         
         Args:
             config (dict): Configuración con rutas y parámetros
+            workers (int): Número de procesos para procesar expedientes en paralelo.
+                          Si es None se toma de la configuración ('workers' o
+                          [PROCESAMIENTO] workers). 0 usa todos los núcleos.
+            forzar (bool): Si es True se procesan también los expedientes que el
+                          manifiesto marca como al día. Si es None se toma de
+                          config['forzar'].
+        
+        Claves opcionales de config además de las rutas: 'nivel_log', 'log_consola'
+        (False para no escribir el log en la consola), 'log_asincrono' (False para
+        escribir el log en el mismo hilo), 'log_max_mb', 'workers', 'forzar',
+        'ruta_manifiesto', 'ruta_indice' (índice de carpetas de los expedientes),
+        'diario_lote' (False para no llevar el diario del lote), 'ruta_diario',
+        'reanudar' (True para omitir los expedientes ya terminados de un lote
+        interrumpido, ver diario.py),
+        'archivo_mapeo' (JSON de operadores), 'actualizacion_mapeo' (días),
+        'ruta_cache_mapeo' (operadores detectados en los formatos),
+        'cache_extraccion' (False para no usar la caché de extracciones),
+        'ruta_cache_extraccion', 'cache_max_dias', 'cache_max_entradas', 'canalizacion'
+        (False para leer y escribir cada documento en secuencia), 'hilos_lectura',
+        'max_anticipados' (expedientes leídos por adelantado), 'intervalo_vigilancia' y
+        'espera_vigilancia' (segundos, ver vigilar), 'memoria_maxima' (MB de toda la
+        ejecución, 0 = sin límite), 'max_tareas_worker' (expedientes por worker antes
+        de reemplazarlo), 'timeout_conexion' (segundos máximos de cada lectura o
+        escritura, 0 = sin plazo), 'intentos_reconexion', 'sistema_archivos'
+        (operaciones sobre el disco, ver SistemaArchivos), 'coordinacion'
+        ('concesiones' o 'particion' para repartir el lote con otros equipos, ver
+        coordinacion.py), 'nodo', 'duracion_concesion', 'ruta_concesiones', 'nodos'
+        y 'numero_nodo', 'documentos' (tipos de documento
+        a generar, como DOCUMENT_CONFIG["DOCUMENT_TYPES"]), 'archivo_documentos' (JSON
+        con tipos y conjuntos de reemplazos adicionales), 'simular'
+        (True para extraer la información sin generar documentos), 'metricas'
+        (False para no medir las etapas), 'guardar_metricas' y 'archivo_metricas'
+        (JSON donde guardar el resumen de rendimiento de cada ejecución).
         """
+        self.config = dict(config)
         self.ruta_base = config.get('ruta_expedientes', '')
         self.ruta_formatos = config.get('ruta_formatos', '')
         self.ruta_salida = config.get('ruta_salida', self.ruta_base)
         
+        self.ruta_log = config.get('ruta_log', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs'))
+        
         # Configurar logger
         self.logger = setup_logger(
             nombre="procesador", 
             nivel=config.get('nivel_log', 'INFO'),
-            ruta_log=config.get('ruta_log', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs'))
+            ruta_log=self.ruta_log,
+            console=config.get('log_consola', True),
+            asincrono=config.get('log_asincrono', True),
+            max_mb=config.get('log_max_mb', MAX_MB_LOG),
+            modulos=LOGGERS_MODULOS
         )
         
+        # En modo simulación no se crea ni se modifica ningún documento
+        self.simular = bool(config.get('simular', False))
+        
+        # Número de procesos para el procesamiento en lote
+        self.workers = self._resolver_workers(workers)
+        
+        # Manifiesto de expedientes procesados (se abre al primer uso)
+        if forzar is None:
+            forzar = config.get('forzar', False)
+        self.forzar = bool(forzar)
+        self.ruta_manifiesto = config.get('ruta_manifiesto', os.path.join(self.ruta_log, 'manifiesto.sqlite3'))
+        self._manifiesto = None
+        
+        # Índice de carpetas de los expedientes (se carga en la primera ejecución)
+        self.ruta_indice = config.get('ruta_indice', os.path.join(self.ruta_log, 'indice_expedientes.json'))
+        self.indice = IndiceExpedientes(self.ruta_base, self.ruta_indice)
+        
+        # Diario del lote para reanudarlo si se interrumpe
+        self.diario_lote = bool(config.get('diario_lote', True))
+        self.ruta_diario = config.get('ruta_diario', os.path.join(self.ruta_log, 'diario_lote.jsonl'))
+        self.reanudar = bool(config.get('reanudar', False))
+        self._indice_cargado = False
+        
+        # Expedientes omitidos por estar al día en la última ejecución y si
+        # esa ejecución se canceló
+        self.expedientes_al_dia = 0
+        self.cancelado = False
+        
+        # Medición de la duración de cada etapa del procesamiento
+        self.metricas_habilitadas = bool(config.get('metricas', True))
+        self.metricas = None
+        self._etapas = None
+        
         # Cargar mapeo de operadores
         self.operadores_formatos = self._cargar_mapeo_operadores()
+        self.indice_operadores = IndiceOperadores(self.operadores_formatos)
+        
+        # Lecturas y escrituras con plazo y reintentos
+        self.acceso = AccesoArchivos(config.get('timeout_conexion', TIMEOUT_CONEXION),
+                                     config.get('intentos_reconexion', INTENTOS_RECONEXION),
+                                     sistema=config.get('sistema_archivos'))
+        
+        # Formatos de operadores ya interpretados en este proceso
+        self.plantillas = CachePlantillas(self.acceso)
+        
+        # Documentos que se generan con cada extracción
+        self.tipos_documento, firma_tipos_documento = self._cargar_tipos_documento()
+        
+        # Patrones de extracción compilados una sola vez
+        self.motor_extraccion = self._crear_motor_extraccion()
+        
+        # Firma que el manifiesto compara: otra configuración de documentos, de
+        # patrones o de detección de operadores vuelve a generar los expedientes
+        self.firma_documentos = "|".join([firma_tipos_documento, self.motor_extraccion.firma,
+                                          str(VERSION_DETECCION)])
+        
+        # Caché de extracciones por contenido (se abre al primer uso). Su versión
+        # depende de los patrones y de los operadores mapeados
+        self.usar_cache_extraccion = bool(config.get('cache_extraccion', True))
+        self.ruta_cache_extraccion = config.get('ruta_cache_extraccion',
+                                                os.path.join(self.ruta_log, 'cache_extraccion.sqlite3'))
+        firma = "|".join([self.motor_extraccion.firma, str(VERSION_DETECCION)] + sorted(self.operadores_formatos))
+        self.version_extraccion = hashlib.sha256(firma.encode('utf-8')).hexdigest()[:16]
+        self._cache_extraccion = None
+        
+        # Canalización de E/S: lectura anticipada y escritura en hilos
+        self.canalizacion = bool(config.get('canalizacion', True))
+        self.hilos_lectura = int(config.get('hilos_lectura', HILOS_LECTURA))
+        self.max_anticipados = max(1, int(config.get('max_anticipados', MAX_ANTICIPADOS)))
+        self._hilos_es = None
+        self._escritura = None
+        
+        # Límite de memoria de la ejecución (MB) y reciclaje de los workers
+        self.memoria_maxima = float(config.get('memoria_maxima', 0) or 0)
+        self.max_tareas_worker = int(config.get('max_tareas_worker', MAX_TAREAS_WORKER) or 0)
+        self.control_memoria = None
+        self._umbral_memoria = 0
+        
+        # Reparto del lote con otros equipos que procesan la misma carpeta
+        self.coordinacion, self.concesiones = self._configurar_coordinacion()
+        self.expedientes_otro_nodo = 0
         
         self.logger.info(f"Procesador inicializado con {len(self.operadores_formatos)} operadores mapeados")
         
-    def _cargar_mapeo_operadores(self):
+    def _resolver_workers(self, workers):
         """
-        Carga el mapeo de operadores desde el archivo JSON.
-        Si no existe, crea un mapeo automático.
+        Determina el número de procesos a usar en el procesamiento en lote.
         
+        Args:
+            workers (int): Valor recibido en el constructor (puede ser None)
+            
         Returns:
-            dict: Diccionario con nombres de operadores como claves y rutas de formatos como valores.
+            int: Número de procesos (mínimo 1)
         """
-        # Determinar ruta del archivo JSON
-        ruta_json = self._get_operadores_json_path()
+        if workers is None:
+            workers = self.config.get('workers')
+        if workers is None:
+            workers = CONFIG.getint("PROCESAMIENTO", "workers", fallback=1)
         
-        # Intentar cargar desde JSON
-        if os.path.exists(ruta_json):
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            self.logger.warning(f"Valor de workers inválido: {workers}. Se usará 1")
+            return 1
+        
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return workers
+    
+    def _configurar_coordinacion(self):
+        """
+        Prepara el reparto del lote con otros equipos ('coordinacion').
+        
+        Returns:
+            tuple: (modo de coordinación o '', ConcesionesExpedientes o None)
+        """
+        modo = str(self.config.get('coordinacion') or '').strip().lower()
+        if not modo:
+            return '', None
+        
+        if modo == MODO_PARTICION:
+            self.nodos = max(1, int(self.config.get('nodos', 1) or 1))
+            self.numero_nodo = int(self.config.get('numero_nodo', 1) or 1)
+            if not 1 <= self.numero_nodo <= self.nodos:
+                raise ValueError(f"numero_nodo debe estar entre 1 y {self.nodos}: {self.numero_nodo}")
+            self.logger.info(f"Partición del lote: equipo {self.numero_nodo} de {self.nodos}")
+            return modo, None
+        
+        if modo == MODO_CONCESIONES:
+            carpeta = self.config.get('ruta_concesiones') or os.path.join(self.ruta_base, CARPETA_CONCESIONES)
+            concesiones = ConcesionesExpedientes(carpeta, self.config.get('nodo'),
+                                                 float(self.config.get('duracion_concesion', DURACION_CONCESION)),
+                                                 self.config.get('ejecucion_concesiones'))
+            self.logger.info(f"Concesiones de expedientes en {carpeta} (equipo {concesiones.nodo})")
+            return modo, concesiones
+        
+        self.logger.warning(f"Modo de coordinación desconocido: {modo}. Se procesarán todos los expedientes")
+        return '', None
+    
+    def _abrir_diario(self):
+        """
+        Abre el diario del lote. Con 'reanudar', si el diario anterior quedó
+        sin terminar, se continúa ese lote y se devuelven sus expedientes ya
+        terminados; los que no respondieron a tiempo se vuelven a procesar.
+        
+        Returns:
+            tuple: (DiarioLote o None, dict expediente -> registro del diario)
+        """
+        if not self.diario_lote or self.simular:
+            return None, {}
+        
+        interrumpido = leer_lote_interrumpido(self.ruta_diario, self.ruta_base) if self.reanudar else None
+        terminados = {}
+        if interrumpido is not None:
+            terminados = {nombre: registro for nombre, registro in interrumpido.items()
+                          if registro.get('motivo') != MOTIVO_TIEMPO_AGOTADO}
+            self.logger.info(f"Reanudando el lote interrumpido: {len(terminados)} expedientes ya terminados")
+        elif self.reanudar:
+            self.logger.info("No hay un lote interrumpido que reanudar, se procesa el lote completo")
+        
+        diario = DiarioLote(self.ruta_diario)
+        try:
+            diario.iniciar(self.ruta_base, continuar=interrumpido is not None)
+        except OSError as e:
+            self.logger.warning(f"No se pudo abrir el diario del lote {self.ruta_diario}: {e}")
+            return None, terminados
+        return diario, terminados
+    
+    def _fuera_de_particion(self, nombre_expediente):
+        """
+        Indica si un expediente le corresponde a otro equipo en el modo de partición.
+        """
+        return self.coordinacion == MODO_PARTICION and not en_particion(nombre_expediente, self.numero_nodo,
+                                                                          self.nodos)
+    
+    def _cerrar_concesion(self, resultado):
+        """
+        Cierra la concesión de un expediente terminado. Si sus archivos no
+        respondieron, se libera para que otro equipo pueda procesarlo.
+        
+        Args:
+            resultado (dict): Resultado del expediente
+        """
+        if not self.concesiones or self.simular or resultado['estado'] in (ESTADO_OTRO_NODO, ESTADO_AL_DIA,
+                                                                             ESTADO_IGNORADO):
+            return
+        try:
+            self.concesiones.terminar(resultado['expediente'], liberar=resultado['motivo'] == MOTIVO_TIEMPO_AGOTADO)
+        except Exception as e:
+            self.logger.warning("No se pudo cerrar la concesión de %s: %s", resultado['expediente'], e)
+    
+    def _crear_motor_extraccion(self):
+        """
+        Crea el motor de extracción con los patrones de settings, reemplazados
+        por los de la sección [PATRONES] de config.ini si existe.
+        
+        Returns:
+            MotorExtraccion: Motor con los patrones compilados
+        """
+        sobrescrituras = {}
+        if CONFIG.has_section("PATRONES"):
+            sobrescrituras = {clave: valor for clave, valor in CONFIG.items("PATRONES", raw=True) if valor}
+        
+        return MotorExtraccion.desde_configuracion(
+            DOCUMENT_CONFIG["EXTRACTION_FIELDS"],
+            DOCUMENT_CONFIG["PATTERNS"],
+            sobrescrituras
+        )
+    
+    def _cargar_tipos_documento(self):
+        """
+        Construye los tipos de documento de settings (DOCUMENT_TYPES), con los
+        del archivo 'archivo_documentos' añadidos o reemplazados, o los indicados
+        directamente en config['documentos'].
+        
+        Returns:
+            tuple: (lista de TipoDocumento, firma de la configuración). La firma
+                   es vacía con la configuración predeterminada, de modo que los
+                   manifiestos anteriores siguen siendo válidos.
+        """
+        tipos = dict(DOCUMENT_CONFIG["DOCUMENT_TYPES"])
+        conjuntos = dict(DOCUMENT_CONFIG["REPLACEMENT_SETS"])
+        firma_predeterminada = firma_tipos(tipos, conjuntos)
+        
+        archivo = self.config.get('archivo_documentos')
+        if archivo:
+            try:
+                adicionales, conjuntos_adicionales = leer_archivo_documentos(archivo)
+                tipos.update(adicionales)
+                conjuntos.update(conjuntos_adicionales)
+            except Exception as e:
+                self.logger.error(f"No se pudo leer el archivo de documentos {archivo}: {str(e)}")
+        if self.config.get('documentos'):
+            tipos = dict(self.config['documentos'])
+        
+        tipos_documento = cargar_tipos_documento(tipos, conjuntos, self.ruta_formatos)
+        if not tipos_documento:
+            raise ValueError("No hay tipos de documento configurados")
+        firma = firma_tipos(tipos, conjuntos)
+        if len(tipos_documento) > 1:
+            self.logger.info(f"Documentos por expediente: {', '.join(tipo.nombre for tipo in tipos_documento)}")
+        return tipos_documento, '' if firma == firma_predeterminada else firma
+    
+    def _obtener_manifiesto(self):
+        """
+        Obtiene el manifiesto de procesamiento, abriéndolo la primera vez.
+        
+        Returns:
+            ManifiestoProcesamiento: Manifiesto abierto, o None si no se pudo abrir
+        """
+        if self._manifiesto is None:
             try:
-                with open(ruta_json, 'r', encoding='utf-8') as f:
-                    operadores = json.load(f)
-                    # Convertir rutas relativas a absolutas
-                    for operador, ruta in operadores.items():
-                        if not os.path.isabs(ruta):
-                            operadores[operador] = os.path.join(self.ruta_formatos, ruta)
-                    self.logger.info(f"Mapeo de operadores cargado desde {ruta_json}")
-                    return operadores
+                self._manifiesto = ManifiestoProcesamiento(self.ruta_manifiesto, self.acceso)
             except Exception as e:
-                self.logger.error(f"Error al cargar mapeo de operadores: {str(e)}")
+                self.logger.warning(f"No se pudo abrir el manifiesto {self.ruta_manifiesto}: {str(e)}")
+                self._manifiesto = False
+        return self._manifiesto or None
+    
+    def _obtener_cache_extraccion(self):
+        """
+        Obtiene la caché de extracciones, abriéndola la primera vez.
+        
+        Returns:
+            CacheExtraccion: Caché abierta, o None si está desactivada o no se pudo abrir
+        """
+        if self._cache_extraccion is None:
+            self._cache_extraccion = False
+            if self.usar_cache_extraccion:
+                try:
+                    self._cache_extraccion = CacheExtraccion(self.ruta_cache_extraccion, self.version_extraccion,
+                                                            self.acceso)
+                except Exception as e:
+                    self.logger.warning(f"No se pudo abrir la caché de extracción {self.ruta_cache_extraccion}: {str(e)}")
+        return self._cache_extraccion or None
+    
+    def _depurar_cache_extraccion(self):
+        """
+        Elimina de la caché de extracciones las entradas de versiones anteriores
+        del extractor y las que superan la antigüedad o el tamaño configurados.
+        """
+        cache = self._obtener_cache_extraccion()
+        if not cache:
+            return
+        try:
+            eliminadas = cache.depurar(float(self.config.get('cache_max_dias', MAX_DIAS_CACHE)),
+                                       int(self.config.get('cache_max_entradas', MAX_ENTRADAS_CACHE)))
+            if eliminadas:
+                self.logger.info(f"Caché de extracción depurada: {eliminadas} entradas eliminadas")
+        except Exception as e:
+            self.logger.warning(f"No se pudo depurar la caché de extracción: {str(e)}")
+    
+    def _cargar_mapeo_operadores(self):
+        """
+        Carga el mapeo de operadores desde el archivo JSON, que no se modifica, y
+        le agrega los operadores detectados en los demás formatos. Si la caché de
+        lo detectado no existe o superó la antigüedad configurada
+        ('actualizacion_mapeo', en días), se revisan los formatos nuevos o
+        modificados y se guarda de nuevo.
         
-        # Si no se pudo cargar, crear mapeo automático
-        self.logger.warning("Creando mapeo automático de operadores")
-        return self._mapear_operadores_formatos()
+        Returns:
+            dict: Diccionario con nombres de operadores como claves y rutas de formatos como valores.
+        """
+        dias = self.config.get('actualizacion_mapeo')
+        if dias is None:
+            dias = CONFIG.getfloat("OPERADORES", "actualizacion_mapeo", fallback=OPERATOR_CONFIG["AUTO_REFRESH"])
+        
+        ruta_cache = self.config.get('ruta_cache_mapeo', os.path.join(self.ruta_log, 'mapeo_operadores.json'))
+        self.mapeo = MapeoOperadores(self._get_operadores_json_path(), self.ruta_formatos, float(dias), ruta_cache)
+        operadores = self.mapeo.obtener()
+        self.logger.info(f"Mapeo de operadores cargado desde {self.mapeo.ruta_json}")
+        return operadores
     
     def _get_operadores_json_path(self):
         """
@@ -85,6 +517,10 @@ class ProcesadorExpedientes:
         Returns:
             str: Ruta al archivo JSON
         """
+        # Ruta configurada explícitamente ([OPERADORES] archivo_mapeo)
+        if self.config.get('archivo_mapeo'):
+            return self.config['archivo_mapeo']
+        
         # Posibles ubicaciones
         posibles_rutas = [
             os.path.join(os.path.dirname(__file__), 'config', 'operadores.json'),
@@ -100,107 +536,812 @@ class ProcesadorExpedientes:
         # Si no existe, usar la primera opción
         return posibles_rutas[0]
         
-    def _mapear_operadores_formatos(self):
+    def procesar_expedientes(self, al_procesar=None, al_iniciar=None, cancelar=None):
         """
-        Crea un diccionario que mapea nombres de operadores a sus archivos de formato.
+        Procesa todos los expedientes en la ruta base, ignorando los que tienen '00' en el nombre.
+        Si se configuró más de un worker, los expedientes se procesan en un pool de procesos.
+        
+        Args:
+            al_procesar (callable): Función que recibe el resultado (dict) de cada
+                                   expediente a medida que termina (opcional).
+            al_iniciar (callable): Función que recibe el número de elementos
+                                  encontrados en la ruta base (incluidos los
+                                  ignorados) antes de procesarlos (opcional).
+            cancelar (threading.Event): Evento para detener el procesamiento. Los
+                                       expedientes ya iniciados terminan y se
+                                       informan; los demás no se procesan.
         
         Returns:
-            dict: Diccionario con nombres de operadores como claves y rutas de formatos como valores.
+            tuple: (expedientes_procesados, expedientes_ignorados, expedientes_error)
         """
-        operadores_formatos = {}
+        expedientes_procesados = 0
+        expedientes_ignorados = 0
+        expedientes_error = 0
+        self.expedientes_al_dia = 0
+        self.expedientes_otro_nodo = 0
+        self.cancelado = False
+        metricas = MetricasProcesamiento() if self.metricas_habilitadas else None
+        self.metricas = metricas
+        control_memoria = ControlMemoria(self.memoria_maxima)
+        self.control_memoria = control_memoria
+        self._umbral_memoria = 0
+        max_anticipados = self.max_anticipados
+        
+        self.logger.info(f"Iniciando procesamiento de expedientes en {self.ruta_base}")
         
-        # Verificar que la ruta de formatos exista
-        if not os.path.exists(self.ruta_formatos):
-            self.logger.error(f"La ruta de formatos no existe: {self.ruta_formatos}")
-            return operadores_formatos
+        # Verificar que la ruta base exista
+        if not os.path.exists(self.ruta_base):
+            self.logger.error(f"La ruta base no existe: {self.ruta_base}")
+            return (0, 0, 0)
+        
+        self._depurar_cache_extraccion()
+        
+        # Un único recorrido de la ruta base; solo se vuelven a listar las
+        # carpetas que cambiaron desde la ejecución anterior
+        with metricas.etapa('listado') if metricas else SIN_MEDICION:
+            elementos = self._escanear_expedientes()
+        if al_iniciar:
+            al_iniciar(len(elementos))
+        diario, terminados = self._abrir_diario()
+        
+        # Orden alfabético para que los resultados sean reproducibles
+        rutas_expedientes = []
+        entradas = []
+        for expediente, entrada in elementos:
+            # Ignorar expedientes con '00' en el nombre
+            if entrada is None:
+                self.logger.info("Ignorando expediente con '00': %s", expediente)
+                expedientes_ignorados += 1
+                if al_procesar:
+                    resultado = self._nuevo_resultado(os.path.join(self.ruta_base, expediente))
+                    resultado['estado'] = ESTADO_IGNORADO
+                    resultado['motivo'] = MOTIVO_IGNORADO_00
+                    al_procesar(resultado)
+                continue
             
-        for archivo in os.listdir(self.ruta_formatos):
-            if archivo.endswith('.docx'):
-                try:
-                    doc = Document(os.path.join(self.ruta_formatos, archivo))
-                    # Buscamos el nombre del operador en el contenido del documento
-                    for paragraph in doc.paragraphs:
-                        operador_match = re.search(r'([A-Z\s]{10,}GUERRERO|[A-Z\s]{10,})', paragraph.text)
-                        if operador_match:
-                            nombre_operador = operador_match.group(0).strip()
-                            operadores_formatos[nombre_operador] = os.path.join(self.ruta_formatos, archivo)
-                            self.logger.info(f"Mapeado operador '{nombre_operador}' a formato '{archivo}'")
-                            break
-                except Exception as e:
-                    self.logger.error(f"Error al procesar formato {archivo}: {str(e)}")
+            # Los de otro equipo en el modo de partición
+            if self._fuera_de_particion(expediente):
+                self.expedientes_otro_nodo += 1
+                if al_procesar:
+                    resultado = self._nuevo_resultado(os.path.join(self.ruta_base, expediente))
+                    resultado['estado'] = ESTADO_OTRO_NODO
+                    resultado['motivo'] = MOTIVO_OTRO_NODO
+                    al_procesar(resultado)
+                continue
+            
+            # Los ya terminados en el lote interrumpido que se reanuda
+            registro = terminados.get(expediente)
+            if registro:
+                resultado = self._nuevo_resultado(os.path.join(self.ruta_base, expediente))
+                resultado['estado'] = registro['estado']
+                resultado['motivo'] = registro['motivo']
+                if resultado['estado'] in (ESTADO_PROCESADO, ESTADO_SIMULADO):
+                    expedientes_procesados += 1
+                elif resultado['estado'] == ESTADO_AL_DIA:
+                    self.expedientes_al_dia += 1
+                elif resultado['estado'] == ESTADO_OTRO_NODO:
+                    self.expedientes_otro_nodo += 1
+                else:
+                    expedientes_error += 1
+                if al_procesar:
+                    al_procesar(resultado)
+                continue
+            
+            rutas_expedientes.append(os.path.join(self.ruta_base, expediente))
+            entradas.append(entrada)
+        
+        if self.workers > 1 and len(rutas_expedientes) > 1:
+            resultados = self._procesar_en_paralelo(rutas_expedientes, entradas, cancelar)
+        elif self.canalizacion and len(rutas_expedientes) > 1:
+            resultados = self._procesar_canalizado(rutas_expedientes, entradas, cancelar)
+        else:
+            resultados = self._procesar_en_secuencia(rutas_expedientes, entradas, cancelar)
+        resultados = self._aplazar_sin_respuesta(resultados, cancelar)
+        
+        # Un lote cancelado o interrumpido por una excepción queda sin terminar en el diario
+        completo = False
+        try:
+            for numero, resultado in enumerate(resultados, 1):
+                if numero % INTERVALO_MEDICION == 0:
+                    self._revisar_memoria(control_memoria)
+                self._cerrar_concesion(resultado)
+                if resultado['error']:
+                    self.logger.error("Error al procesar expediente %s: %s", resultado['expediente'],
+                                      resultado['error'])
+                if resultado['estado'] in (ESTADO_PROCESADO, ESTADO_SIMULADO):
+                    expedientes_procesados += 1
+                elif resultado['estado'] == ESTADO_AL_DIA:
+                    self.expedientes_al_dia += 1
+                elif resultado['estado'] == ESTADO_OTRO_NODO:
+                    self.expedientes_otro_nodo += 1
+                else:
+                    expedientes_error += 1
+                if diario:
+                    diario.registrar(resultado)
+                if metricas:
+                    metricas.agregar_resultado(resultado)
+                if al_procesar:
+                    al_procesar(resultado)
+            completo = not (cancelar is not None and cancelar.is_set())
+        finally:
+            if diario:
+                diario.cerrar(terminado=completo)
+            if self.concesiones:
+                self.concesiones.cerrar()
+        
+        if cancelar is not None and cancelar.is_set():
+            self.cancelado = True
+            self.logger.warning("Procesamiento cancelado por el usuario")
+        
+        # Los expedientes de otro equipo se informan como ignorados
+        expedientes_ignorados += self.expedientes_otro_nodo
+        self.logger.info(f"Procesamiento finalizado. Procesados: {expedientes_procesados}, "
+                         f"Al día: {self.expedientes_al_dia}, "
+                         f"Ignorados: {expedientes_ignorados}, Errores: {expedientes_error}")
+        if self.coordinacion:
+            self.logger.info(f"Expedientes a cargo de otro equipo: {self.expedientes_otro_nodo}")
+        
+        control_memoria.medir()
+        self.max_anticipados = max_anticipados
+        if control_memoria.excedido(control_memoria.pico_mb):
+            self.logger.warning(f"La memoria llegó a {control_memoria.pico_mb} MB, por encima del "
+                                f"límite de {self.memoria_maxima:.0f} MB (memoria_maxima)")
+        if metricas:
+            metricas.memoria = control_memoria.resumen()
+            metricas.finalizar()
+            self._reportar_metricas(metricas)
+        
+        return expedientes_procesados, expedientes_ignorados, expedientes_error
+    
+    def planificar(self, al_procesar=None, al_iniciar=None, cancelar=None, workers=None):
+        """
+        Predice el resultado de procesar todos los expedientes sin generar ni
+        modificar ningún documento. Recorre los mismos pasos que una ejecución
+        real en modo simulación (índice de carpetas, manifiesto, extracción y
+        búsqueda del formato del operador), usando todos los núcleos, y agrupa
+        los expedientes por motivo. Las extracciones quedan en la caché, de modo
+        que la ejecución real posterior no vuelve a leer los archivos.
         
-        # Guardar el mapeo para futuras ejecuciones
-        self._guardar_mapeo_operadores(operadores_formatos)
+        Args:
+            al_procesar (callable): Función que recibe el resultado (dict) de cada
+                                   expediente (opcional).
+            al_iniciar (callable): Ver procesar_expedientes (opcional).
+            cancelar (threading.Event): Ver procesar_expedientes (opcional).
+            workers (int): Número de procesos. Si es None se usan todos los núcleos.
+            
+        Returns:
+            PlanProcesamiento: Plan con la cantidad de expedientes por motivo
+        """
+        plan = PlanProcesamiento(self.ruta_base)
         
-        return operadores_formatos
+        def registrar(resultado):
+            plan.agregar_resultado(resultado)
+            if al_procesar:
+                al_procesar(resultado)
+        
+        simular, workers_configurados = self.simular, self.workers
+        self.simular = True
+        self.workers = self._resolver_workers(0 if workers is None else workers)
+        try:
+            self.procesar_expedientes(registrar, al_iniciar, cancelar)
+        finally:
+            self.simular, self.workers = simular, workers_configurados
+        
+        plan.finalizar()
+        self.logger.info(plan.reporte())
+        return plan
     
-    def _guardar_mapeo_operadores(self, operadores_formatos):
+    def _escanear_expedientes(self):
         """
-        Guarda el mapeo de operadores en un archivo JSON.
+        Actualiza el índice de carpetas de la ruta base y lo guarda para la
+        próxima ejecución. Con forzar se descarta el índice anterior.
+        
+        Returns:
+            list: Tuplas (nombre, entrada) en orden alfabético; los expedientes
+                  con '00' en el nombre tienen entrada None
+        """
+        if self.forzar:
+            self.indice.entradas = {}
+        elif not self._indice_cargado:
+            self.indice.cargar()
+        self._indice_cargado = True
+        
+        elementos = self.indice.escanear(excluir=lambda nombre: ' 00 ' in nombre)
+        self.indice.guardar()
+        self.logger.info("Índice de expedientes actualizado: %d carpetas, %d volvieron a listarse",
+                         len(self.indice.entradas), self.indice.reescaneados)
+        return elementos
+    
+    def vigilar(self, al_procesar=None, detener=None, procesar_pendientes=True):
+        """
+        Vigila la ruta base y procesa cada expediente cuyo archivo de aceptación
+        aparece o cambia. Un archivo se procesa cuando su tamaño y fecha no han
+        cambiado durante 'espera_vigilancia' segundos, para no leer archivos que
+        aún se están sincronizando. Bloquea hasta que se activa 'detener'.
         
         Args:
-            operadores_formatos (dict): Diccionario con mapeo de operadores a formatos.
+            al_procesar (callable): Función que recibe el resultado (dict) de cada
+                                   expediente procesado (opcional).
+            detener (threading.Event): Evento para terminar la vigilancia (opcional)
+            procesar_pendientes (bool): Si es True, antes de vigilar se procesan
+                                       todos los expedientes pendientes.
         """
-        ruta_json = self._get_operadores_json_path()
+        detener = detener or threading.Event()
+        intervalo = float(self.config.get('intervalo_vigilancia', 5))
+        espera = float(self.config.get('espera_vigilancia', 3))
+        excluir = lambda nombre: ' 00 ' in nombre
+        
+        if procesar_pendientes:
+            self.procesar_expedientes(al_procesar)
+        
+        observador = crear_observador(self.ruta_base, intervalo, excluir)
+        self.logger.info("Vigilando %s (%s)", self.ruta_base, type(observador).__name__)
+        
+        # Huella del archivo de aceptación ya procesado en esta sesión y
+        # expedientes en espera de que su archivo deje de cambiar
+        vistas = {}
+        pendientes = {}
+        control_memoria = ControlMemoria(self.memoria_maxima)
+        self._umbral_memoria = 0
         try:
-            # Crear directorio si no existe
-            os.makedirs(os.path.dirname(ruta_json), exist_ok=True)
-            
-            # Convertir rutas absolutas a relativas para mayor portabilidad
-            operadores_rel = {}
-            for operador, ruta in operadores_formatos.items():
-                if os.path.isabs(ruta) and ruta.startswith(self.ruta_formatos):
-                    operadores_rel[operador] = os.path.basename(ruta)
-                else:
-                    operadores_rel[operador] = ruta
-            
-            with open(ruta_json, 'w', encoding='utf-8') as f:
-                json.dump(operadores_rel, f, indent=4, ensure_ascii=False)
+            while not detener.is_set():
+                timeout = intervalo
+                if pendientes:
+                    proximo = min(instante for _, instante in pendientes.values()) + espera
+                    timeout = max(0.1, min(intervalo, proximo - time.monotonic()))
+                
+                cambios = observador.esperar(timeout, detener)
+                if cambios is None:
+                    self.logger.warning("Se perdieron eventos de vigilancia, se revisarán todos los expedientes")
+                    cambios = {nombre for nombre in os.listdir(self.ruta_base) if not excluir(nombre)}
                 
-            self.logger.info(f"Guardado mapeo de operadores en {ruta_json}")
+                ahora = time.monotonic()
+                for nombre in cambios | set(pendientes):
+                    if self._fuera_de_particion(nombre):
+                        continue
+                    ruta_expediente = os.path.join(self.ruta_base, nombre)
+                    huella = self._huella_aceptacion(ruta_expediente)
+                    if huella is None or huella == vistas.get(nombre):
+                        pendientes.pop(nombre, None)
+                        continue
+                    
+                    anterior = pendientes.get(nombre)
+                    if anterior is None or anterior[0] != huella:
+                        pendientes[nombre] = (huella, ahora)
+                        continue
+                    if ahora - anterior[1] < espera:
+                        continue
+                    
+                    del pendientes[nombre]
+                    vistas[nombre] = huella
+                    resultado = self._procesar_expediente_aislado(ruta_expediente)
+                    self._cerrar_concesion(resultado)
+                    if resultado['motivo'] == MOTIVO_TIEMPO_AGOTADO:
+                        # Se reintenta cuando vuelva a pasar la espera
+                        del vistas[nombre]
+                        pendientes[nombre] = (huella, time.monotonic())
+                    if resultado['error']:
+                        self.logger.error("Error al procesar expediente %s: %s",
+                                          resultado['expediente'], resultado['error'])
+                    self.logger.info("Expediente %s: %s (%.1f ms)", nombre, resultado['estado'],
+                                     resultado['duracion_ms'])
+                    if al_procesar:
+                        al_procesar(resultado)
+                    self._revisar_memoria(control_memoria)
+        finally:
+            observador.cerrar()
+            if self.concesiones:
+                self.concesiones.cerrar()
+            self.logger.info("Vigilancia finalizada")
+    
+    def _huella_aceptacion(self, ruta_expediente):
+        """
+        Obtiene la huella (tamaño y fecha) del archivo de aceptación de un expediente.
+        
+        Args:
+            ruta_expediente (str): Ruta del expediente
+            
+        Returns:
+            str: Huella del archivo, o None si el expediente no tiene archivo de aceptación
+        """
+        entrada = escanear_expediente(ruta_expediente)
+        if entrada['error'] or not entrada['aceptacion']:
+            return None
+        return huella_archivo(os.path.join(ruta_expediente, entrada['cuaderno'], entrada['aceptacion']))
+    
+    def _procesar_expediente_aislado(self, ruta_expediente, entrada=None):
+        """
+        Procesa un expediente en el proceso actual sin propagar excepciones.
+        
+        Args:
+            ruta_expediente (str): Ruta del expediente a procesar.
+            entrada (dict): Estructura del expediente según el índice de carpetas (opcional)
+            
+        Returns:
+            dict: Resultado del procesamiento (ver _procesar_expediente) con la
+                  duración en 'duracion_ms' y, si la medición está activa, la
+                  duración de cada etapa en 'etapas_ms'
+        """
+        self._etapas = {} if self.metricas_habilitadas else None
+        inicio = time.perf_counter()
+        try:
+            resultado = self._procesar_expediente(ruta_expediente, entrada)
         except Exception as e:
-            self.logger.error(f"Error al guardar mapeo de operadores: {str(e)}")
+            resultado = self._nuevo_resultado(ruta_expediente)
+            resultado['error'] = str(e)
+            if isinstance(e, TiempoAgotado):
+                resultado['motivo'] = MOTIVO_TIEMPO_AGOTADO
+        resultado['duracion_ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+        if self._etapas is not None:
+            resultado['etapas_ms'] = {etapa: round(ms, 2) for etapa, ms in self._etapas.items()}
+            self._etapas = None
+        return resultado
     
-    def procesar_expedientes(self):
+    def _etapa(self, nombre):
         """
-        Procesa todos los expedientes en la ruta base, ignorando los que tienen '00' en el nombre.
+        Mide una etapa del expediente en curso.
         
+        Args:
+            nombre (str): Nombre de la etapa
+            
         Returns:
-            tuple: (expedientes_procesados, expedientes_ignorados, expedientes_error)
+            Contexto que acumula la duración en el resultado del expediente, o un
+            contexto vacío si la medición está desactivada
         """
-        expedientes_procesados = 0
-        expedientes_ignorados = 0
-        expedientes_error = 0
+        if self._etapas is None:
+            return SIN_MEDICION
+        return Etapa(self._etapas, nombre)
+    
+    def _reportar_metricas(self, metricas):
+        """
+        Escribe el resumen de rendimiento de la ejecución en el log y, si se
+        configuró, en un archivo JSON.
         
-        self.logger.info(f"Iniciando procesamiento de expedientes en {self.ruta_base}")
+        Args:
+            metricas (MetricasProcesamiento): Métricas de la ejecución
+        """
+        self.logger.info(metricas.reporte())
         
-        # Verificar que la ruta base exista
-        if not os.path.exists(self.ruta_base):
-            self.logger.error(f"La ruta base no existe: {self.ruta_base}")
-            return (0, 0, 0)
+        ruta_archivo = self.config.get('archivo_metricas')
+        if not ruta_archivo and self.config.get('guardar_metricas'):
+            ruta_archivo = os.path.join(self.ruta_log, 'metricas',
+                                        f"metricas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        if ruta_archivo:
+            try:
+                metricas.guardar(ruta_archivo)
+                self.logger.info(f"Métricas guardadas en {ruta_archivo}")
+            except Exception as e:
+                self.logger.warning(f"No se pudieron guardar las métricas en {ruta_archivo}: {str(e)}")
+    
+    def _revisar_memoria(self, control_memoria):
+        """
+        Mide la memoria y, si la ejecución supera el límite y este proceso supera
+        su parte (todo el límite sin workers), libera las cachés del proceso y
+        reduce a la mitad la lectura anticipada. Para no liberar en cada medición,
+        la siguiente liberación espera a que la memoria crezca un 10% más.
+        
+        Args:
+            control_memoria (ControlMemoria): Control de la ejecución en curso
+        """
+        total = control_memoria.medir()
+        proceso = control_memoria.proceso_mb
+        if not control_memoria.excedido(total) or proceso is None:
+            return
+        parte = self.memoria_maxima / (len(control_memoria.workers_mb) + 1)
+        if proceso <= max(parte, self._umbral_memoria):
+            return
+        self._liberar_memoria()
+        control_memoria.liberaciones += 1
+        if self.max_anticipados > 1:
+            self.max_anticipados = max(1, self.max_anticipados // 2)
+        control_memoria.medir()
+        despues = control_memoria.proceso_mb or proceso
+        self._umbral_memoria = despues * 1.1
+        self.logger.warning("Memoria por encima del límite (%s MB de %.0f MB): cachés liberadas, "
+                            "el proceso pasó de %s a %s MB; lectura anticipada de %s expedientes",
+                            total, self.memoria_maxima, proceso, despues, self.max_anticipados)
+    
+    def _liberar_memoria(self):
+        """
+        Descarta los formatos interpretados (se vuelven a leer al usarse) y
+        fuerza la recolección de los objetos pendientes.
+        """
+        self.plantillas.invalidar()
+        gc.collect()
+    
+    def _procesar_en_secuencia(self, rutas_expedientes, entradas, cancelar=None):
+        """
+        Procesa expedientes uno tras otro en el proceso actual.
+        
+        Args:
+            rutas_expedientes (list): Rutas de los expedientes a procesar.
+            entradas (list): Estructura de cada expediente según el índice de carpetas
+            cancelar (threading.Event): Evento para no iniciar más expedientes (opcional)
             
-        for expediente in os.listdir(self.ruta_base):
-            # Ignorar expedientes con '00' en el nombre
-            if ' 00 ' in expediente:
-                self.logger.info(f"Ignorando expediente con '00': {expediente}")
-                expedientes_ignorados += 1
+        Yields:
+            dict: Resultados en el mismo orden de las rutas
+        """
+        for ruta_expediente, entrada in zip(rutas_expedientes, entradas):
+            if cancelar is not None and cancelar.is_set():
+                return
+            yield self._procesar_expediente_aislado(ruta_expediente, entrada)
+    
+    def _aplazar_sin_respuesta(self, resultados, cancelar=None):
+        """
+        Deja para el final del lote los expedientes cuyos archivos no
+        respondieron dentro del plazo ('timeout_conexion') y los procesa de
+        nuevo, una vez, en el proceso actual. Mientras tanto el cliente de
+        sincronización sigue descargando los archivos.
+        
+        Args:
+            resultados (iterable): Resultados del lote
+            cancelar (threading.Event): Evento para no reintentar (opcional)
+            
+        Yields:
+            dict: Resultados del lote; los aplazados al final con el resultado del reintento
+        """
+        aplazados = []
+        for resultado in resultados:
+            if resultado['motivo'] == MOTIVO_TIEMPO_AGOTADO:
+                self.logger.warning("Sin respuesta de los archivos de %s, se reintentará al final del lote",
+                                    resultado['expediente'])
+                aplazados.append(resultado)
+                continue
+            yield resultado
+        
+        if aplazados:
+            self.logger.info(f"Reintentando {len(aplazados)} expedientes aplazados por tiempo agotado")
+        for resultado in aplazados:
+            if cancelar is not None and cancelar.is_set():
+                yield resultado
                 continue
+            yield self._procesar_expediente_aislado(resultado['ruta'])
+    
+    def _procesar_en_paralelo(self, rutas_expedientes, entradas, cancelar=None):
+        """
+        Procesa expedientes en un pool de procesos. Cada proceso inicializa su
+        propio ProcesadorExpedientes con la misma configuración y recibe los
+        expedientes en lotes, que procesa con su propia canalización de E/S.
+        
+        Los lotes se envían a medida que terminan los anteriores. Si un worker
+        termina inesperadamente, los lotes que quedaron sin resultado se
+        reintentan de a un expediente (ver _reintentar_uno_a_uno). El pool se
+        reemplaza cuando sus workers procesaron 'max_tareas_worker' expedientes
+        cada uno o cuando la memoria de la ejecución supera 'memoria_maxima'; en
+        este último caso el pool nuevo tiene un worker menos.
+        
+        Args:
+            rutas_expedientes (list): Rutas de los expedientes a procesar.
+            entradas (list): Estructura de cada expediente según el índice de carpetas
+            cancelar (threading.Event): Evento para no iniciar más expedientes (opcional).
+                                       Se transmite a los procesos con un
+                                       multiprocessing.Event.
+            
+        Yields:
+            dict: Resultados del procesamiento en el mismo orden de las rutas,
+                  a medida que están disponibles.
+        """
+        workers = min(self.workers, len(rutas_expedientes))
+        chunksize = max(1, len(rutas_expedientes) // (workers * 4))
+        if self.max_tareas_worker:
+            chunksize = min(chunksize, self.max_tareas_worker)
+        lotes = deque((rutas_expedientes[i:i + chunksize], entradas[i:i + chunksize])
+                      for i in range(0, len(rutas_expedientes), chunksize))
+        self.logger.info(f"Procesando {len(rutas_expedientes)} expedientes con {workers} procesos")
+        
+        control_memoria = self.control_memoria or ControlMemoria(self.memoria_maxima)
+        cancelar_workers = multiprocessing.Event() if cancelar is not None else None
+        cola_log = obtener_cola_log(self.logger.name)
+        while lotes:
+            # Cada worker puede usar una parte igual del límite (el proceso principal cuenta como uno más)
+            config_workers = dict(self.config, forzar=self.forzar, simular=self.simular,
+                                  memoria_worker=self.memoria_maxima / (workers + 1) if self.memoria_maxima else 0)
+            if self.concesiones:
+                # Los workers toman las concesiones a nombre de esta ejecución
+                config_workers['ejecucion_concesiones'] = self.concesiones.ejecucion
+            motivo_reciclaje = None
+            tareas = 0
+            enviadas = 0
+            fallidos = []
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_inicializar_worker,
+                                     initargs=(config_workers, cola_log, cancelar_workers)) as executor:
+                en_curso = deque()
+                while True:
+                    while (lotes and motivo_reciclaje is None and len(en_curso) < workers * 2
+                           and not (cancelar is not None and cancelar.is_set())):
+                        if self.max_tareas_worker and enviadas >= self.max_tareas_worker * workers:
+                            motivo_reciclaje = 'tareas'
+                            break
+                        rutas_lote, entradas_lote = lotes.popleft()
+                        enviadas += len(rutas_lote)
+                        en_curso.append((executor.submit(_procesar_lote_worker, rutas_lote, entradas_lote),
+                                         rutas_lote, entradas_lote))
+                    if not en_curso:
+                        break
+                    
+                    futuro, rutas_lote, entradas_lote = en_curso.popleft()
+                    # Mientras se espera el lote se revisa la cancelación
+                    while cancelar is not None and not cancelar_workers.is_set() and not futuro.done():
+                        if cancelar.wait(0.2):
+                            cancelar_workers.set()
+                    if cancelar is not None and cancelar.is_set():
+                        cancelar_workers.set()
+                    try:
+                        resultados, pid, memoria_mb = futuro.result()
+                    except Exception as e:
+                        # Un worker que termina de golpe rompe el pool: los lotes
+                        # en curso fallan también y no se envían más
+                        self.logger.error("Falló un lote de %d expedientes en un worker: %s",
+                                          len(rutas_lote), e)
+                        fallidos.append((rutas_lote, entradas_lote))
+                        if isinstance(e, BrokenProcessPool):
+                            motivo_reciclaje = 'fallo'
+                        continue
+                    tareas += len(resultados)
+                    total = control_memoria.registrar_worker(pid, memoria_mb)
+                    yield from resultados
+                    
+                    if motivo_reciclaje is None and lotes and control_memoria.excedido(total):
+                        motivo_reciclaje = 'memoria'
+            
+            if cancelar is not None and cancelar.is_set():
+                break
+            for rutas_lote, entradas_lote in fallidos:
+                yield from self._reintentar_uno_a_uno(rutas_lote, entradas_lote, config_workers,
+                                                      cola_log, cancelar, cancelar_workers)
+            if motivo_reciclaje:
+                control_memoria.reciclajes += 1
+                control_memoria.olvidar_workers()
+                if motivo_reciclaje == 'fallo':
+                    self.logger.warning("Un worker terminó inesperadamente: se reemplazan los workers")
+                elif motivo_reciclaje == 'memoria':
+                    workers = max(1, workers - 1)
+                    self.logger.warning(f"Memoria por encima del límite de {self.memoria_maxima:.0f} MB: "
+                                        f"se reemplazan los workers y se continúa con {workers}")
+                else:
+                    self.logger.info(f"Reemplazando los workers después de {tareas} expedientes")
+    
+    def _reintentar_uno_a_uno(self, rutas_lote, entradas_lote, config_workers, cola_log,
+                              cancelar=None, cancelar_workers=None):
+        """
+        Procesa de nuevo, de a un expediente por tarea, un lote que falló en
+        el pool. Si un expediente vuelve a terminar el worker se registra
+        como error y los demás siguen en un pool nuevo.
+        
+        Args:
+            rutas_lote (list): Rutas de los expedientes del lote
+            entradas_lote (list): Estructura de cada expediente según el índice de carpetas
+            config_workers (dict): Configuración de los workers
+            cola_log: Cola del registro compartida con los workers
+            cancelar (threading.Event): Evento para no iniciar más expedientes (opcional)
+            cancelar_workers: multiprocessing.Event que se transmite a los workers (opcional)
+            
+        Yields:
+            dict: Resultado de cada expediente del lote
+        """
+        pendientes = deque(zip(rutas_lote, entradas_lote))
+        while pendientes and not (cancelar is not None and cancelar.is_set()):
+            with ProcessPoolExecutor(max_workers=1,
+                                     initializer=_inicializar_worker,
+                                     initargs=(config_workers, cola_log, cancelar_workers)) as executor:
+                while pendientes and not (cancelar is not None and cancelar.is_set()):
+                    ruta_expediente, entrada = pendientes.popleft()
+                    try:
+                        resultados, _, _ = executor.submit(_procesar_lote_worker, [ruta_expediente],
+                                                           [entrada]).result()
+                    except Exception as e:
+                        resultado = self._nuevo_resultado(ruta_expediente)
+                        resultado['error'] = f"El worker terminó inesperadamente: {e}"
+                        resultado['duracion_ms'] = 0.0
+                        yield resultado
+                        if isinstance(e, BrokenProcessPool):
+                            break
+                        continue
+                    yield from resultados
+    
+    def _procesar_canalizado(self, rutas_expedientes, entradas, cancelar=None):
+        """
+        Procesa expedientes solapando la E/S con el procesamiento. Mientras el
+        hilo actual extrae y genera un documento, los hilos de lectura traen a
+        memoria los archivos de aceptación (y los formatos aún no cargados) de
+        los siguientes expedientes y el hilo de escritura guarda los documentos
+        anteriores. Como máximo hay 'max_anticipados' expedientes leídos por
+        adelantado y otros tantos documentos pendientes de escribir.
+        
+        Args:
+            rutas_expedientes (list): Rutas de los expedientes a procesar.
+            entradas (list): Estructura de cada expediente según el índice de carpetas
+            cancelar (threading.Event): Evento para no iniciar más expedientes (opcional).
+                                       Los ya anticipados se terminan.
+            
+        Yields:
+            dict: Resultados en el mismo orden de las rutas. 'duracion_ms' es el
+                  tiempo que el hilo actual dedicó al expediente (incluidas las
+                  esperas); 'etapas_ms' incluye además la lectura anticipada
+                  ('anticipacion') y la escritura ('guardado') hechas en otros hilos.
+        """
+        hilos_es = HilosES(self.hilos_lectura, self.max_anticipados, self.acceso)
+        pendientes = iter(zip(rutas_expedientes, entradas))
+        anticipados = deque()
+        en_escritura = deque()
+        formatos_solicitados = set()
+        try:
+            while True:
+                while len(anticipados) < self.max_anticipados:
+                    if cancelar is not None and cancelar.is_set():
+                        break
+                    siguiente = next(pendientes, None)
+                    if siguiente is None:
+                        break
+                    anticipados.append(self._anticipar_expediente(hilos_es, *siguiente,
+                                                                  formatos_solicitados))
+                if not anticipados:
+                    break
                 
-            ruta_expediente = os.path.join(self.ruta_base, expediente)
-            if os.path.isdir(ruta_expediente):
-                try:
-                    if self.procesar_expediente(ruta_expediente):
-                        expedientes_procesados += 1
-                    else:
-                        expedientes_error += 1
-                except Exception as e:
-                    self.logger.error(f"Error al procesar expediente {expediente}: {str(e)}")
-                    expedientes_error += 1
+                elemento = anticipados.popleft()
+                self._procesar_anticipado(hilos_es, elemento)
+                en_escritura.append(elemento)
+                
+                # Entregar los resultados cuya escritura terminó, en orden
+                while en_escritura and (len(en_escritura) > self.max_anticipados
+                                        or all(escritura.done() for _, escritura
+                                               in en_escritura[0]['escritura'])):
+                    yield self._finalizar_anticipado(en_escritura.popleft())
+            
+            while en_escritura:
+                yield self._finalizar_anticipado(en_escritura.popleft())
+        finally:
+            self._etapas = None
+            hilos_es.cerrar()
+    
+    def _anticipar_expediente(self, hilos_es, ruta_expediente, entrada, formatos_solicitados):
+        """
+        Prepara un expediente y solicita la lectura anticipada de los archivos
+        que necesitará. Si su extracción ya está en la caché no se lee el archivo
+        de aceptación; en ese caso se conoce el operador y se anticipan los
+        formatos de sus documentos.
         
-        self.logger.info(f"Procesamiento finalizado. Procesados: {expedientes_procesados}, "
-                         f"Ignorados: {expedientes_ignorados}, Errores: {expedientes_error}")
+        Args:
+            hilos_es (HilosES): Hilos de entrada/salida
+            ruta_expediente (str): Ruta del expediente
+            entrada (dict): Estructura del expediente según el índice de carpetas
+            formatos_solicitados (set): Formatos cuya lectura ya se solicitó
+            
+        Returns:
+            dict: Estado del expediente en la canalización
+        """
+        elemento = {'etapas': {} if self.metricas_habilitadas else None, 'ms': 0.0,
+                    'trabajo': None, 'lectura': None, 'formatos': [],
+                    'generada': None, 'escritura': []}
+        self._etapas = elemento['etapas']
+        inicio = time.perf_counter()
+        try:
+            elemento['resultado'], trabajo = self._preparar_expediente(ruta_expediente, entrada)
+            elemento['trabajo'] = trabajo
+            if trabajo:
+                guardado = self._extraccion_en_cache(trabajo['aceptacion'])
+                if guardado is None:
+                    elemento['lectura'] = hilos_es.leer(trabajo['aceptacion'])
+                elif guardado['info'] and not self.simular:
+                    for formato in self._formatos_documentos(guardado['info']['operador']):
+                        if formato not in formatos_solicitados and not self.plantillas.contiene(formato):
+                            formatos_solicitados.add(formato)
+                            elemento['formatos'].append((formato, hilos_es.leer(formato)))
+        except Exception as e:
+            elemento['resultado'] = self._nuevo_resultado(ruta_expediente)
+            elemento['resultado']['error'] = str(e)
+            elemento['trabajo'] = None
+        elemento['ms'] += (time.perf_counter() - inicio) * 1000
+        return elemento
+    
+    def _procesar_anticipado(self, hilos_es, elemento):
+        """
+        Extrae la información y genera los documentos de un expediente con los
+        archivos leídos por adelantado. Las escrituras quedan en el hilo de escritura.
         
-        return expedientes_procesados, expedientes_ignorados, expedientes_error
+        Args:
+            hilos_es (HilosES): Hilos de entrada/salida
+            elemento (dict): Estado del expediente en la canalización
+        """
+        trabajo = elemento['trabajo']
+        if trabajo is None:
+            return
+        self._etapas = elemento['etapas']
+        inicio = time.perf_counter()
+        try:
+            contenido = None
+            if elemento['lectura']:
+                with self._etapa('espera'):
+                    _, contenido, ms = elemento['lectura'].result()
+                self._sumar_etapa(elemento, 'anticipacion', ms)
+                elemento['lectura'] = None
+            for ruta_formato, lectura in elemento['formatos']:
+                with self._etapa('espera'):
+                    huella, datos, ms = lectura.result()
+                self._sumar_etapa(elemento, 'anticipacion', ms)
+                with self._etapa('plantilla'):
+                    self.plantillas.agregar(ruta_formato, huella, datos)
+            elemento['formatos'] = []
+            
+            self._hilos_es = hilos_es
+            self._escritura = []
+            try:
+                elemento['generada'] = self._completar_expediente(elemento['resultado'], trabajo, contenido)
+                elemento['escritura'] = self._escritura
+            finally:
+                self._hilos_es = None
+                self._escritura = None
+        except TiempoAgotado as e:
+            elemento['resultado'].update(estado=ESTADO_ERROR, motivo=MOTIVO_TIEMPO_AGOTADO, error=str(e))
+        except Exception as e:
+            elemento['resultado'].update(estado=ESTADO_ERROR, motivo=MOTIVO_ERROR, error=str(e))
+        elemento['ms'] += (time.perf_counter() - inicio) * 1000
+    
+    def _finalizar_anticipado(self, elemento):
+        """
+        Espera la escritura de los documentos de un expediente y lo registra
+        en el manifiesto.
+        
+        Args:
+            elemento (dict): Estado del expediente en la canalización
+            
+        Returns:
+            dict: Resultado del procesamiento
+        """
+        resultado = elemento['resultado']
+        self._etapas = elemento['etapas']
+        inicio = time.perf_counter()
+        for ruta_salida, escritura in elemento['escritura']:
+            try:
+                with self._etapa('espera'):
+                    ms = escritura.result()
+                self._sumar_etapa(elemento, 'guardado', ms)
+                self.logger.info("Documento generado exitosamente: %s", os.path.basename(ruta_salida))
+            except Exception as e:
+                self.logger.error("Error al guardar el documento %s: %s", ruta_salida, e)
+                resultado['estado'] = ESTADO_ERROR
+                resultado['motivo'] = MOTIVO_TIEMPO_AGOTADO if isinstance(e, TiempoAgotado) else MOTIVO_ERROR
+                resultado['error'] = str(e)
+                elemento['generada'] = None
+        if elemento['generada']:
+            self._registrar_expediente(resultado, elemento['trabajo'], elemento['generada'])
+        
+        elemento['ms'] += (time.perf_counter() - inicio) * 1000
+        resultado['duracion_ms'] = round(elemento['ms'], 1)
+        if elemento['etapas'] is not None:
+            resultado['etapas_ms'] = {etapa: round(ms, 2) for etapa, ms in elemento['etapas'].items()}
+        self._etapas = None
+        return resultado
+    
+    def _sumar_etapa(self, elemento, nombre, milisegundos):
+        """
+        Suma a una etapa del expediente una duración medida en otro hilo.
+        """
+        if elemento['etapas'] is not None:
+            elemento['etapas'][nombre] = elemento['etapas'].get(nombre, 0.0) + milisegundos
+    
+    def _extraccion_en_cache(self, archivo_aceptacion):
+        """
+        Consulta la caché de extracciones sin leer el archivo de aceptación
+        (solo con la ruta, el tamaño y la fecha registrados).
+        
+        Args:
+            archivo_aceptacion (str): Ruta al archivo de aceptación
+            
+        Returns:
+            dict: Extracción guardada ('info' y 'faltantes'), o None si no se conoce
+        """
+        cache = self._obtener_cache_extraccion()
+        if not cache:
+            return None
+        try:
+            hash_contenido = cache.hash_conocido(archivo_aceptacion)
+            return cache.obtener(hash_contenido) if hash_contenido else None
+        except Exception as e:
+            self.logger.debug("No se pudo consultar la caché de extracción para %s: %s",
+                              os.path.basename(archivo_aceptacion), e)
+            return None
     
     def procesar_expediente(self, ruta_expediente):
         """
@@ -210,125 +1351,417 @@ class ProcesadorExpedientes:
             ruta_expediente (str): Ruta del expediente a procesar.
             
         Returns:
-            bool: True si el procesamiento fue exitoso, False en caso contrario.
+            bool: True si el procesamiento fue exitoso (o el expediente ya estaba al día),
+                  False en caso contrario.
         """
-        nombre_expediente = os.path.basename(ruta_expediente)
-        self.logger.info(f"Procesando expediente: {nombre_expediente}")
+        return self._procesar_expediente(ruta_expediente)['estado'] != ESTADO_ERROR
+    
+    def procesar_expediente_resultado(self, ruta_expediente):
+        """
+        Procesa un expediente individual y devuelve el detalle del resultado,
+        sin propagar excepciones.
         
-        # Verificar si existen las carpetas necesarias
-        carpeta_principal = os.path.join(ruta_expediente, "01. CUADERNO PRINCIPAL")
-        carpeta_notificaciones = os.path.join(ruta_expediente, "02. NOTIFICACIONES")
+        Args:
+            ruta_expediente (str): Ruta del expediente a procesar.
+            
+        Returns:
+            dict: Resultado del procesamiento (ver _procesar_expediente) con la
+                  duración en 'duracion_ms'
+        """
+        resultado = self._procesar_expediente_aislado(ruta_expediente)
+        self._cerrar_concesion(resultado)
+        return resultado
+    
+    def _nuevo_resultado(self, ruta_expediente):
+        """
+        Crea el resultado inicial del procesamiento de un expediente.
         
-        if not os.path.exists(carpeta_principal):
-            self.logger.warning(f"Carpeta '01. CUADERNO PRINCIPAL' no encontrada en {nombre_expediente}")
-            return False
+        Args:
+            ruta_expediente (str): Ruta del expediente.
+            
+        Returns:
+            dict: Resultado con estado de error y sin mensaje
+        """
+        return {
+            'expediente': os.path.basename(ruta_expediente),
+            'ruta': ruta_expediente,
+            'estado': ESTADO_ERROR,
+            'motivo': MOTIVO_ERROR,
+            'error': None,
+            'info': None,
+            'faltantes': None,
+            'salida': None,
+            'documentos': None
+        }
+    
+    def _procesar_expediente(self, ruta_expediente, entrada=None):
+        """
+        Procesa un expediente individual y devuelve el detalle del resultado.
+        Si el manifiesto indica que las entradas no cambiaron y los documentos
+        generados existen, el expediente se omite sin abrir ningún documento.
+        
+        Args:
+            ruta_expediente (str): Ruta del expediente a procesar.
+            entrada (dict): Estructura del expediente según el índice de carpetas.
+                           Si es None se escanea la carpeta del expediente.
+            
+        Returns:
+            dict: Resultado con las claves 'expediente', 'ruta', 'estado', 'motivo'
+                  (uno de los MOTIVO_*), 'error', 'info' (datos extraídos),
+                  'faltantes' (campos requeridos no encontrados), 'salida'
+                  (documento principal) y 'documentos' (tipo -> ruta de cada
+                  documento generado)
+        """
+        resultado, trabajo = self._preparar_expediente(ruta_expediente, entrada)
+        if trabajo is None:
+            return resultado
         
-        if not os.path.exists(carpeta_notificaciones):
-            self.logger.info(f"Carpeta '02. NOTIFICACIONES' no encontrada en {nombre_expediente}. Creándola.")
+        generada = self._completar_expediente(resultado, trabajo)
+        if generada:
+            self._registrar_expediente(resultado, trabajo, generada)
+        return resultado
+    
+    def _preparar_expediente(self, ruta_expediente, entrada=None):
+        """
+        Revisa la estructura del expediente y el manifiesto, sin abrir documentos.
+        
+        Args:
+            ruta_expediente (str): Ruta del expediente a procesar.
+            entrada (dict): Estructura del expediente según el índice de carpetas.
+                           Si es None se escanea la carpeta del expediente.
+            
+        Returns:
+            tuple: (resultado, trabajo). trabajo es None si el expediente ya terminó
+                   (error, al día o a cargo de otro equipo); si no, un diccionario con el archivo de
+                   aceptación, la carpeta de notificaciones y el manifiesto
+        """
+        resultado = self._nuevo_resultado(ruta_expediente)
+        nombre_expediente = resultado['expediente']
+        self.logger.info("Procesando expediente: %s", nombre_expediente)
+        
+        # Verificar si existen las carpetas necesarias (según el índice)
+        with self._etapa('carpetas'):
+            if entrada is None:
+                entrada = escanear_expediente(ruta_expediente)
+            if entrada['error']:
+                resultado['error'] = entrada['error']
+                return resultado, None
+            
+            if not entrada['cuaderno']:
+                self.logger.warning("Carpeta '01. CUADERNO PRINCIPAL' no encontrada en %s", nombre_expediente)
+                resultado['motivo'] = MOTIVO_SIN_CUADERNO
+                return resultado, None
+            carpeta_principal = os.path.join(ruta_expediente, entrada['cuaderno'])
+            carpeta_notificaciones = os.path.join(ruta_expediente, CARPETA_NOTIFICACIONES)
+            
+            if not entrada['notificaciones'] and not self.simular:
+                self.logger.info("Carpeta '02. NOTIFICACIONES' no encontrada en %s. Creándola.", nombre_expediente)
+                try:
+                    os.makedirs(carpeta_notificaciones, exist_ok=True)
+                except Exception as e:
+                    self.logger.error("Error al crear carpeta de notificaciones: %s", e)
+                    return resultado, None
+            
+            # Archivo de aceptación de solicitud
+            archivo_aceptacion = None
+            if entrada['aceptacion']:
+                archivo_aceptacion = os.path.join(carpeta_principal, entrada['aceptacion'])
+        
+        if not archivo_aceptacion:
+            self.logger.warning("No se encontró archivo de aceptación en %s", nombre_expediente)
+            resultado['motivo'] = MOTIVO_SIN_ACEPTACION
+            return resultado, None
+        
+        # Omitir el expediente si nada cambió desde la última ejecución
+        manifiesto = self._obtener_manifiesto()
+        if manifiesto and not self.forzar:
             try:
-                os.makedirs(carpeta_notificaciones)
+                with self._etapa('manifiesto'):
+                    al_dia = manifiesto.esta_al_dia(ruta_expediente, archivo_aceptacion,
+                                                    self.firma_documentos, self._formatos_documentos)
+                if al_dia:
+                    self.logger.info("Expediente al día, se omite: %s", nombre_expediente)
+                    resultado['estado'] = ESTADO_AL_DIA
+                    resultado['motivo'] = MOTIVO_AL_DIA
+                    return resultado, None
+            except TiempoAgotado as e:
+                # El expediente se aplaza al final del lote
+                self.logger.warning("Sin respuesta de los archivos de %s: %s", nombre_expediente, e)
+                resultado['motivo'] = MOTIVO_TIEMPO_AGOTADO
+                resultado['error'] = str(e)
+                return resultado, None
             except Exception as e:
-                self.logger.error(f"Error al crear carpeta de notificaciones: {str(e)}")
-                return False
-        
-        # Buscar archivo de aceptación de solicitud
-        archivo_aceptacion = None
-        for archivo in os.listdir(carpeta_principal):
-            if archivo.startswith("Aceptación de solicitud"):
-                archivo_aceptacion = os.path.join(carpeta_principal, archivo)
-                break
+                self.logger.warning("No se pudo consultar el manifiesto para %s: %s", nombre_expediente, e)
         
-        if not archivo_aceptacion:
-            self.logger.warning(f"No se encontró archivo de aceptación en {nombre_expediente}")
-            return False
+        # Tomar el expediente para que ningún otro equipo genere la misma notificación
+        if self.concesiones and not self.simular:
+            with self._etapa('concesion'):
+                tomado = self.concesiones.tomar(nombre_expediente, huella_archivo(archivo_aceptacion), self.forzar)
+            if not tomado:
+                self.logger.info("Expediente a cargo de otro equipo, se omite: %s", nombre_expediente)
+                resultado['estado'] = ESTADO_OTRO_NODO
+                resultado['motivo'] = MOTIVO_OTRO_NODO
+                return resultado, None
+        
+        trabajo = {
+            'aceptacion': archivo_aceptacion,
+            'notificaciones': carpeta_notificaciones,
+            'manifiesto': manifiesto,
+            'hash': None
+        }
+        return resultado, trabajo
+    
+    def _completar_expediente(self, resultado, trabajo, contenido=None):
+        """
+        Extrae la información del archivo de aceptación una sola vez y genera
+        con ella todos los documentos del operador.
         
-        # Extraer información del archivo de aceptación
+        Args:
+            resultado (dict): Resultado del expediente (se actualiza)
+            trabajo (dict): Datos devueltos por _preparar_expediente
+            contenido (bytes): Contenido del archivo de aceptación ya leído (opcional)
+            
+        Returns:
+            list: Tuplas (tipo, ruta_formato, ruta_salida) de los documentos
+                  generados, o None
+        """
+        archivo_aceptacion = trabajo['aceptacion']
         try:
-            info_deudor = self.extraer_informacion_aceptacion(archivo_aceptacion)
+            # Una sola lectura (con plazo) para el hash y la extracción, salvo
+            # que la extracción ya esté en la caché
+            if contenido is None and self._extraccion_en_cache(archivo_aceptacion) is None:
+                with self._etapa('lectura'):
+                    contenido = self.acceso.leer(archivo_aceptacion)
+            with self._etapa('hash'):
+                trabajo['hash'] = self._hash_aceptacion(archivo_aceptacion, trabajo['manifiesto'], contenido)
+            info_deudor, faltantes = self._extraer_aceptacion(archivo_aceptacion, trabajo['hash'], contenido)
             if not info_deudor:
-                return False
+                if faltantes:
+                    resultado['motivo'] = MOTIVO_DATOS_FALTANTES
+                    resultado['faltantes'] = faltantes
+                return None
+            resultado['info'] = info_deudor
+            
+            if not self._buscar_formato_operador(info_deudor['operador']):
+                self.logger.warning("No se encontró formato para el operador: %s", info_deudor['operador'])
+                resultado['motivo'] = MOTIVO_OPERADOR_DESCONOCIDO
+                return None
+            
+            # En simulación solo se verifica que el operador tenga formato
+            if self.simular:
+                rutas = self._rutas_documentos(info_deudor, trabajo['notificaciones'])
+                resultado['salida'] = rutas[0][2]
+                resultado['documentos'] = {tipo.nombre: ruta_salida for tipo, _, ruta_salida in rutas}
+                resultado['estado'] = ESTADO_SIMULADO
+                resultado['motivo'] = MOTIVO_GENERAR
+                return None
                 
-            # Generar notificación para acreedores
-            return self.generar_notificacion_acreedores(info_deudor, carpeta_notificaciones)
+            # Generar todos los documentos con la misma información
+            generadas = self._generar_documentos(info_deudor, trabajo['notificaciones'])
+            if not generadas:
+                return None
+            resultado['salida'] = generadas[0][2]
+            resultado['documentos'] = {tipo: ruta_salida for tipo, _, ruta_salida in generadas}
+            resultado['estado'] = ESTADO_PROCESADO
+            resultado['motivo'] = MOTIVO_GENERAR
+            return generadas
             
+        except TiempoAgotado as e:
+            self.logger.warning("Sin respuesta de los archivos de %s: %s", resultado['expediente'], e)
+            resultado['motivo'] = MOTIVO_TIEMPO_AGOTADO
+            resultado['error'] = str(e)
+            return None
         except Exception as e:
-            self.logger.error(f"Error al procesar {archivo_aceptacion}: {str(e)}")
+            self.logger.error("Error al procesar %s: %s", archivo_aceptacion, e)
             self.logger.error(traceback.format_exc())
-            return False
+            return None
     
-    def extraer_informacion_aceptacion(self, ruta_archivo):
+    def _registrar_expediente(self, resultado, trabajo, generadas):
         """
-        Extrae información de un archivo de aceptación de solicitud.
+        Registra el expediente en el manifiesto para omitirlo mientras no cambie.
+        
+        Args:
+            resultado (dict): Resultado del expediente
+            trabajo (dict): Datos devueltos por _preparar_expediente
+            generadas (list): Tuplas (tipo, ruta_formato, ruta_salida) de los
+                             documentos; el primero es el principal
+        """
+        manifiesto = trabajo['manifiesto']
+        if not manifiesto:
+            return
+        _, ruta_formato, ruta_salida = generadas[0]
+        try:
+            with self._etapa('manifiesto'):
+                manifiesto.registrar(resultado['ruta'], trabajo['aceptacion'], ruta_formato,
+                                     ruta_salida, trabajo['hash'], generadas[1:], self.firma_documentos,
+                                     resultado['info']['operador'])
+        except Exception as e:
+            self.logger.warning("No se pudo registrar %s en el manifiesto: %s", resultado['expediente'], e)
+    
+    def _hash_aceptacion(self, archivo_aceptacion, manifiesto, contenido=None):
+        """
+        Obtiene el hash del archivo de aceptación si lo necesita la caché de
+        extracción o el manifiesto.
+        
+        Args:
+            archivo_aceptacion (str): Ruta al archivo de aceptación
+            manifiesto (ManifiestoProcesamiento): Manifiesto abierto (o None)
+            contenido (bytes): Contenido ya leído del archivo (opcional)
+            
+        Returns:
+            str: Hash del contenido, o None si no se necesita
+        """
+        cache = self._obtener_cache_extraccion()
+        if cache:
+            try:
+                return cache.hash_de(archivo_aceptacion, contenido)
+            except TiempoAgotado:
+                raise
+            except Exception as e:
+                self.logger.warning("No se pudo consultar la caché de extracción para %s: %s",
+                                    os.path.basename(archivo_aceptacion), e)
+        if not manifiesto:
+            return None
+        if contenido is None:
+            contenido = self.acceso.leer(archivo_aceptacion)
+        return hashlib.sha256(contenido).hexdigest()
+    
+    def extraer_informacion_aceptacion(self, ruta_archivo, hash_contenido=None, contenido=None):
+        """
+        Extrae información de un archivo de aceptación de solicitud. Si el mismo
+        contenido ya se extrajo con la versión actual de los patrones, se usa la
+        información de la caché sin abrir el documento.
         
         Args:
             ruta_archivo (str): Ruta al archivo de aceptación.
+            hash_contenido (str): Hash del archivo, si ya se calculó (opcional).
+            contenido (bytes): Contenido del archivo ya leído (opcional). Si se
+                              indica, el documento se interpreta desde memoria.
             
         Returns:
-            dict: Diccionario con la información extraída del deudor.
+            dict: Diccionario con la información extraída del deudor, o None si
+                  faltan datos requeridos o el archivo no se pudo leer.
+        """
+        try:
+            return self._extraer_aceptacion(ruta_archivo, hash_contenido, contenido)[0]
+        except TiempoAgotado as e:
+            self.logger.error("Error al extraer información de %s: %s", os.path.basename(ruta_archivo), e)
+            return None
+    
+    def _extraer_aceptacion(self, ruta_archivo, hash_contenido=None, contenido=None):
+        """
+        Extrae la información de un archivo de aceptación (ver
+        extraer_informacion_aceptacion) indicando además los datos faltantes.
+        
+        Returns:
+            tuple: (info, faltantes). info es None si la extracción no fue completa;
+                   faltantes es la lista de campos requeridos no encontrados, o
+                   None si el archivo no se pudo leer.
+        
+        Raises:
+            TiempoAgotado: Si el archivo no respondió dentro del plazo
         """
-        self.logger.info(f"Extrayendo información de {os.path.basename(ruta_archivo)}")
+        nombre_archivo = os.path.basename(ruta_archivo)
+        
+        cache = self._obtener_cache_extraccion()
+        if cache:
+            try:
+                with self._etapa('cache'):
+                    if hash_contenido is None and contenido is None:
+                        hash_contenido = cache.hash_conocido(ruta_archivo)
+                    if hash_contenido is None:
+                        if contenido is None:
+                            contenido = self.acceso.leer(ruta_archivo)
+                        hash_contenido = cache.hash_de(ruta_archivo, contenido)
+                    guardado = cache.obtener(hash_contenido)
+            except TiempoAgotado:
+                raise
+            except Exception as e:
+                self.logger.warning("No se pudo consultar la caché de extracción para %s: %s", nombre_archivo, e)
+                cache = None
+                guardado = None
+            
+            if guardado is not None:
+                self.logger.info("Información de %s tomada de la caché", nombre_archivo)
+                if guardado['info'] is None:
+                    self.logger.warning("No se pudieron extraer todos los datos requeridos de %s", nombre_archivo)
+                    self.logger.warning("Datos faltantes: %s", ', '.join(guardado['faltantes']))
+                    return None, guardado['faltantes']
+                return self._fechar_extraccion(guardado['info']), []
+        
+        self.logger.info("Extrayendo información de %s", nombre_archivo)
         
         try:
-            doc = Document(ruta_archivo)
-            texto_completo = "\n".join([p.text for p in doc.paragraphs])
-            
-            # Extraer nombre del deudor
-            nombre_deudor_match = re.search(r'Deudora?\s*\n*\s*([A-Z\s]+)\s*\n*\s*CC No', texto_completo)
-            if not nombre_deudor_match:
-                nombre_deudor_match = re.search(r'ELVIN CECILIA TORRES DURAN|[A-Z\s]{10,}', texto_completo)
-            
-            # Extraer cédula
-            cedula_match = re.search(r'CC No\.\s*(\d+(?:\.\d+)*)', texto_completo)
-            if not cedula_match:
-                cedula_match = re.search(r'cédula de ciudadanía número\s*(\d+(?:\.\d+)*)', texto_completo)
-            
-            # Extraer radicado
-            radicado_match = re.search(r'Radicado:\s*([0-9-]+)', texto_completo)
-            
-            # Extraer fecha de presentación y audiencia
-            fecha_presentacion_match = re.search(r'presentó solicitud de negociación de sus deudas.*?el día (\d+ de [a-zA-Z]+ de \d+)', texto_completo)
-            fecha_audiencia_match = re.search(r'audiencia de negociación de pasivos\s*.*?el día (\d+.*?\d+)', texto_completo)
-            
-            # Extraer operador de insolvencia (última página)
-            operador_match = None
-            for i in range(len(doc.paragraphs) - 1, 0, -1):
-                match = re.search(r'DIANA PATRICIA MANGA GUERRERO|[A-Z\s]{10,}GUERRERO', doc.paragraphs[i].text)
-                if match:
-                    operador_match = match
-                    break
+            with self._etapa('lectura'):
+                if contenido is None:
+                    contenido = self.acceso.leer(ruta_archivo)
+                flujo = io.BytesIO(contenido)
+                flujo.name = ruta_archivo
+                parrafos = extract_paragraph_texts(flujo)
+                texto_completo = "\n".join(parrafos)
+            
+            with self._etapa('extraccion'):
+                # Extraer todos los campos configurados
+                extraccion = self.motor_extraccion.extraer(texto_completo)
                 
-            if not nombre_deudor_match or not cedula_match or not radicado_match or not operador_match:
-                self.logger.warning(f"No se pudieron extraer todos los datos requeridos de {os.path.basename(ruta_archivo)}")
-                missing_data = []
-                if not nombre_deudor_match: missing_data.append("nombre_deudor")
-                if not cedula_match: missing_data.append("cedula")
-                if not radicado_match: missing_data.append("radicado")
-                if not operador_match: missing_data.append("operador")
-                self.logger.warning(f"Datos faltantes: {', '.join(missing_data)}")
-                return None
+                # Si la firma no corresponde a un operador mapeado, se busca uno
+                # conocido con el índice, pero solo en la misma ventana de la firma
+                if not self.indice_operadores.resolver(extraccion.valores.get('operador')):
+                    ventana = self.motor_extraccion.ventana_final('operador')
+                    operador = self.indice_operadores.detectar(texto_completo[-ventana:]) if ventana else None
+                    if operador:
+                        extraccion.establecer('operador', operador)
+            self.logger.debug("Tiempos de extracción (ms): %s", extraccion.tiempos_ms)
+                
+            if not extraccion.completo:
+                self.logger.warning("No se pudieron extraer todos los datos requeridos de %s", nombre_archivo)
+                self.logger.warning("Datos faltantes: %s", ', '.join(extraccion.faltantes))
+                self._guardar_extraccion(cache, hash_contenido, None, extraccion.faltantes)
+                return None, extraccion.faltantes
                 
-            info = {
-                'nombre_deudor': (nombre_deudor_match.group(1) if hasattr(nombre_deudor_match, 'group') and 
-                                nombre_deudor_match.group(1) else nombre_deudor_match.group(0)).strip(),
-                'cedula': cedula_match.group(1),
-                'radicado': radicado_match.group(1),
-                'operador': operador_match.group(0).strip(),
-                'fecha_extraccion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            # Añadir fechas si están disponibles
-            if fecha_presentacion_match:
-                info['fecha_presentacion'] = fecha_presentacion_match.group(1)
-            if fecha_audiencia_match:
-                info['fecha_audiencia'] = fecha_audiencia_match.group(1)
+            # La caché guarda solo los campos extraídos; la fecha es la de cada uso
+            self._guardar_extraccion(cache, hash_contenido, extraccion.valores)
+            info = self._fechar_extraccion(extraccion.valores)
                 
-            self.logger.info(f"Información extraída: {json.dumps(info, ensure_ascii=False)}")
-            return info
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Información extraída: %s", json.dumps(info, ensure_ascii=False))
+            return info, []
                 
+        except TiempoAgotado:
+            raise
         except Exception as e:
-            self.logger.error(f"Error al extraer información de {os.path.basename(ruta_archivo)}: {str(e)}")
+            self.logger.error("Error al extraer información de %s: %s", nombre_archivo, e)
             self.logger.error(traceback.format_exc())
-            return None
+            return None, None
+    
+    def _fechar_extraccion(self, valores):
+        """
+        Args:
+            valores (dict): Campos extraídos (de la extracción o de la caché)
+            
+        Returns:
+            dict: Copia de los campos con la fecha de extracción de esta ejecución
+        """
+        info = {campo: valor for campo, valor in valores.items() if campo != 'fecha_extraccion'}
+        info['fecha_extraccion'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return info
+    
+    def _guardar_extraccion(self, cache, hash_contenido, info, faltantes=None):
+        """
+        Guarda el resultado de una extracción en la caché, si está disponible.
+        
+        Args:
+            cache (CacheExtraccion): Caché abierta (o None)
+            hash_contenido (str): Hash del archivo de aceptación
+            info (dict): Información extraída, o None si faltaron datos requeridos
+            faltantes (list): Campos requeridos que no se encontraron
+        """
+        if not cache or not hash_contenido:
+            return
+        try:
+            cache.guardar(hash_contenido, info, faltantes)
+        except Exception as e:
+            self.logger.warning("No se pudo guardar la extracción en la caché: %s", e)
     
     def generar_notificacion_acreedores(self, info_deudor, carpeta_destino):
         """
@@ -341,56 +1774,166 @@ class ProcesadorExpedientes:
         Returns:
             bool: True si la generación fue exitosa, False en caso contrario.
         """
+        return self._generar_notificacion(info_deudor, carpeta_destino) is not None
+    
+    def _buscar_formato_operador(self, operador):
+        """
+        Busca el formato de notificación correspondiente a un operador.
+        
+        Args:
+            operador (str): Nombre del operador extraído del archivo de aceptación.
+            
+        Returns:
+            str: Ruta al formato, o None si el operador no está mapeado.
+        """
+        return self.indice_operadores.resolver(operador)
+    
+    def _formatos_documentos(self, operador):
+        """
+        Obtiene los formatos de los documentos que se generan para un operador.
+        
+        Args:
+            operador (str): Nombre del operador extraído del archivo de aceptación.
+            
+        Returns:
+            list: Rutas de los formatos (sin repetir), vacía si el operador no está mapeado
+        """
+        formato_operador = self._buscar_formato_operador(operador)
+        if not formato_operador:
+            return []
+        formatos = []
+        for tipo in self.tipos_documento:
+            formato = tipo.formato_para(operador, formato_operador)
+            if formato and formato not in formatos:
+                formatos.append(formato)
+        return formatos
+    
+    def _rutas_documentos(self, info_deudor, carpeta_destino):
+        """
+        Calcula el formato y la ruta de salida de cada documento de un deudor.
+        
+        Args:
+            info_deudor (dict): Información del deudor extraída del archivo de aceptación.
+            carpeta_destino (str): Carpeta de notificaciones del expediente.
+            
+        Returns:
+            list: Tuplas (TipoDocumento, ruta_formato, ruta_salida) de los tipos que
+                  aplican al operador, en el orden de la configuración
+        """
         operador = info_deudor['operador']
+        formato_operador = self._buscar_formato_operador(operador)
+        if not formato_operador:
+            return []
+        rutas = []
+        for tipo in self.tipos_documento:
+            formato = tipo.formato_para(operador, formato_operador)
+            if formato:
+                rutas.append((tipo, formato, tipo.ruta_salida(info_deudor, carpeta_destino)))
+        return rutas
+    
+    def _ruta_notificacion(self, info_deudor, carpeta_destino):
+        """
+        Calcula la ruta de la notificación (documento principal) de un deudor.
         
-        # Buscar formato correspondiente al operador
-        formato_path = None
-        for nombre_operador, ruta_formato in self.operadores_formatos.items():
-            if operador in nombre_operador or nombre_operador in operador:
-                formato_path = ruta_formato
-                break
+        Args:
+            info_deudor (dict): Información del deudor extraída del archivo de aceptación.
+            carpeta_destino (str): Carpeta de notificaciones del expediente.
+            
+        Returns:
+            str: Ruta completa del archivo de notificación
+        """
+        return self.tipos_documento[0].ruta_salida(info_deudor, carpeta_destino)
+    
+    def _generar_notificacion(self, info_deudor, carpeta_destino):
+        """
+        Genera la notificación para acreedores (documento principal) y devuelve
+        las rutas usadas.
         
+        Args:
+            info_deudor (dict): Información del deudor extraída del archivo de aceptación.
+            carpeta_destino (str): Carpeta donde se guardará la notificación generada.
+            
+        Returns:
+            tuple: (ruta_formato, ruta_salida), o None si no se pudo generar.
+        """
+        tipo = self.tipos_documento[0]
+        formato_path = tipo.formato_para(info_deudor['operador'],
+                                         self._buscar_formato_operador(info_deudor['operador']))
         if not formato_path:
-            self.logger.warning(f"No se encontró formato para el operador: {operador}")
-            return False
+            self.logger.warning("No se encontró formato para el operador: %s", info_deudor['operador'])
+            return None
+        ruta_salida = tipo.ruta_salida(info_deudor, carpeta_destino)
+        if not self._generar_documento(tipo, formato_path, ruta_salida, info_deudor):
+            return None
+        return formato_path, ruta_salida
+    
+    def _generar_documentos(self, info_deudor, carpeta_destino):
+        """
+        Genera todos los documentos de un deudor a partir de la misma información
+        extraída, reutilizando los formatos de la caché de plantillas.
         
+        Args:
+            info_deudor (dict): Información del deudor extraída del archivo de aceptación.
+            carpeta_destino (str): Carpeta donde se guardarán los documentos.
+            
+        Returns:
+            list: Tuplas (tipo, ruta_formato, ruta_salida), o None si algún
+                  documento no se pudo generar.
+        """
+        rutas = self._rutas_documentos(info_deudor, carpeta_destino)
+        if not rutas:
+            self.logger.warning("No se encontró formato para el operador: %s", info_deudor['operador'])
+            return None
+        
+        generadas = []
+        for tipo, formato_path, ruta_salida in rutas:
+            if not self._generar_documento(tipo, formato_path, ruta_salida, info_deudor):
+                return None
+            generadas.append((tipo.nombre, formato_path, ruta_salida))
+        return generadas
+    
+    def _generar_documento(self, tipo, formato_path, ruta_salida, info_deudor):
+        """
+        Genera un documento aplicando los reemplazos de su tipo al formato.
+        
+        Args:
+            tipo (TipoDocumento): Tipo de documento
+            formato_path (str): Ruta al formato
+            ruta_salida (str): Ruta del documento a generar
+            info_deudor (dict): Información del deudor extraída del archivo de aceptación.
+            
+        Returns:
+            bool: True si se generó (o quedó en cola de escritura) correctamente
+        """
         try:
-            # Abrir formato
-            doc = Document(formato_path)
-            
-            # Preparar reemplazos
-            reemplazos = [
-                {"original": "Señores", "nuevo": "Señor(a)"},
-                {"original": "**Deudor:**", "nuevo": f"**Deudor:** {info_deudor['nombre_deudor']}"},
-                {"original": "**C.C.**", "nuevo": f"**C.C.** {info_deudor['cedula']}"},
-                {"original": "**Radicado:**", "nuevo": f"**Radicado:** {info_deudor['radicado']}"}
-            ]
-            
-            # Añadir fechas si están disponibles
-            if 'fecha_presentacion' in info_deudor:
-                reemplazos.append({
-                    "original": "el día **\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_**", 
-                    "nuevo": f"el día **{info_deudor['fecha_presentacion']}**"
-                })
-            
-            if 'fecha_audiencia' in info_deudor:
-                reemplazos.append({
-                    "original": "el día **\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_-**", 
-                    "nuevo": f"el día **{info_deudor['fecha_audiencia']}**"
-                })
+            # Obtener copia del formato desde la caché
+            with self._etapa('plantilla'):
+                doc = self.plantillas.nuevo_documento(formato_path)
             
             # Aplicar reemplazos
-            replace_text_in_doc(doc, reemplazos)
+            with self._etapa('reemplazos'):
+                replace_text_in_doc(doc, tipo.reemplazos_para(info_deudor))
+            
+            # Guardar documento modificado. Dentro de la canalización el documento
+            # se serializa en memoria y lo escribe el hilo de escritura
+            if self._hilos_es is not None:
+                with self._etapa('serializacion'):
+                    flujo = io.BytesIO()
+                    doc.save(flujo)
+                escritura = self._hilos_es.escribir(ruta_salida, flujo.getvalue())
+                if self._escritura is not None:
+                    self._escritura.append((ruta_salida, escritura))
+                return True
             
-            # Guardar documento modificado
-            nombre_archivo = f"Notificación_{info_deudor['nombre_deudor']}.docx"
-            ruta_salida = os.path.join(carpeta_destino, nombre_archivo)
-            save_document(doc, ruta_salida)
+            with self._etapa('guardado'):
+                save_document(doc, ruta_salida, self.acceso)
             
-            self.logger.info(f"Notificación generada exitosamente: {nombre_archivo}")
+            self.logger.info("Documento generado exitosamente: %s", os.path.basename(ruta_salida))
             return True
             
+        except TiempoAgotado:
+            raise
         except Exception as e:
-            self.logger.error(f"Error al generar notificación: {str(e)}")
+            self.logger.error("Error al generar el documento '%s': %s", tipo.nombre, e)
             self.logger.error(traceback.format_exc())
-            return False
\ No newline at end of file
+            return False
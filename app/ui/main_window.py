@@ -5,12 +5,18 @@ y procesamiento de expedientes.
 """
 
 import os
+import time
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import customtkinter as ctk
 from app.config import CONFIG
-from app.config.settings import DEFAULT_PATHS
+from app.config.settings import DEFAULT_PATHS, UI_CONFIG
 from app.utils.logger import get_logger
+from app.ui.progreso import (ProgresoProcesamiento, formatear_duracion, INTERVALO_EVENTOS_MS,
+                             MAX_EVENTOS_POR_REVISION, EVENTO_INICIO, EVENTO_RESULTADO,
+                             EVENTO_FIN, EVENTO_ERROR)
 
 class SeleccionadorExpedientes(ctk.CTk):
     """
@@ -30,6 +36,20 @@ class SeleccionadorExpedientes(ctk.CTk):
         self.title("Procesador de Expedientes")
         self.geometry("800x600")
         
+        # Procesador creado en segundo plano (ver iniciar_precarga)
+        self.procesador = None
+        self._precarga = None
+        
+        # Procesamiento en un hilo propio: recibe rutas por _trabajos y publica
+        # el avance en _eventos, que la ventana revisa con after()
+        self._trabajos = queue.Queue()
+        self._eventos = queue.Queue()
+        self._hilo_procesamiento = None
+        self._cancelar = threading.Event()
+        self._progreso = None
+        self._procesando = False
+        self._cerrar_al_terminar = False
+        
         # Definir variables
         self.ruta_expedientes = tk.StringVar(value=CONFIG.get(
             "RUTAS", "ruta_expedientes", 
@@ -39,8 +59,40 @@ class SeleccionadorExpedientes(ctk.CTk):
         # Crear interfaz
         self._crear_interfaz()
         
+        self.protocol("WM_DELETE_WINDOW", self._al_cerrar)
+        
         self.logger.info("Interfaz gráfica inicializada")
     
+    def iniciar_precarga(self, al_terminar=None):
+        """
+        Crea el procesador en un hilo en segundo plano, de modo que la importación
+        de python-docx/lxml y la carga del mapeo de operadores no retrasen la
+        aparición de la ventana.
+        
+        Args:
+            al_terminar (callable): Función sin argumentos a llamar desde el hilo
+                                   de precarga al terminar (opcional)
+        """
+        ruta = self.ruta_expedientes.get()
+        
+        def precargar():
+            try:
+                from app.config import config_procesador
+                from app.procesador import ProcesadorExpedientes
+                
+                config = config_procesador()
+                config['ruta_expedientes'] = ruta
+                self.procesador = ProcesadorExpedientes(config)
+                self.logger.info("Procesador precargado en segundo plano")
+            except Exception as e:
+                self.logger.error(f"Error al precargar el procesador: {str(e)}")
+            finally:
+                if al_terminar:
+                    al_terminar()
+        
+        self._precarga = threading.Thread(target=precargar, name="precarga", daemon=True)
+        self._precarga.start()
+    
     def _crear_interfaz(self):
         """
         Crea los componentes de la interfaz gráfica.
@@ -82,15 +134,37 @@ class SeleccionadorExpedientes(ctk.CTk):
         )
         info_label.pack(pady=10)
         
-        # Botón de procesar
-        btn_procesar = ctk.CTkButton(
-            main_frame,
+        # Botones de procesar y cancelar
+        botones_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        botones_frame.pack(pady=20)
+        
+        self.btn_procesar = ctk.CTkButton(
+            botones_frame,
             text="Procesar Expedientes",
             command=self._procesar_expedientes,
             height=40,
             font=ctk.CTkFont(size=14, weight="bold")
         )
-        btn_procesar.pack(pady=20)
+        self.btn_procesar.pack(side=tk.LEFT, padx=5)
+        
+        self.btn_cancelar = ctk.CTkButton(
+            botones_frame,
+            text="Cancelar",
+            command=self._cancelar_procesamiento,
+            height=40,
+            state="disabled"
+        )
+        self.btn_cancelar.pack(side=tk.LEFT, padx=5)
+        
+        # Avance del procesamiento
+        self.barra_progreso = None
+        if UI_CONFIG["SHOW_PROGRESS"]:
+            self.barra_progreso = ctk.CTkProgressBar(main_frame, mode="determinate")
+            self.barra_progreso.set(0)
+            self.barra_progreso.pack(fill=tk.X, padx=20, pady=5)
+        
+        self.lbl_progreso = ctk.CTkLabel(main_frame, text="", wraplength=780)
+        self.lbl_progreso.pack(pady=5)
     
     def _seleccionar_ruta_expedientes(self):
         """
@@ -106,7 +180,8 @@ class SeleccionadorExpedientes(ctk.CTk):
     
     def _procesar_expedientes(self):
         """
-        Inicia el procesamiento de los expedientes en la ruta seleccionada.
+        Inicia el procesamiento de los expedientes en la ruta seleccionada en
+        el hilo de procesamiento; el avance se muestra con _revisar_eventos.
         """
         ruta = self.ruta_expedientes.get()
         if not ruta or not os.path.exists(ruta):
@@ -116,11 +191,195 @@ class SeleccionadorExpedientes(ctk.CTk):
             )
             return
         
+        if self._procesando:
+            return
+        
         self.logger.info(f"Iniciando procesamiento de expedientes en: {ruta}")
         
-        # Aquí se implementará la lógica de procesamiento de expedientes
-        # Por ahora solo mostramos un mensaje
-        messagebox.showinfo(
-            "Información",
-            "El procesamiento de expedientes se implementará en la próxima versión."
-        ) 
\ No newline at end of file
+        self._procesando = True
+        self._cancelar.clear()
+        self._progreso = ProgresoProcesamiento()
+        self.btn_procesar.configure(state="disabled")
+        self.btn_cancelar.configure(state="normal", text="Cancelar")
+        if self.barra_progreso is not None:
+            self.barra_progreso.set(0)
+        self.lbl_progreso.configure(text="Buscando expedientes...")
+        
+        if self._hilo_procesamiento is None:
+            self._hilo_procesamiento = threading.Thread(
+                target=self._bucle_procesamiento, name="procesamiento", daemon=True
+            )
+            self._hilo_procesamiento.start()
+        self._trabajos.put(ruta)
+        self.after(INTERVALO_EVENTOS_MS, self._revisar_eventos)
+    
+    def _cancelar_procesamiento(self):
+        """
+        Solicita detener el procesamiento. Los expedientes en curso terminan
+        y los demás no se inician.
+        """
+        if not self._procesando:
+            return
+        self.logger.info("Cancelación del procesamiento solicitada")
+        self._cancelar.set()
+        self.btn_cancelar.configure(state="disabled", text="Cancelando...")
+    
+    def _bucle_procesamiento(self):
+        """
+        Hilo de procesamiento: atiende las rutas recibidas en _trabajos hasta
+        recibir None. Usa siempre el mismo hilo para que las conexiones SQLite
+        del procesador (manifiesto y cachés) no cambien de hilo.
+        """
+        while True:
+            ruta = self._trabajos.get()
+            if ruta is None:
+                return
+            self._ejecutar_procesamiento(ruta)
+    
+    def _ejecutar_procesamiento(self, ruta):
+        """
+        Procesa los expedientes de una ruta y publica el avance en _eventos.
+        Se ejecuta en el hilo de procesamiento.
+        
+        Args:
+            ruta (str): Ruta de los expedientes
+        """
+        try:
+            procesador = self._obtener_procesador(ruta)
+            inicio = time.monotonic()
+            procesados, ignorados, errores = procesador.procesar_expedientes(
+                al_procesar=lambda resultado: self._eventos.put((EVENTO_RESULTADO, resultado)),
+                al_iniciar=lambda total: self._eventos.put((EVENTO_INICIO, total)),
+                cancelar=self._cancelar
+            )
+            self._eventos.put((EVENTO_FIN, {
+                'procesados': procesados,
+                'al_dia': procesador.expedientes_al_dia,
+                'ignorados': ignorados,
+                'errores': errores,
+                'cancelado': procesador.cancelado,
+                'duracion': time.monotonic() - inicio
+            }))
+        except Exception as e:
+            self.logger.error(f"Error al procesar expedientes: {str(e)}")
+            self._eventos.put((EVENTO_ERROR, str(e)))
+    
+    def _obtener_procesador(self, ruta):
+        """
+        Obtiene el procesador para una ruta, reutilizando el precargado si
+        corresponde a la misma ruta. Se ejecuta en el hilo de procesamiento.
+        
+        Args:
+            ruta (str): Ruta de los expedientes
+            
+        Returns:
+            ProcesadorExpedientes: Procesador listo para usar
+        """
+        if self._precarga is not None:
+            self._precarga.join()
+        
+        if self.procesador is None or self.procesador.ruta_base != ruta:
+            from app.config import config_procesador
+            from app.procesador import ProcesadorExpedientes
+            
+            config = config_procesador()
+            config['ruta_expedientes'] = ruta
+            self.procesador = ProcesadorExpedientes(config)
+        return self.procesador
+    
+    def _revisar_eventos(self):
+        """
+        Atiende los eventos publicados por el hilo de procesamiento y actualiza
+        la ventana una sola vez. Se vuelve a programar con after() hasta el final.
+        """
+        final = None
+        for _ in range(MAX_EVENTOS_POR_REVISION):
+            try:
+                tipo, datos = self._eventos.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == EVENTO_RESULTADO:
+                self._progreso.registrar(datos)
+            elif tipo == EVENTO_INICIO:
+                self._progreso.iniciar(datos)
+            else:
+                final = (tipo, datos)
+                break
+        
+        self._actualizar_progreso()
+        if final:
+            self._finalizar_procesamiento(*final)
+        else:
+            self.after(INTERVALO_EVENTOS_MS, self._revisar_eventos)
+    
+    def _actualizar_progreso(self):
+        """
+        Muestra el avance, los contadores y el tiempo restante estimado.
+        """
+        if self._cancelar.is_set():
+            texto = "Cancelando: terminando los expedientes en curso..."
+        elif UI_CONFIG["SHOW_PROGRESS"]:
+            texto = self._progreso.texto()
+        else:
+            texto = "Procesando expedientes..."
+        
+        if self.barra_progreso is not None:
+            self.barra_progreso.set(self._progreso.fraccion())
+        self.lbl_progreso.configure(text=texto)
+    
+    def _finalizar_procesamiento(self, tipo, datos):
+        """
+        Restablece los controles y muestra el resumen del procesamiento.
+        
+        Args:
+            tipo (str): EVENTO_FIN o EVENTO_ERROR
+            datos: Totales del procesamiento o mensaje de error
+        """
+        self._procesando = False
+        self.btn_procesar.configure(state="normal")
+        self.btn_cancelar.configure(state="disabled", text="Cancelar")
+        
+        if self._cerrar_al_terminar:
+            self._trabajos.put(None)
+            self.destroy()
+            return
+        
+        if tipo == EVENTO_ERROR:
+            self.lbl_progreso.configure(text="El procesamiento terminó con un error")
+            messagebox.showerror("Error", f"Error al procesar expedientes:\n{datos}")
+            return
+        
+        titulo = "Procesamiento cancelado" if datos['cancelado'] else "Procesamiento finalizado"
+        lineas = [
+            f"Procesados: {datos['procesados']}",
+            f"Al día: {datos['al_dia']}",
+            f"Ignorados: {datos['ignorados']}",
+            f"Errores: {datos['errores']}",
+            f"Duración: {formatear_duracion(datos['duracion'])}"
+        ]
+        resumen = "\n".join(lineas)
+        if self.barra_progreso is not None and not datos['cancelado']:
+            self.barra_progreso.set(1)
+        self.lbl_progreso.configure(text=f"{titulo}.  " + "  ·  ".join(lineas))
+        self.logger.info(f"{titulo}. " + ", ".join(lineas))
+        
+        if UI_CONFIG["SHOW_SUMMARY"]:
+            messagebox.showinfo(titulo, resumen)
+    
+    def _al_cerrar(self):
+        """
+        Cierra la ventana. Si hay un procesamiento en curso, pide confirmación,
+        lo cancela y cierra cuando terminan los expedientes en curso.
+        """
+        if self._procesando:
+            if not messagebox.askyesno(
+                "Procesamiento en curso",
+                "Hay un procesamiento en curso. ¿Desea cancelarlo y salir?"
+            ):
+                return
+            self._cerrar_al_terminar = True
+            self._cancelar_procesamiento()
+            return
+        
+        self._trabajos.put(None)
+        self.destroy()
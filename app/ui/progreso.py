@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Seguimiento del progreso del procesamiento en lote para la interfaz gráfica.
+El procesamiento corre en un hilo en segundo plano que publica eventos en una
+cola; la ventana la revisa periódicamente con after() y actualiza los controles
+una sola vez por revisión, de modo que miles de expedientes no saturan Tk.
+"""
+
+import time
+
+# Milisegundos entre revisiones de la cola de eventos
+INTERVALO_EVENTOS_MS = 100
+
+# Eventos atendidos como máximo en cada revisión (el resto queda para la siguiente)
+MAX_EVENTOS_POR_REVISION = 2000
+
+# Tipos de evento publicados por el hilo de procesamiento
+EVENTO_INICIO = "inicio"
+EVENTO_RESULTADO = "resultado"
+EVENTO_FIN = "fin"
+EVENTO_ERROR = "error"
+
+def formatear_duracion(segundos):
+    """
+    Convierte una duración en texto legible.
+
+    Args:
+        segundos (float): Duración en segundos
+
+    Returns:
+        str: Texto como '45 s', '3 min 20 s' o '1 h 05 min'
+    """
+    segundos = int(round(segundos))
+    if segundos < 60:
+        return f"{segundos} s"
+    minutos, segundos = divmod(segundos, 60)
+    if minutos < 60:
+        return f"{minutos} min {segundos:02d} s"
+    horas, minutos = divmod(minutos, 60)
+    return f"{horas} h {minutos:02d} min"
+
+class ProgresoProcesamiento:
+    """
+    Contadores, avance y tiempo restante estimado de un procesamiento en lote.
+    """
+
+    def __init__(self):
+        self.total = None
+        self.contadores = {'procesados': 0, 'al_dia': 0, 'ignorados': 0, 'errores': 0}
+        self.inicio = time.monotonic()
+
+    def iniciar(self, total):
+        """
+        Registra el número de elementos a procesar.
+
+        Args:
+            total (int): Elementos encontrados en la ruta de expedientes
+        """
+        self.total = total
+        self.inicio = time.monotonic()
+
+    def registrar(self, resultado):
+        """
+        Cuenta el resultado de un expediente.
+
+        Args:
+            resultado (dict): Resultado publicado por el procesador
+        """
+        estado = resultado.get('estado')
+        if estado in ('procesado', 'simulado'):
+            self.contadores['procesados'] += 1
+        elif estado == 'al_dia':
+            self.contadores['al_dia'] += 1
+        elif estado in ('ignorado', 'otro_nodo'):
+            self.contadores['ignorados'] += 1
+        else:
+            self.contadores['errores'] += 1
+
+    @property
+    def completados(self):
+        return sum(self.contadores.values())
+
+    def fraccion(self):
+        """
+        Returns:
+            float: Avance entre 0 y 1 (0 mientras no se conoce el total)
+        """
+        if not self.total:
+            return 0.0
+        return min(1.0, self.completados / self.total)
+
+    def restante(self):
+        """
+        Estima el tiempo restante con el ritmo medio desde el inicio.
+
+        Returns:
+            float: Segundos restantes, o None si aún no hay datos suficientes
+        """
+        completados = self.completados
+        if not self.total or not completados:
+            return None
+        transcurrido = time.monotonic() - self.inicio
+        return transcurrido / completados * max(0, self.total - completados)
+
+    def texto(self):
+        """
+        Returns:
+            str: Resumen del avance para mostrar en la ventana
+        """
+        c = self.contadores
+        partes = []
+        if self.total is not None:
+            partes.append(f"{self.completados}/{self.total}")
+        partes.append(f"Procesados: {c['procesados']}  Al día: {c['al_dia']}  "
+                      f"Ignorados: {c['ignorados']}  Errores: {c['errores']}")
+        restante = self.restante()
+        if restante is not None and self.completados < (self.total or 0):
+            partes.append(f"Restante: {formatear_duracion(restante)}")
+        return "  ·  ".join(partes)
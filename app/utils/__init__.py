@@ -5,8 +5,17 @@ logging, y otras funcionalidades de soporte.
 """
 
 # Importar funciones principales para facilitar su acceso
-from .docx_helper import replace_text_in_doc, save_document
+# (las de documentos se importan al primer uso para no cargar python-docx)
 from .logger import setup_logger, get_logger
 
+__all__ = ['replace_text_in_doc', 'save_document', 'setup_logger', 'get_logger']
+
+def __getattr__(nombre):
+    """Importa las utilidades de documentos al primer uso."""
+    if nombre in ('replace_text_in_doc', 'save_document'):
+        from . import docx_helper
+        return getattr(docx_helper, nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
 # Versión del paquete de utilidades
 __version__ = '1.0.0'
\ No newline at end of file
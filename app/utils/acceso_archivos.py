@@ -0,0 +1,238 @@
+"""
+Acceso a archivos con plazo máximo y reintentos.
+En la carpeta sincronizada con OneDrive un archivo que solo está en la nube se
+descarga al abrirlo y la lectura (o la escritura) puede quedar detenida durante
+minutos. Cada operación se ejecuta en un hilo auxiliar y se abandona al vencer
+su plazo ('timeout_conexion'), lo que permite aplazar el expediente al final del
+lote en lugar de detenerlo. Los errores transitorios (archivo bloqueado por el
+cliente de sincronización) se reintentan hasta 'intentos_reconexion' veces con
+espera creciente.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FuturoAgotado
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Valores por defecto ([AVANZADO] de config.ini)
+TIMEOUT_CONEXION = 30
+INTENTOS_RECONEXION = 3
+
+# Espera antes del primer reintento (se duplica en cada uno)
+ESPERA_REINTENTO = 0.5
+
+# Prefijo de los archivos temporales de escritura: OneDrive no sincroniza los
+# archivos que empiezan por '~$', de modo que un temporal nunca llega a la nube
+PREFIJO_TEMPORAL = "~$"
+
+# Hilos auxiliares como máximo por proceso. Cada operación detenida ocupa uno
+# hasta que el sistema responde; al llegar al límite las operaciones siguientes
+# fallan de inmediato con TiempoAgotado en lugar de crear más hilos
+MAX_HILOS_PLAZO = 32
+
+# Errores que no mejoran al reintentar
+_ERRORES_PERMANENTES = (FileNotFoundError, IsADirectoryError, NotADirectoryError)
+
+class TiempoAgotado(TimeoutError):
+    """La operación sobre un archivo no terminó dentro de su plazo."""
+
+class SistemaArchivos:
+    """
+    Operaciones reales sobre el disco. Las pruebas pueden sustituirlo por otro
+    objeto con los mismos métodos (ver benchmarks/sistema_lento.py).
+    """
+
+    def leer(self, ruta_archivo):
+        """
+        Args:
+            ruta_archivo (str): Ruta al archivo
+
+        Returns:
+            bytes: Contenido completo del archivo
+        """
+        with open(ruta_archivo, 'rb') as f:
+            return f.read()
+
+    def escribir(self, ruta_archivo, datos):
+        """
+        Escribe un archivo, creando la carpeta si no existe. El contenido se
+        escribe en un temporal de la misma carpeta que luego reemplaza al
+        destino, de modo que un cierre inesperado nunca deja un archivo a medias.
+
+        Args:
+            ruta_archivo (str): Ruta de destino
+            datos (bytes): Contenido del archivo
+        """
+        directorio = os.path.dirname(ruta_archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        # Nombre único por proceso e hilo (las escrituras aplazadas pueden seguir en curso)
+        temporal = os.path.join(directorio, f"{PREFIJO_TEMPORAL}{os.path.basename(ruta_archivo)}."
+                                            f"{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temporal, 'wb') as f:
+                f.write(datos)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, ruta_archivo)
+        except BaseException:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            raise
+
+class _HilosPlazo:
+    """
+    Hilos auxiliares (daemon) que ejecutan las operaciones con plazo. Se crea un
+    hilo nuevo cuando no hay ninguno libre, hasta 'max_hilos', de modo que una
+    operación detenida no retrasa a las siguientes; los hilos libres se reutilizan.
+    """
+
+    def __init__(self, max_hilos=MAX_HILOS_PLAZO):
+        self.max_hilos = max_hilos
+        self._cola = queue.SimpleQueue()
+        self._libres = 0
+        self._hilos = 0
+        self._pid = os.getpid()
+        self._bloqueo = threading.Lock()
+
+    def ejecutar(self, funcion, *args):
+        """
+        Args:
+            funcion (callable): Operación a ejecutar
+            *args: Argumentos de la operación
+
+        Returns:
+            Future: Resultado de la operación
+
+        Raises:
+            TiempoAgotado: Si todos los hilos están ocupados y ya se creó el máximo
+        """
+        futuro = Future()
+        with self._bloqueo:
+            # Un proceso hijo creado con fork no hereda los hilos
+            if self._pid != os.getpid():
+                self._cola = queue.SimpleQueue()
+                self._libres = 0
+                self._hilos = 0
+                self._pid = os.getpid()
+            if self._libres:
+                self._libres -= 1
+            elif self._hilos >= self.max_hilos:
+                raise TiempoAgotado(f"{self._hilos} operaciones de archivo sin respuesta")
+            else:
+                self._hilos += 1
+                threading.Thread(target=self._bucle, args=(self._cola,),
+                                 name='acceso-archivos', daemon=True).start()
+            self._cola.put((futuro, funcion, args))
+        return futuro
+
+    def _bucle(self, cola):
+        while True:
+            futuro, funcion, args = cola.get()
+            if futuro.set_running_or_notify_cancel():
+                try:
+                    futuro.set_result(funcion(*args))
+                except BaseException as e:
+                    futuro.set_exception(e)
+            with self._bloqueo:
+                if cola is not self._cola:
+                    return
+                self._libres += 1
+
+_hilos_plazo = _HilosPlazo()
+
+class AccesoArchivos:
+    """
+    Lectura y escritura de archivos con plazo por operación y reintentos.
+    """
+
+    def __init__(self, timeout=TIMEOUT_CONEXION, intentos=INTENTOS_RECONEXION,
+                 espera=ESPERA_REINTENTO, sistema=None):
+        """
+        Args:
+            timeout (float): Segundos máximos de cada operación (0 = sin plazo)
+            intentos (int): Reintentos ante errores transitorios
+            espera (float): Segundos antes del primer reintento (se duplica en cada uno)
+            sistema (SistemaArchivos): Operaciones sobre el disco (por defecto, las reales)
+        """
+        self.timeout = float(timeout or 0)
+        self.intentos = max(0, int(intentos or 0))
+        self.espera = float(espera)
+        self.sistema = sistema or SistemaArchivos()
+
+    def leer(self, ruta_archivo):
+        """
+        Lee el contenido completo de un archivo.
+
+        Args:
+            ruta_archivo (str): Ruta al archivo
+
+        Returns:
+            bytes: Contenido del archivo
+
+        Raises:
+            TiempoAgotado: Si la lectura no terminó dentro del plazo
+            OSError: Si el archivo no se pudo leer tras los reintentos
+        """
+        return self._ejecutar(self.sistema.leer, ruta_archivo)
+
+    def escribir(self, ruta_archivo, datos):
+        """
+        Escribe un archivo de forma atómica, creando la carpeta si no existe.
+
+        Args:
+            ruta_archivo (str): Ruta de destino
+            datos (bytes): Contenido del archivo
+
+        Raises:
+            TiempoAgotado: Si la escritura no terminó dentro del plazo
+            OSError: Si el archivo no se pudo escribir tras los reintentos
+        """
+        self._ejecutar(self.sistema.escribir, ruta_archivo, datos)
+
+    def _ejecutar(self, operacion, ruta_archivo, *args):
+        """
+        Ejecuta una operación con plazo, reintentando los errores transitorios.
+        Un plazo vencido no se reintenta: quien llama decide si aplazar el archivo.
+        """
+        espera = self.espera
+        for intento in range(self.intentos + 1):
+            try:
+                if not self.timeout:
+                    return operacion(ruta_archivo, *args)
+                futuro = _hilos_plazo.ejecutar(operacion, ruta_archivo, *args)
+                try:
+                    return futuro.result(self.timeout)
+                except FuturoAgotado:
+                    raise TiempoAgotado(f"Sin respuesta en {self.timeout:g} s: {ruta_archivo}") from None
+            except (TiempoAgotado,) + _ERRORES_PERMANENTES:
+                raise
+            except OSError as e:
+                if intento >= self.intentos:
+                    raise
+                logger.warning("Error de acceso a %s (%s), reintento %d de %d en %.1f s",
+                               os.path.basename(ruta_archivo), e, intento + 1, self.intentos, espera)
+                time.sleep(espera)
+                espera *= 2
+
+_acceso_predeterminado = None
+
+def acceso_predeterminado():
+    """
+    Obtiene el acceso a archivos usado cuando no se indica otro (plazo e
+    intentos por defecto, sistema de archivos real).
+
+    Returns:
+        AccesoArchivos: Acceso compartido
+    """
+    global _acceso_predeterminado
+    if _acceso_predeterminado is None:
+        _acceso_predeterminado = AccesoArchivos()
+    return _acceso_predeterminado
@@ -0,0 +1,207 @@
+"""
+Medición del tiempo de arranque de la aplicación.
+Registra hitos (importaciones, creación y aparición de la ventana, precarga) y,
+opcionalmente, el tiempo de importación de cada módulo al estilo de
+'python -X importtime', para detectar regresiones en el inicio de la aplicación.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import importlib.abc
+from contextlib import contextmanager
+from datetime import datetime
+
+class _CargadorMedido(importlib.abc.Loader):
+    """
+    Envoltorio de un cargador de módulos que mide el tiempo de exec_module.
+    """
+
+    def __init__(self, cargador, medidor, nombre):
+        self._cargador = cargador
+        self._medidor = medidor
+        self._nombre = nombre
+
+    def create_module(self, spec):
+        return self._cargador.create_module(spec)
+
+    def exec_module(self, module):
+        # El módulo debe conservar su cargador real (recursos, recarga, etc.)
+        module.__loader__ = self._cargador
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._cargador
+        with self._medidor._medir_importacion(self._nombre):
+            self._cargador.exec_module(module)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cargador, nombre)
+
+class _BuscadorMedido(importlib.abc.MetaPathFinder):
+    """
+    Buscador de módulos que delega en los demás buscadores y envuelve el
+    cargador encontrado para medir la importación.
+    """
+
+    def __init__(self, medidor):
+        self._medidor = medidor
+        self._buscando = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._buscando, 'activo', False):
+            return None
+
+        self._buscando.activo = True
+        try:
+            for buscador in sys.meta_path:
+                if buscador is self or not hasattr(buscador, 'find_spec'):
+                    continue
+                spec = buscador.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._buscando.activo = False
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _CargadorMedido(spec.loader, self._medidor, fullname)
+        return spec
+
+class MedidorArranque:
+    """
+    Acumula los tiempos del arranque de la aplicación y genera el reporte.
+    """
+
+    def __init__(self, inicio=None):
+        """
+        Args:
+            inicio (float): Valor de time.perf_counter() al iniciar el proceso
+                           (por defecto, el momento de crear el medidor)
+        """
+        self.inicio = inicio if inicio is not None else time.perf_counter()
+        self.hitos = []
+        self.importaciones = []
+        self._bloqueo = threading.Lock()
+        self._pila = threading.local()
+        self._buscador = None
+
+    def _ms_desde_inicio(self):
+        return round((time.perf_counter() - self.inicio) * 1000, 1)
+
+    def marcar(self, nombre):
+        """
+        Registra un hito con el tiempo transcurrido desde el inicio.
+
+        Args:
+            nombre (str): Nombre del hito
+        """
+        with self._bloqueo:
+            self.hitos.append({'hito': nombre, 'ms': self._ms_desde_inicio()})
+
+    @contextmanager
+    def medir(self, nombre):
+        """
+        Mide la duración de un bloque y la registra como hito.
+
+        Args:
+            nombre (str): Nombre del bloque
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracion = round((time.perf_counter() - inicio) * 1000, 1)
+            with self._bloqueo:
+                self.hitos.append({'hito': nombre, 'ms': self._ms_desde_inicio(), 'duracion_ms': duracion})
+
+    @contextmanager
+    def _medir_importacion(self, nombre):
+        """
+        Mide la importación de un módulo descontando las importaciones anidadas,
+        igual que las columnas 'self' y 'cumulative' de -X importtime.
+        """
+        pila = getattr(self._pila, 'pila', None)
+        if pila is None:
+            pila = self._pila.pila = []
+
+        pila.append(0.0)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            acumulado = time.perf_counter() - inicio
+            anidado = pila.pop()
+            if pila:
+                pila[-1] += acumulado
+            with self._bloqueo:
+                self.importaciones.append({
+                    'modulo': nombre,
+                    'nivel': len(pila),
+                    'propio_ms': round((acumulado - anidado) * 1000, 2),
+                    'acumulado_ms': round(acumulado * 1000, 2)
+                })
+
+    def activar_importaciones(self):
+        """Empieza a medir el tiempo de importación de cada módulo."""
+        if self._buscador is None:
+            self._buscador = _BuscadorMedido(self)
+            sys.meta_path.insert(0, self._buscador)
+
+    def desactivar_importaciones(self):
+        """Deja de medir las importaciones."""
+        if self._buscador is not None:
+            try:
+                sys.meta_path.remove(self._buscador)
+            except ValueError:
+                pass
+            self._buscador = None
+
+    def reporte(self, maximo_modulos=25):
+        """
+        Genera el reporte de arranque en texto.
+
+        Args:
+            maximo_modulos (int): Número de módulos más lentos a incluir
+
+        Returns:
+            str: Reporte legible
+        """
+        with self._bloqueo:
+            hitos = list(self.hitos)
+            importaciones = sorted(self.importaciones, key=lambda i: i['acumulado_ms'], reverse=True)
+
+        lineas = ["Reporte de arranque:"]
+        for hito in hitos:
+            duracion = f" ({hito['duracion_ms']} ms)" if 'duracion_ms' in hito else ""
+            lineas.append(f"  {hito['ms']:>9.1f} ms  {hito['hito']}{duracion}")
+
+        if importaciones:
+            lineas.append("Importaciones más lentas (propio | acumulado):")
+            for importacion in importaciones[:maximo_modulos]:
+                lineas.append(f"  {importacion['propio_ms']:>9.2f} | {importacion['acumulado_ms']:>9.2f} ms  "
+                              f"{'  ' * importacion['nivel']}{importacion['modulo']}")
+        return "\n".join(lineas)
+
+    def guardar(self, ruta_log):
+        """
+        Agrega el resultado del arranque al historial 'arranque.jsonl' de la carpeta de logs.
+
+        Args:
+            ruta_log (str): Carpeta de logs
+
+        Returns:
+            str: Ruta del historial
+        """
+        os.makedirs(ruta_log, exist_ok=True)
+        ruta = os.path.join(ruta_log, "arranque.jsonl")
+        with self._bloqueo:
+            registro = {
+                'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'hitos': list(self.hitos),
+                'importaciones': sorted(self.importaciones, key=lambda i: i['acumulado_ms'], reverse=True)
+            }
+        with open(ruta, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        return ruta
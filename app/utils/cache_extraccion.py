@@ -0,0 +1,204 @@
+"""
+Caché persistente de la información extraída de los archivos de aceptación.
+Las extracciones se guardan por hash del contenido del archivo y por versión del
+extractor (firma de los campos, patrones y operadores), de modo que un archivo
+copiado, renombrado o vuelto a procesar con otro formato no se lee de nuevo, y
+un cambio en los patrones invalida las entradas anteriores. Antes de calcular el
+hash se compara el tamaño y la fecha de modificación registrados para la ruta.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+
+try:
+    from .manifiesto import hash_archivo
+except ImportError:
+    from manifiesto import hash_archivo
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Límites por defecto para la depuración de la caché
+MAX_DIAS_CACHE = 90
+MAX_ENTRADAS_CACHE = 50000
+
+# La fecha de último uso solo se actualiza si es más antigua que esto (segundos),
+# para no escribir en la base en cada acierto
+_ACTUALIZAR_USO = 24 * 3600
+
+class CacheExtraccion:
+    """
+    Caché de extracciones almacenada en SQLite.
+    Cada proceso debe abrir su propia instancia.
+    """
+
+    def __init__(self, ruta_db, version, acceso=None):
+        """
+        Abre (o crea) la caché.
+
+        Args:
+            ruta_db (str): Ruta al archivo SQLite de la caché
+            version (str): Versión del extractor; solo se usan las entradas con
+                          la misma versión
+            acceso (AccesoArchivos): Acceso con plazo para leer los archivos al
+                                     calcular su hash (opcional)
+        """
+        self.ruta_db = ruta_db
+        self.version = version
+        self.acceso = acceso
+        directorio = os.path.dirname(ruta_db)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._conexion = sqlite3.connect(ruta_db, timeout=30)
+        try:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError as e:
+            logger.debug("No se pudo activar WAL en la caché de extracción: %s", e)
+        self._conexion.execute(
+            """CREATE TABLE IF NOT EXISTS extracciones (
+                hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                datos TEXT NOT NULL,
+                ultimo_uso REAL NOT NULL,
+                PRIMARY KEY (hash, version)
+            )"""
+        )
+        self._conexion.execute(
+            """CREATE TABLE IF NOT EXISTS archivos (
+                ruta TEXT PRIMARY KEY,
+                tamano INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                hash TEXT NOT NULL
+            )"""
+        )
+        self._conexion.commit()
+
+    def hash_conocido(self, ruta_archivo):
+        """
+        Obtiene el hash registrado para una ruta sin leer el archivo.
+
+        Args:
+            ruta_archivo (str): Ruta al archivo
+
+        Returns:
+            str: Hash SHA-256 del contenido, o None si la ruta no está registrada
+                 o su tamaño o fecha cambiaron
+        """
+        return self._hash_registrado(ruta_archivo, os.stat(ruta_archivo))
+
+    def hash_de(self, ruta_archivo, contenido=None):
+        """
+        Obtiene el hash del contenido de un archivo. Si el tamaño y la fecha
+        coinciden con los registrados para la ruta, no se lee el archivo.
+
+        Args:
+            ruta_archivo (str): Ruta al archivo
+            contenido (bytes): Contenido ya leído del archivo (opcional)
+
+        Returns:
+            str: Hash SHA-256 del contenido
+        """
+        stat = os.stat(ruta_archivo)
+        registrado = self._hash_registrado(ruta_archivo, stat)
+        if registrado:
+            return registrado
+
+        if contenido is not None:
+            calculado = hashlib.sha256(contenido).hexdigest()
+        else:
+            calculado = hash_archivo(ruta_archivo, self.acceso)
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO archivos VALUES (?, ?, ?, ?)",
+            (ruta_archivo, stat.st_size, stat.st_mtime_ns, calculado)
+        )
+        self._conexion.commit()
+        return calculado
+
+    def _hash_registrado(self, ruta_archivo, stat):
+        fila = self._conexion.execute(
+            "SELECT tamano, mtime_ns, hash FROM archivos WHERE ruta = ?", (ruta_archivo,)
+        ).fetchone()
+        if fila and fila[0] == stat.st_size and fila[1] == stat.st_mtime_ns:
+            return fila[2]
+        return None
+
+    def obtener(self, hash_contenido):
+        """
+        Obtiene la extracción guardada para un contenido.
+
+        Args:
+            hash_contenido (str): Hash del archivo de aceptación
+
+        Returns:
+            dict: Datos guardados ('info' y 'faltantes'), o None si no están en la caché
+        """
+        fila = self._conexion.execute(
+            "SELECT datos, ultimo_uso FROM extracciones WHERE hash = ? AND version = ?",
+            (hash_contenido, self.version)
+        ).fetchone()
+        if not fila:
+            return None
+
+        ahora = time.time()
+        if ahora - fila[1] > _ACTUALIZAR_USO:
+            self._conexion.execute(
+                "UPDATE extracciones SET ultimo_uso = ? WHERE hash = ? AND version = ?",
+                (ahora, hash_contenido, self.version)
+            )
+            self._conexion.commit()
+        return json.loads(fila[0])
+
+    def guardar(self, hash_contenido, info, faltantes=None):
+        """
+        Guarda el resultado de una extracción, incluso si le faltaron datos.
+
+        Args:
+            hash_contenido (str): Hash del archivo de aceptación
+            info (dict): Información extraída, o None si la extracción no fue completa
+            faltantes (list): Campos requeridos que no se encontraron
+        """
+        datos = json.dumps({'info': info, 'faltantes': faltantes or []}, ensure_ascii=False)
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO extracciones VALUES (?, ?, ?, ?)",
+            (hash_contenido, self.version, datos, time.time())
+        )
+        self._conexion.commit()
+
+    def depurar(self, max_dias=MAX_DIAS_CACHE, max_entradas=MAX_ENTRADAS_CACHE):
+        """
+        Elimina las entradas de otras versiones del extractor, las que no se
+        usan hace más de max_dias y, si aún se supera max_entradas, las de uso
+        más antiguo.
+
+        Args:
+            max_dias (float): Días sin uso tras los que se elimina una entrada
+            max_entradas (int): Número máximo de extracciones guardadas
+
+        Returns:
+            int: Número de extracciones eliminadas
+        """
+        limite = time.time() - max_dias * 24 * 3600
+        cursor = self._conexion.execute(
+            "DELETE FROM extracciones WHERE version != ? OR ultimo_uso < ?", (self.version, limite)
+        )
+        eliminadas = cursor.rowcount
+        cursor = self._conexion.execute(
+            "DELETE FROM extracciones WHERE rowid IN (SELECT rowid FROM extracciones "
+            "ORDER BY ultimo_uso DESC LIMIT -1 OFFSET ?)", (max_entradas,)
+        )
+        eliminadas += cursor.rowcount
+        # Rutas cuyo hash ya no tiene extracciones asociadas
+        self._conexion.execute(
+            "DELETE FROM archivos WHERE hash NOT IN (SELECT hash FROM extracciones)"
+        )
+        self._conexion.commit()
+        return eliminadas
+
+    def cerrar(self):
+        """Cierra la conexión con la caché."""
+        self._conexion.close()
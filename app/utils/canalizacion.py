@@ -0,0 +1,121 @@
+"""
+Hilos de entrada/salida para solapar la lectura y escritura de archivos con el
+procesamiento de los expedientes.
+En carpetas sincronizadas (OneDrive/SharePoint) la mayor parte del tiempo de un
+documento se pierde esperando los bytes. Los archivos de aceptación y los
+formatos se leen por adelantado en un grupo de hilos mientras el hilo principal
+interpreta y genera los documentos a partir de memoria, y las notificaciones se
+escriben en un hilo aparte. El número de escrituras pendientes está limitado,
+de modo que la memoria usada no crece si el disco es más lento que el proceso.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .manifiesto import huella_archivo
+    from .acceso_archivos import acceso_predeterminado
+except ImportError:
+    from manifiesto import huella_archivo
+    from acceso_archivos import acceso_predeterminado
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Valores por defecto de la canalización
+HILOS_LECTURA = 4
+MAX_ANTICIPADOS = 8
+
+def leer_archivo(ruta_archivo, acceso=None):
+    """
+    Lee el contenido completo de un archivo.
+
+    Args:
+        ruta_archivo (str): Ruta al archivo
+        acceso (AccesoArchivos): Acceso a archivos con plazo y reintentos (opcional)
+
+    Returns:
+        tuple: (huella tomada antes de leer, contenido en bytes, duración en ms)
+    """
+    inicio = time.perf_counter()
+    huella = huella_archivo(ruta_archivo)
+    datos = (acceso or acceso_predeterminado()).leer(ruta_archivo)
+    return huella, datos, (time.perf_counter() - inicio) * 1000
+
+def escribir_archivo(ruta_archivo, datos, acceso=None):
+    """
+    Escribe un archivo, creando la carpeta si no existe.
+
+    Args:
+        ruta_archivo (str): Ruta de destino
+        datos (bytes): Contenido del archivo
+        acceso (AccesoArchivos): Acceso a archivos con plazo y reintentos (opcional)
+
+    Returns:
+        float: Duración de la escritura en ms
+    """
+    inicio = time.perf_counter()
+    (acceso or acceso_predeterminado()).escribir(ruta_archivo, datos)
+    logger.info("Documento guardado en: %s", ruta_archivo)
+    return (time.perf_counter() - inicio) * 1000
+
+class HilosES:
+    """
+    Grupo de hilos de lectura y un hilo de escritura con límite de escrituras
+    pendientes. Las lecturas las limita quien las solicita (ventana de
+    expedientes anticipados); las escrituras bloquean al llamador cuando se
+    alcanza el límite.
+    """
+
+    def __init__(self, hilos_lectura=HILOS_LECTURA, max_escrituras=MAX_ANTICIPADOS, acceso=None):
+        """
+        Args:
+            hilos_lectura (int): Número de lecturas simultáneas
+            max_escrituras (int): Número máximo de escrituras en cola
+            acceso (AccesoArchivos): Acceso a archivos con plazo y reintentos (opcional)
+        """
+        self.acceso = acceso or acceso_predeterminado()
+        self._lectores = ThreadPoolExecutor(max_workers=max(1, hilos_lectura),
+                                            thread_name_prefix='lectura')
+        self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='escritura')
+        self._cupos = threading.BoundedSemaphore(max(1, max_escrituras))
+
+    def leer(self, ruta_archivo):
+        """
+        Solicita la lectura anticipada de un archivo.
+
+        Args:
+            ruta_archivo (str): Ruta al archivo
+
+        Returns:
+            Future: Resultado de leer_archivo
+        """
+        return self._lectores.submit(leer_archivo, ruta_archivo, self.acceso)
+
+    def escribir(self, ruta_archivo, datos):
+        """
+        Encola la escritura de un archivo. Bloquea mientras haya el número
+        máximo de escrituras pendientes.
+
+        Args:
+            ruta_archivo (str): Ruta de destino
+            datos (bytes): Contenido del archivo
+
+        Returns:
+            Future: Resultado de escribir_archivo
+        """
+        self._cupos.acquire()
+        try:
+            futuro = self._escritor.submit(escribir_archivo, ruta_archivo, datos, self.acceso)
+        except Exception:
+            self._cupos.release()
+            raise
+        futuro.add_done_callback(lambda _: self._cupos.release())
+        return futuro
+
+    def cerrar(self):
+        """Espera las escrituras pendientes y libera los hilos."""
+        self._lectores.shutdown(wait=True)
+        self._escritor.shutdown(wait=True)
@@ -0,0 +1,281 @@
+"""
+Reparto de un lote entre varios equipos que procesan la misma carpeta sincronizada.
+
+Hay dos modos:
+- Concesiones: antes de procesar un expediente el equipo crea en la carpeta
+  compartida un archivo de concesión con creación exclusiva. Mientras el equipo
+  trabaja la concesión se renueva; si deja de renovarse durante
+  'duracion_concesion' segundos (el equipo se apagó o se cerró la aplicación),
+  otro equipo la recupera. Al terminar, la concesión queda marcada como
+  terminada con la huella del archivo de aceptación, de modo que los demás
+  equipos no vuelven a generar la notificación mientras el archivo no cambie.
+- Partición: cada equipo procesa solo los expedientes cuyo hash de nombre le
+  corresponde (equipo 'numero_nodo' de 'nodos'). No requiere archivos
+  compartidos, pero los expedientes de un equipo que no se ejecuta quedan
+  pendientes hasta que lo haga.
+
+La creación exclusiva solo es atómica dentro de un mismo sistema de archivos:
+entre equipos depende de la rapidez con que OneDrive sincroniza la carpeta de
+concesiones; si dos equipos toman el mismo expediente casi a la vez, ambos
+generan el mismo documento. La partición no tiene esta limitación.
+"""
+
+import os
+import json
+import time
+import uuid
+import zlib
+import socket
+import logging
+import threading
+from datetime import datetime
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Modos de coordinación ([COORDINACION] modo)
+MODO_CONCESIONES = "concesiones"
+MODO_PARTICION = "particion"
+
+# Carpeta de las concesiones dentro de la ruta de expedientes
+CARPETA_CONCESIONES = ".concesiones"
+
+# Segundos sin renovar tras los cuales una concesión se considera abandonada
+DURACION_CONCESION = 300
+
+# Estados de una concesión
+CONCESION_ACTIVA = "activa"
+CONCESION_TERMINADA = "terminada"
+
+def nombre_nodo():
+    """
+    Returns:
+        str: Nombre de este equipo en la red
+    """
+    return socket.gethostname() or "equipo"
+
+def en_particion(nombre_expediente, numero_nodo, nodos):
+    """
+    Indica si un expediente corresponde a un equipo en el modo de partición.
+    El reparto depende solo del nombre, de modo que todos los equipos llegan
+    al mismo resultado sin comunicarse.
+
+    Args:
+        nombre_expediente (str): Nombre de la carpeta del expediente
+        numero_nodo (int): Número de este equipo (1 a nodos)
+        nodos (int): Número de equipos que se reparten el lote
+
+    Returns:
+        bool: True si el expediente le corresponde a este equipo
+    """
+    if nodos <= 1:
+        return True
+    return zlib.crc32(nombre_expediente.encode('utf-8')) % nodos == numero_nodo - 1
+
+class ConcesionesExpedientes:
+    """
+    Concesiones de expedientes de una ejecución, guardadas como archivos JSON en
+    una carpeta compartida. Los procesos de una misma ejecución (el principal y
+    sus workers) comparten el identificador de ejecución, de modo que ninguno
+    toma como ajena la concesión de otro; cada proceso solo renueva y termina
+    las concesiones que tomó él.
+    """
+
+    def __init__(self, carpeta, nodo=None, duracion=DURACION_CONCESION, ejecucion=None):
+        """
+        Args:
+            carpeta (str): Carpeta compartida de las concesiones
+            nodo (str): Nombre de este equipo (por defecto, el nombre en la red)
+            duracion (float): Segundos sin renovar tras los cuales una concesión
+                              se considera abandonada
+            ejecucion (str): Identificador de la ejecución (por defecto, uno nuevo)
+        """
+        self.carpeta = carpeta
+        self.nodo = nodo or nombre_nodo()
+        self.duracion = float(duracion)
+        self.ejecucion = ejecucion or uuid.uuid4().hex
+        self.recuperadas = 0
+        # expediente -> huella del archivo de aceptación de las concesiones activas
+        self._activas = {}
+        self._bloqueo = threading.Lock()
+        self._detener = threading.Event()
+        self._renovacion = None
+
+    def _ruta(self, nombre_expediente):
+        return os.path.join(self.carpeta, nombre_expediente + ".json")
+
+    def _leer(self, ruta):
+        """
+        Returns:
+            dict: Contenido de la concesión, o None si no existe o no se puede leer
+        """
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _contenido(self, estado, huella):
+        return {
+            'nodo': self.nodo,
+            'ejecucion': self.ejecucion,
+            'pid': os.getpid(),
+            'estado': estado,
+            'huella': huella,
+            'renovada': time.time(),
+            'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def _escribir(self, ruta, contenido):
+        """Reemplaza una concesión propia sin que otro equipo lea un archivo a medias."""
+        temporal = f"{ruta}.{self.ejecucion}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(contenido, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+    def _abandonada(self, ruta, concesion):
+        """
+        Indica si una concesión activa dejó de renovarse. Las que no se pueden
+        leer (p. ej. a medio sincronizar) se juzgan por la fecha del archivo.
+        """
+        try:
+            renovada = concesion['renovada'] if concesion else os.path.getmtime(ruta)
+        except OSError:
+            return False
+        return time.time() - renovada > self.duracion
+
+    def tomar(self, nombre_expediente, huella=None, forzar=False):
+        """
+        Intenta tomar un expediente para esta ejecución.
+
+        Args:
+            nombre_expediente (str): Nombre de la carpeta del expediente
+            huella (str): Huella del archivo de aceptación actual
+            forzar (bool): Si es True se toman también los expedientes que otro
+                           equipo ya terminó (no los que está procesando)
+
+        Returns:
+            bool: True si el expediente quedó a cargo de esta ejecución
+        """
+        ruta = self._ruta(nombre_expediente)
+        for _ in range(3):
+            try:
+                descriptor = os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileNotFoundError:
+                os.makedirs(self.carpeta, exist_ok=True)
+                continue
+            except FileExistsError:
+                concesion = self._leer(ruta)
+                if concesion and concesion.get('ejecucion') == self.ejecucion:
+                    # Ya es de esta ejecución (reintento o nuevo cambio en modo vigilancia)
+                    if concesion.get('estado') != CONCESION_ACTIVA:
+                        self._escribir(ruta, self._contenido(CONCESION_ACTIVA, huella))
+                    with self._bloqueo:
+                        self._activas[nombre_expediente] = huella
+                    self._iniciar_renovacion()
+                    return True
+                if concesion and concesion.get('estado') == CONCESION_TERMINADA:
+                    # Terminado por otro equipo con el mismo archivo de aceptación
+                    if not forzar and concesion.get('nodo') != self.nodo and concesion.get('huella') == huella:
+                        return False
+                elif not self._abandonada(ruta, concesion):
+                    return False
+                else:
+                    logger.warning("Se recupera la concesión abandonada de %s (equipo %s)", nombre_expediente,
+                                   (concesion or {}).get('nodo', 'desconocido'))
+                    self.recuperadas += 1
+                # Descartar la concesión anterior si nadie la cambió entretanto
+                if self._leer(ruta) != concesion:
+                    continue
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+                continue
+            try:
+                os.write(descriptor, json.dumps(self._contenido(CONCESION_ACTIVA, huella),
+                                                ensure_ascii=False).encode('utf-8'))
+            finally:
+                os.close(descriptor)
+            with self._bloqueo:
+                self._activas[nombre_expediente] = huella
+            self._iniciar_renovacion()
+            return True
+        return False
+
+    def terminar(self, nombre_expediente, liberar=False):
+        """
+        Cierra la concesión de un expediente, si la tomó este proceso.
+
+        Args:
+            nombre_expediente (str): Nombre de la carpeta del expediente
+            liberar (bool): Si es True se elimina la concesión para que otro
+                            equipo pueda tomar el expediente; si no, queda
+                            terminada con la huella del archivo de aceptación
+        """
+        # El bloqueo impide que la renovación en curso la reescriba como activa
+        with self._bloqueo:
+            if nombre_expediente not in self._activas:
+                return
+            huella = self._activas.pop(nombre_expediente)
+            ruta = self._ruta(nombre_expediente)
+            concesion = self._leer(ruta)
+            if not concesion or concesion.get('ejecucion') != self.ejecucion:
+                return
+            try:
+                if liberar:
+                    os.remove(ruta)
+                else:
+                    self._escribir(ruta, self._contenido(CONCESION_TERMINADA, huella or concesion.get('huella')))
+            except OSError as e:
+                logger.warning("No se pudo cerrar la concesión de %s: %s", nombre_expediente, e)
+
+    def renovar(self):
+        """
+        Renueva las concesiones activas de este proceso. Las que ya se
+        terminaron o que tomó otro equipo dejan de renovarse.
+
+        Returns:
+            int: Concesiones renovadas
+        """
+        with self._bloqueo:
+            activas = list(self._activas)
+        renovadas = 0
+        for nombre_expediente in activas:
+            # Se comprueba y se reescribe bajo el bloqueo, para no reactivar una
+            # concesión que terminar() cerró mientras tanto
+            with self._bloqueo:
+                if nombre_expediente not in self._activas:
+                    continue
+                ruta = self._ruta(nombre_expediente)
+                concesion = self._leer(ruta)
+                if (not concesion or concesion.get('ejecucion') != self.ejecucion
+                        or concesion.get('estado') != CONCESION_ACTIVA):
+                    self._activas.pop(nombre_expediente, None)
+                    continue
+                try:
+                    self._escribir(ruta, self._contenido(CONCESION_ACTIVA, self._activas[nombre_expediente]))
+                    renovadas += 1
+                except OSError as e:
+                    logger.warning("No se pudo renovar la concesión de %s: %s", nombre_expediente, e)
+        return renovadas
+
+    def _iniciar_renovacion(self):
+        if self._renovacion is not None and self._renovacion.is_alive():
+            return
+        self._detener.clear()
+        self._renovacion = threading.Thread(target=self._renovar_periodicamente,
+                                            name='renovacion-concesiones', daemon=True)
+        self._renovacion.start()
+
+    def _renovar_periodicamente(self):
+        while not self._detener.wait(self.duracion / 3):
+            self.renovar()
+
+    def cerrar(self):
+        """Detiene la renovación y libera las concesiones activas de este proceso."""
+        self._detener.set()
+        with self._bloqueo:
+            activas = list(self._activas)
+        for nombre_expediente in activas:
+            self.terminar(nombre_expediente, liberar=True)
@@ -0,0 +1,168 @@
+"""
+Diario del lote en curso, para reanudar un procesamiento interrumpido.
+Cada expediente terminado (procesado, al día o con error) se agrega como una
+línea JSON a un archivo que solo crece. Las líneas se confirman en disco
+(fsync) por grupos, cada 'sincronizar_cada' expedientes o cada
+'intervalo_sincronizacion' segundos, para no pagar una sincronización por
+expediente. Si la aplicación se cierra o el equipo se reinicia, la siguiente
+ejecución con 'reanudar' omite los expedientes ya confirmados; los del último
+grupo sin confirmar se vuelven a procesar, lo que no genera documentos
+distintos porque cada documento se escribe de forma atómica.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+from datetime import datetime
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Versión del formato del diario
+VERSION_DIARIO = 1
+
+# Expedientes y segundos entre confirmaciones en disco
+SINCRONIZAR_CADA = 50
+INTERVALO_SINCRONIZACION = 2.0
+
+# Tipos de línea del diario
+TIPO_INICIO = "inicio"
+TIPO_EXPEDIENTE = "expediente"
+TIPO_FIN = "fin"
+
+def leer_lote_interrumpido(ruta_archivo, ruta_base):
+    """
+    Lee el diario de un lote que no llegó a terminar.
+
+    Args:
+        ruta_archivo (str): Archivo del diario
+        ruta_base (str): Carpeta de expedientes del lote que se quiere reanudar
+
+    Returns:
+        dict: Expediente -> línea registrada (con 'estado' y 'motivo'), o None
+              si no hay un lote interrumpido de la misma ruta base
+    """
+    try:
+        with open(ruta_archivo, 'r', encoding='utf-8') as f:
+            lineas = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("No se pudo leer el diario del lote %s: %s", ruta_archivo, e)
+        return None
+
+    inicio = None
+    expedientes = {}
+    for linea in lineas:
+        try:
+            registro = json.loads(linea)
+        except ValueError:
+            # Línea a medio escribir al interrumpirse el lote
+            continue
+        tipo = registro.get('tipo')
+        if tipo == TIPO_INICIO:
+            inicio = registro
+            expedientes = {}
+        elif tipo == TIPO_EXPEDIENTE and inicio is not None:
+            expedientes[registro['expediente']] = registro
+        elif tipo == TIPO_FIN:
+            inicio = None
+
+    if (inicio is None or inicio.get('version') != VERSION_DIARIO
+            or inicio.get('ruta_base') != ruta_base):
+        return None
+    return expedientes
+
+class DiarioLote:
+    """
+    Diario de solo escritura al final de un lote de expedientes.
+    """
+
+    def __init__(self, ruta_archivo, sincronizar_cada=SINCRONIZAR_CADA,
+                 intervalo_sincronizacion=INTERVALO_SINCRONIZACION):
+        """
+        Args:
+            ruta_archivo (str): Archivo del diario
+            sincronizar_cada (int): Expedientes entre confirmaciones en disco
+            intervalo_sincronizacion (float): Segundos máximos entre confirmaciones
+        """
+        self.ruta_archivo = ruta_archivo
+        self.sincronizar_cada = max(1, int(sincronizar_cada))
+        self.intervalo_sincronizacion = float(intervalo_sincronizacion)
+        self.lote = None
+        self._archivo = None
+        self._pendientes = 0
+        self._ultima_sincronizacion = 0.0
+
+    def iniciar(self, ruta_base, continuar=False):
+        """
+        Abre el diario para un lote.
+
+        Args:
+            ruta_base (str): Carpeta de expedientes del lote
+            continuar (bool): Si es True se agrega al lote interrumpido del
+                              diario; si no, el diario empieza de nuevo
+        """
+        directorio = os.path.dirname(self.ruta_archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._archivo = open(self.ruta_archivo, 'a' if continuar else 'w', encoding='utf-8')
+        self.lote = uuid.uuid4().hex
+        if continuar:
+            # Una línea a medio escribir no debe unirse con la siguiente
+            self._archivo.write("\n")
+        else:
+            self._escribir({'tipo': TIPO_INICIO, 'version': VERSION_DIARIO, 'lote': self.lote,
+                            'ruta_base': ruta_base})
+            self.sincronizar()
+
+    def registrar(self, resultado):
+        """
+        Agrega el resultado de un expediente. Se confirma en disco cuando se
+        completa el grupo o vence el intervalo de sincronización.
+
+        Args:
+            resultado (dict): Resultado del procesamiento del expediente
+        """
+        if self._archivo is None:
+            return
+        self._escribir({'tipo': TIPO_EXPEDIENTE, 'expediente': resultado['expediente'],
+                        'estado': resultado['estado'], 'motivo': resultado['motivo']})
+        self._pendientes += 1
+        if (self._pendientes >= self.sincronizar_cada
+                or time.monotonic() - self._ultima_sincronizacion >= self.intervalo_sincronizacion):
+            self.sincronizar()
+
+    def sincronizar(self):
+        """Confirma en disco las líneas escritas."""
+        if self._archivo is None:
+            return
+        try:
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+        except OSError as e:
+            logger.warning("No se pudo confirmar el diario del lote %s: %s", self.ruta_archivo, e)
+        self._pendientes = 0
+        self._ultima_sincronizacion = time.monotonic()
+
+    def cerrar(self, terminado=True):
+        """
+        Cierra el diario.
+
+        Args:
+            terminado (bool): Si es True el lote queda terminado y ya no se
+                              reanuda; si no (p. ej. al cancelar), se podrá reanudar
+        """
+        if self._archivo is None:
+            return
+        if terminado:
+            self._escribir({'tipo': TIPO_FIN, 'lote': self.lote})
+        self.sincronizar()
+        self._archivo.close()
+        self._archivo = None
+
+    def _escribir(self, registro):
+        registro['fecha'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
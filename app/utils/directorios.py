@@ -0,0 +1,168 @@
+"""
+Índice de la estructura de carpetas de los expedientes.
+Recorre la ruta base con os.scandir y guarda, por expediente, la carpeta del
+cuaderno principal, el archivo de aceptación y la carpeta de notificaciones.
+El índice se conserva entre ejecuciones y solo se vuelven a listar las carpetas
+cuya fecha de modificación cambió, para no repetir listados y consultas de
+existencia sobre carpetas sincronizadas (OneDrive/SharePoint), donde son lentos.
+"""
+
+import os
+import json
+import uuid
+import logging
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Nombres fijos de la estructura de un expediente
+CARPETA_CUADERNO = "01. CUADERNO PRINCIPAL"
+CARPETA_NOTIFICACIONES = "02. NOTIFICACIONES"
+PREFIJO_ACEPTACION = "Aceptación de solicitud"
+
+# Versión del formato del archivo del índice
+VERSION_INDICE = 1
+
+def escanear_expediente(ruta_expediente, anterior=None, mtime_ns=None):
+    """
+    Obtiene la estructura de un expediente, reutilizando la entrada anterior
+    del índice para las carpetas que no cambiaron.
+
+    Args:
+        ruta_expediente (str): Ruta de la carpeta del expediente
+        anterior (dict): Entrada del índice de la ejecución anterior (opcional)
+        mtime_ns (int): Fecha de modificación de la carpeta del expediente, si ya se conoce
+
+    Returns:
+        dict: Entrada con las claves 'mtime_ns', 'cuaderno', 'cuaderno_mtime_ns',
+              'aceptacion', 'notificaciones' (nombres de archivo o None) y 'error'
+    """
+    entrada = {'mtime_ns': mtime_ns, 'cuaderno': None, 'cuaderno_mtime_ns': None,
+               'aceptacion': None, 'notificaciones': None, 'error': None}
+    try:
+        if mtime_ns is None:
+            entrada['mtime_ns'] = os.stat(ruta_expediente).st_mtime_ns
+
+        # Si la carpeta del expediente no cambió, sus subcarpetas son las mismas:
+        # basta con consultar la fecha del cuaderno principal
+        if anterior and not anterior.get('error') and anterior.get('mtime_ns') == entrada['mtime_ns']:
+            entrada['cuaderno'] = anterior['cuaderno']
+            entrada['notificaciones'] = anterior['notificaciones']
+            if entrada['cuaderno']:
+                entrada['cuaderno_mtime_ns'] = os.stat(
+                    os.path.join(ruta_expediente, entrada['cuaderno'])).st_mtime_ns
+        else:
+            with os.scandir(ruta_expediente) as entradas:
+                for elemento in entradas:
+                    if elemento.name == CARPETA_CUADERNO and elemento.is_dir():
+                        entrada['cuaderno'] = elemento.name
+                        entrada['cuaderno_mtime_ns'] = elemento.stat().st_mtime_ns
+                    elif elemento.name == CARPETA_NOTIFICACIONES and elemento.is_dir():
+                        entrada['notificaciones'] = elemento.name
+
+        if not entrada['cuaderno']:
+            return entrada
+
+        if anterior and anterior.get('cuaderno_mtime_ns') == entrada['cuaderno_mtime_ns']:
+            entrada['aceptacion'] = anterior['aceptacion']
+        else:
+            with os.scandir(os.path.join(ruta_expediente, entrada['cuaderno'])) as entradas:
+                for elemento in entradas:
+                    if elemento.name.startswith(PREFIJO_ACEPTACION):
+                        entrada['aceptacion'] = elemento.name
+                        break
+
+    except OSError as e:
+        entrada['error'] = str(e)
+    return entrada
+
+class IndiceExpedientes:
+    """
+    Índice persistente de los expedientes de una ruta base.
+    """
+
+    def __init__(self, ruta_base, ruta_archivo=None):
+        """
+        Args:
+            ruta_base (str): Carpeta que contiene los expedientes
+            ruta_archivo (str): Archivo JSON donde se conserva el índice entre
+                               ejecuciones (opcional)
+        """
+        self.ruta_base = ruta_base
+        self.ruta_archivo = ruta_archivo
+        self.entradas = {}
+        self.reescaneados = 0
+
+    def cargar(self):
+        """
+        Carga el índice guardado. Si no existe, no corresponde a la misma ruta
+        base o está dañado, se empieza con un índice vacío.
+        """
+        self.entradas = {}
+        if not self.ruta_archivo or not os.path.exists(self.ruta_archivo):
+            return
+        try:
+            with open(self.ruta_archivo, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            if datos.get('version') == VERSION_INDICE and datos.get('ruta_base') == self.ruta_base:
+                self.entradas = datos.get('expedientes', {})
+        except (OSError, ValueError) as e:
+            logger.warning("No se pudo cargar el índice de expedientes %s: %s", self.ruta_archivo, e)
+
+    def guardar(self):
+        """Guarda el índice de forma atómica (archivo temporal y reemplazo)."""
+        if not self.ruta_archivo:
+            return
+        datos = {'version': VERSION_INDICE, 'ruta_base': self.ruta_base, 'expedientes': self.entradas}
+        # Temporal propio de cada proceso: varios equipos o procesos pueden compartir la carpeta
+        temporal = f"{self.ruta_archivo}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            directorio = os.path.dirname(self.ruta_archivo)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta_archivo)
+        except OSError as e:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            logger.warning("No se pudo guardar el índice de expedientes %s: %s", self.ruta_archivo, e)
+
+    def escanear(self, excluir=None):
+        """
+        Recorre la ruta base y actualiza el índice. Las carpetas cuya fecha de
+        modificación no cambió se toman del índice anterior.
+
+        Args:
+            excluir (callable): Función que recibe el nombre de un elemento de la
+                               ruta base y devuelve True si no debe escanearse
+
+        Returns:
+            list: Tuplas (nombre, entrada) en orden alfabético de las carpetas de
+                  la ruta base y de los elementos excluidos (con entrada None)
+        """
+        anteriores = self.entradas
+        self.entradas = {}
+        self.reescaneados = 0
+
+        carpetas = []
+        excluidos = []
+        with os.scandir(self.ruta_base) as elementos:
+            for elemento in elementos:
+                if excluir and excluir(elemento.name):
+                    excluidos.append((elemento.name, None))
+                elif elemento.is_dir() and not elemento.name.startswith('.'):
+                    # Las carpetas ocultas (p. ej. .concesiones) no son expedientes
+                    carpetas.append((elemento.name, elemento.stat().st_mtime_ns))
+
+        for nombre, mtime_ns in carpetas:
+            anterior = anteriores.get(nombre)
+            entrada = escanear_expediente(os.path.join(self.ruta_base, nombre), anterior, mtime_ns)
+            if not anterior or anterior.get('mtime_ns') != mtime_ns \
+                    or anterior.get('cuaderno_mtime_ns') != entrada['cuaderno_mtime_ns']:
+                self.reescaneados += 1
+            self.entradas[nombre] = entrada
+
+        return sorted(list(self.entradas.items()) + excluidos, key=lambda par: par[0])
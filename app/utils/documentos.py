@@ -0,0 +1,182 @@
+"""
+Tipos de documento que se generan para cada expediente.
+Cada tipo indica el formato (el del operador según el mapeo, uno común o uno
+propio de algunos operadores), el conjunto de reemplazos y el patrón del nombre
+del archivo generado. La información del archivo de aceptación se extrae una
+sola vez y con ella se generan todos los tipos que apliquen al operador.
+"""
+
+import os
+import json
+import string
+import hashlib
+
+try:
+    from .operadores import IndiceOperadores
+except ImportError:
+    from operadores import IndiceOperadores
+
+# Nombre del tipo de documento predeterminado (la notificación a acreedores)
+TIPO_NOTIFICACION = "notificacion"
+
+_formateador = string.Formatter()
+
+def _campos_texto(texto):
+    """
+    Obtiene los campos {campo} que usa un texto.
+
+    Args:
+        texto (str): Texto con campos entre llaves
+
+    Returns:
+        tuple: Nombres de los campos
+    """
+    return tuple(campo for _, campo, _, _ in _formateador.parse(texto) if campo)
+
+class TipoDocumento:
+    """
+    Documento que se genera a partir de la información de la aceptación.
+    """
+
+    def __init__(self, nombre, salida, reemplazos, formato=None, operadores=None,
+                 solo_operadores=False, ruta_formatos=''):
+        """
+        Args:
+            nombre (str): Nombre del tipo (p. ej. 'notificacion' o 'citacion')
+            salida (str): Patrón del nombre del archivo generado, con campos de la
+                         información extraída (p. ej. 'Citación_{nombre_deudor}.docx')
+            reemplazos (list): Diccionarios con 'original' y 'nuevo'; 'nuevo' puede
+                              usar campos entre llaves. Un reemplazo cuyo campo no se
+                              extrajo se omite.
+            formato (str): Formato común a todos los operadores. Si es None se usa
+                          el formato del operador según el mapeo.
+            operadores (dict): Formato propio de algunos operadores (nombre -> ruta)
+            solo_operadores (bool): Si es True el tipo solo se genera para los
+                                   operadores de 'operadores'
+            ruta_formatos (str): Carpeta desde la que se interpretan las rutas relativas
+        """
+        self.nombre = nombre
+        self.salida = salida
+        self.campos_salida = _campos_texto(salida)
+        self.reemplazos = [(r['original'], r['nuevo'], _campos_texto(r['nuevo'])) for r in reemplazos]
+        self.formato = self._ruta(formato, ruta_formatos) if formato else None
+        self.operadores = {nombre_operador: self._ruta(ruta, ruta_formatos)
+                           for nombre_operador, ruta in (operadores or {}).items()}
+        self.solo_operadores = bool(solo_operadores)
+        self._indice = IndiceOperadores(self.operadores) if self.operadores else None
+
+    @staticmethod
+    def _ruta(ruta, ruta_formatos):
+        if ruta_formatos and not os.path.isabs(ruta):
+            return os.path.join(ruta_formatos, ruta)
+        return ruta
+
+    def formato_para(self, operador, formato_operador):
+        """
+        Obtiene el formato de este tipo para un operador.
+
+        Args:
+            operador (str): Nombre del operador extraído
+            formato_operador (str): Formato del operador según el mapeo
+
+        Returns:
+            str: Ruta al formato, o None si el tipo no aplica al operador
+        """
+        if self._indice is not None:
+            propio = self._indice.resolver(operador)
+            if propio:
+                return propio
+        if self.solo_operadores:
+            return None
+        return self.formato or formato_operador
+
+    def reemplazos_para(self, info):
+        """
+        Construye los reemplazos con la información de un deudor.
+
+        Args:
+            info (dict): Información extraída del archivo de aceptación
+
+        Returns:
+            list: Diccionarios con 'original' y 'nuevo'
+        """
+        return [{"original": original, "nuevo": nuevo.format_map(info)}
+                for original, nuevo, campos in self.reemplazos
+                if all(info.get(campo) is not None for campo in campos)]
+
+    def ruta_salida(self, info, carpeta_destino):
+        """
+        Calcula la ruta del documento generado para un deudor.
+
+        Args:
+            info (dict): Información extraída del archivo de aceptación
+            carpeta_destino (str): Carpeta de notificaciones del expediente
+
+        Returns:
+            str: Ruta completa del archivo
+        """
+        valores = {campo: info.get(campo, '') for campo in self.campos_salida}
+        return os.path.join(carpeta_destino, self.salida.format_map(valores))
+
+def cargar_tipos_documento(tipos, conjuntos_reemplazos, ruta_formatos=''):
+    """
+    Construye los tipos de documento a partir de su configuración.
+
+    Args:
+        tipos (dict): Nombre del tipo -> {'salida', 'reemplazos' (nombre de un
+                     conjunto o lista) y, opcionales, 'formato', 'operadores' y
+                     'solo_operadores'}
+        conjuntos_reemplazos (dict): Nombre del conjunto -> lista de reemplazos
+        ruta_formatos (str): Carpeta de los formatos
+
+    Returns:
+        list: TipoDocumento en el orden de la configuración. El primero es el
+              documento principal del expediente.
+
+    Raises:
+        ValueError: Si un tipo no indica la salida o usa un conjunto inexistente
+    """
+    resultado = []
+    for nombre, definicion in tipos.items():
+        if not definicion.get('salida'):
+            raise ValueError(f"El tipo de documento '{nombre}' no indica el nombre de salida")
+        reemplazos = definicion.get('reemplazos') or []
+        if isinstance(reemplazos, str):
+            if reemplazos not in conjuntos_reemplazos:
+                raise ValueError(f"Conjunto de reemplazos desconocido en '{nombre}': {reemplazos}")
+            reemplazos = conjuntos_reemplazos[reemplazos]
+        resultado.append(TipoDocumento(nombre, definicion['salida'], reemplazos,
+                                       definicion.get('formato'), definicion.get('operadores'),
+                                       definicion.get('solo_operadores', False), ruta_formatos))
+    return resultado
+
+def leer_archivo_documentos(ruta_archivo):
+    """
+    Lee un archivo JSON de tipos de documento con las claves 'documentos'
+    (tipos, como DOCUMENT_CONFIG["DOCUMENT_TYPES"]) y 'reemplazos' (conjuntos
+    adicionales, como DOCUMENT_CONFIG["REPLACEMENT_SETS"]).
+
+    Args:
+        ruta_archivo (str): Ruta al archivo JSON
+
+    Returns:
+        tuple: (tipos, conjuntos de reemplazos)
+    """
+    with open(ruta_archivo, 'r', encoding='utf-8') as f:
+        datos = json.load(f)
+    return datos.get('documentos') or {}, datos.get('reemplazos') or {}
+
+def firma_tipos(tipos, conjuntos_reemplazos):
+    """
+    Calcula una firma de la configuración de los tipos de documento, para
+    detectar en el manifiesto los expedientes generados con otra configuración.
+
+    Args:
+        tipos (dict): Configuración de los tipos
+        conjuntos_reemplazos (dict): Conjuntos de reemplazos
+
+    Returns:
+        str: Firma hexadecimal
+    """
+    texto = json.dumps([tipos, conjuntos_reemplazos], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:16]
@@ -3,16 +3,146 @@ Utilidades para manipular documentos de Word (.docx).
 Facilita operaciones comunes como reemplazo de texto y guardado de documentos.
 """
 
+import io
 import os
+import re
+import struct
+import zlib
 import logging
+import zipfile
+import xml.etree.ElementTree as ET
 from docx import Document
 
+try:
+    from .acceso_archivos import acceso_predeterminado
+except ImportError:
+    from acceso_archivos import acceso_predeterminado
+
 # Configurar logger para este módulo
 logger = logging.getLogger(__name__)
 
+# Espacio de nombres principal de WordprocessingML
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W + 'p'
+_W_T = _W + 't'
+_W_TBL = _W + 'tbl'
+_W_TXBX = _W + 'txbxContent'
+_W_TAB = _W + 'tab'
+_W_SALTOS = (_W + 'br', _W + 'cr')
+_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Límite de tamaño y posición de un ZIP sin extensiones ZIP64
+_ZIP_LIMITE = 0xFFFFFFFF
+
+def compile_replacements(reemplazos):
+    """
+    Combina una lista de reemplazos en un único patrón compilado.
+    
+    Args:
+        reemplazos (list): Lista de diccionarios con claves 'original' y 'nuevo'
+    
+    Returns:
+        tuple: (patrón compilado o None, diccionario original -> nuevo)
+    """
+    tabla = {}
+    for reemplazo in reemplazos or []:
+        original = reemplazo.get('original')
+        nuevo = reemplazo.get('nuevo')
+        if original and nuevo and original not in tabla:
+            tabla[original] = nuevo
+    
+    if not tabla:
+        return None, tabla
+    
+    # Los textos más largos primero para que prevalezca la coincidencia más completa
+    originales = sorted(tabla, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(original) for original in originales)), tabla
+
+def _replace_in_paragraph(parrafo, patron, tabla, conteo):
+    """
+    Reemplaza en un párrafo (elemento w:p) sobre el texto concatenado de sus runs.
+    El texto nuevo queda en el run donde empieza la coincidencia, conservando su
+    formato; los fragmentos de la coincidencia en otros runs se eliminan.
+    
+    Args:
+        parrafo (lxml.etree._Element): Elemento w:p
+        patron (re.Pattern): Patrón combinado de los textos originales
+        tabla (dict): Texto original -> texto nuevo
+        conteo (dict): Contador de reemplazos por texto original (se actualiza)
+    """
+    # Solo los w:t de este párrafo (no los de cuadros de texto anidados)
+    segmentos = [t for t in parrafo.iter(_W_T) if next(t.iterancestors(_W_P), None) is parrafo]
+    if not segmentos:
+        return
+    
+    textos = [t.text or '' for t in segmentos]
+    coincidencias = list(patron.finditer(''.join(textos)))
+    if not coincidencias:
+        return
+    
+    # Posición inicial de cada segmento dentro del texto concatenado
+    inicios = []
+    posicion = 0
+    for texto in textos:
+        inicios.append(posicion)
+        posicion += len(texto)
+    
+    # Aplicar de atrás hacia adelante para no desplazar las posiciones pendientes
+    indice = len(segmentos) - 1
+    for coincidencia in reversed(coincidencias):
+        inicio, fin = coincidencia.span()
+        while indice > 0 and inicios[indice] > fin - 1:
+            indice -= 1
+        ultimo = indice
+        primero = ultimo
+        while primero > 0 and inicios[primero] > inicio:
+            primero -= 1
+        
+        original = coincidencia.group(0)
+        conteo[original] = conteo.get(original, 0) + 1
+        
+        if primero == ultimo:
+            desde = inicio - inicios[primero]
+            textos[primero] = textos[primero][:desde] + tabla[original] + textos[primero][desde + len(original):]
+        else:
+            textos[ultimo] = textos[ultimo][fin - inicios[ultimo]:]
+            for medio in range(primero + 1, ultimo):
+                textos[medio] = ''
+            textos[primero] = textos[primero][:inicio - inicios[primero]] + tabla[original]
+        
+        for modificado in range(primero, ultimo + 1):
+            segmentos[modificado].text = textos[modificado]
+            segmentos[modificado].set(_XML_SPACE, 'preserve')
+        indice = primero
+
+def replace_text_in_element(elemento, reemplazos):
+    """
+    Reemplaza texto en todos los párrafos de un árbol XML de WordprocessingML
+    (cuerpo, encabezado o pie de página), incluidos los de tablas, en un solo
+    recorrido y sin perder el formato de los runs.
+    
+    Args:
+        elemento (lxml.etree._Element): Raíz del árbol a procesar
+        reemplazos (list or tuple): Lista de diccionarios con claves 'original' y 'nuevo',
+                                   o el resultado de compile_replacements
+    
+    Returns:
+        dict: Número de reemplazos realizados por texto original
+    """
+    patron, tabla = reemplazos if isinstance(reemplazos, tuple) else compile_replacements(reemplazos)
+    conteo = {original: 0 for original in tabla}
+    if patron is None or elemento is None:
+        return conteo
+    
+    for parrafo in elemento.iter(_W_P):
+        _replace_in_paragraph(parrafo, patron, tabla, conteo)
+    return conteo
+
 def replace_text_in_doc(doc, reemplazos):
     """
     Reemplaza texto en un documento Word según una lista de reemplazos.
+    Los reemplazos se aplican en una sola pasada por párrafo, también cuando el
+    texto original está repartido en varios runs, y conservan el formato.
     
     Args:
         doc (Document): Documento de Word abierto
@@ -23,40 +153,20 @@ def replace_text_in_doc(doc, reemplazos):
     """
     if not doc or not reemplazos:
         return False
-        
-    reemplazos_realizados = 0
     
-    # Procesar párrafos
-    for i, paragraph in enumerate(doc.paragraphs):
-        for reemplazo in reemplazos:
-            original = reemplazo.get('original')
-            nuevo = reemplazo.get('nuevo')
-            
-            if original and nuevo and original in paragraph.text:
-                # Reemplazar en el texto del párrafo
-                paragraph.text = paragraph.text.replace(original, nuevo)
-                reemplazos_realizados += 1
-                logger.debug(f"Reemplazo realizado en párrafo {i}: {original} -> {nuevo}")
-    
-    # Procesar tablas
-    for i, table in enumerate(doc.tables):
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    for reemplazo in reemplazos:
-                        original = reemplazo.get('original')
-                        nuevo = reemplazo.get('nuevo')
-                        
-                        if original and nuevo and original in paragraph.text:
-                            # Reemplazar en el texto del párrafo
-                            paragraph.text = paragraph.text.replace(original, nuevo)
-                            reemplazos_realizados += 1
-                            logger.debug(f"Reemplazo realizado en tabla {i}: {original} -> {nuevo}")
-    
-    logger.info(f"Total de reemplazos realizados: {reemplazos_realizados}")
+    # Los documentos creados desde la caché de plantillas reemplazan también en
+    # sus propias copias de encabezados y pies de página
+    if hasattr(doc, 'replace_text'):
+        conteo = doc.replace_text(reemplazos)
+    else:
+        conteo = replace_text_in_element(doc.element, reemplazos)
+    reemplazos_realizados = sum(conteo.values())
+    
+    logger.debug("Reemplazos por texto: %s", conteo)
+    logger.info("Total de reemplazos realizados: %d", reemplazos_realizados)
     return reemplazos_realizados > 0
 
-def save_document(doc, ruta_destino):
+def save_document(doc, ruta_destino, acceso=None):
     """
     Guarda un documento Word en la ruta especificada.
     Crea directorios intermedios si no existen.
@@ -64,6 +174,8 @@ def save_document(doc, ruta_destino):
     Args:
         doc (Document): Documento de Word a guardar
         ruta_destino (str): Ruta completa donde guardar el documento
+        acceso (AccesoArchivos): Acceso a archivos con plazo y reintentos
+                                 (por defecto, el predeterminado)
     
     Returns:
         bool: True si se guardó correctamente, False en caso contrario
@@ -72,27 +184,111 @@ def save_document(doc, ruta_destino):
         Exception: Si ocurre algún error al guardar el documento
     """
     try:
-        # Crear directorio si no existe
-        directorio = os.path.dirname(ruta_destino)
-        if directorio and not os.path.exists(directorio):
-            os.makedirs(directorio, exist_ok=True)
-            logger.info(f"Creado directorio: {directorio}")
-        
-        # Guardar documento
-        doc.save(ruta_destino)
-        logger.info(f"Documento guardado en: {ruta_destino}")
+        # El documento se serializa en memoria y se escribe con plazo
+        flujo = io.BytesIO()
+        doc.save(flujo)
+        (acceso or acceso_predeterminado()).escribir(ruta_destino, flujo.getvalue())
+        logger.info("Documento guardado en: %s", ruta_destino)
         return True
         
     except Exception as e:
-        logger.error(f"Error al guardar documento en {ruta_destino}: {str(e)}")
+        logger.error("Error al guardar documento en %s: %s", ruta_destino, e)
         raise
         
-def extract_text_from_doc(ruta_archivo):
+def write_docx_parts(plantilla, partes, destino, acceso=None):
+    """
+    Escribe un .docx a partir del ZIP de una plantilla reemplazando solo algunas partes.
+    Los miembros no modificados (estilos, imágenes, relaciones...) se copian con sus
+    bytes ya comprimidos, sin descomprimirlos ni volver a comprimirlos.
+    
+    Args:
+        plantilla (bytes): Contenido completo del .docx de la plantilla
+        partes (dict): Nombre del miembro (p. ej. 'word/document.xml') -> contenido nuevo
+        destino (str or file): Ruta o flujo binario donde escribir el documento
+        acceso (AccesoArchivos): Acceso usado cuando destino es una ruta (opcional)
+    
+    Raises:
+        zipfile.BadZipFile: Si la plantilla no es un ZIP válido o requiere ZIP64
+    """
+    origen = memoryview(plantilla)
+    with zipfile.ZipFile(io.BytesIO(plantilla)) as zip_plantilla:
+        miembros = zip_plantilla.infolist()
+    
+    salida = io.BytesIO()
+    directorio = []
+    for info in miembros:
+        nombre, flags = _zip_member_name(info.filename)
+        if info.filename in partes:
+            datos = partes[info.filename]
+            compresor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            comprimido = compresor.compress(datos) + compresor.flush()
+            metodo, crc, tamano = zipfile.ZIP_DEFLATED, zlib.crc32(datos), len(datos)
+        else:
+            if info.compress_size >= _ZIP_LIMITE or info.header_offset >= _ZIP_LIMITE:
+                raise zipfile.BadZipFile("Plantillas ZIP64 no soportadas")
+            # Saltar el encabezado local original para copiar los datos comprimidos
+            largo_nombre, largo_extra = struct.unpack_from('<2H', origen, info.header_offset + 26)
+            inicio = info.header_offset + 30 + largo_nombre + largo_extra
+            comprimido = origen[inicio:inicio + info.compress_size]
+            metodo, crc, tamano = info.compress_type, info.CRC, info.file_size
+        
+        hora, fecha = _zip_dos_datetime(info.date_time)
+        desplazamiento = salida.tell()
+        salida.write(struct.pack('<4s5H3L2H', b'PK\x03\x04', 20, flags, metodo, hora, fecha,
+                                 crc, len(comprimido), tamano, len(nombre), 0))
+        salida.write(nombre)
+        salida.write(comprimido)
+        directorio.append(struct.pack('<4s4B4HL2L5H2L', b'PK\x01\x02', 20, info.create_system, 20, 0,
+                                      flags, metodo, hora, fecha, crc, len(comprimido), tamano,
+                                      len(nombre), 0, 0, 0, info.internal_attr, info.external_attr,
+                                      desplazamiento) + nombre)
+    
+    inicio_directorio = salida.tell()
+    for entrada in directorio:
+        salida.write(entrada)
+    salida.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(directorio), len(directorio),
+                             salida.tell() - inicio_directorio, inicio_directorio, 0))
+    
+    if hasattr(destino, 'write'):
+        destino.write(salida.getbuffer())
+    else:
+        (acceso or acceso_predeterminado()).escribir(destino, salida.getvalue())
+
+def _zip_member_name(nombre):
+    """
+    Codifica el nombre de un miembro ZIP y calcula sus flags.
+    
+    Args:
+        nombre (str): Nombre del miembro
+    
+    Returns:
+        tuple: (nombre codificado, flags del encabezado)
+    """
+    try:
+        return nombre.encode('ascii'), 0
+    except UnicodeEncodeError:
+        return nombre.encode('utf-8'), 0x800
+
+def _zip_dos_datetime(fecha_hora):
+    """
+    Convierte la fecha de un miembro ZIP al formato MS-DOS.
+    
+    Args:
+        fecha_hora (tuple): (año, mes, día, hora, minuto, segundo)
+    
+    Returns:
+        tuple: (hora DOS, fecha DOS)
+    """
+    anio, mes, dia, hora, minuto, segundo = fecha_hora
+    return (hora << 11) | (minuto << 5) | (segundo // 2), (max(anio, 1980) - 1980) << 9 | (mes << 5) | dia
+
+def extract_text_from_doc(ruta_archivo, acceso=None):
     """
     Extrae todo el texto de un documento Word.
     
     Args:
         ruta_archivo (str): Ruta al archivo .docx
+        acceso (AccesoArchivos): Acceso a archivos con plazo y reintentos (opcional)
     
     Returns:
         str: Texto completo del documento
@@ -106,7 +302,7 @@ def extract_text_from_doc(ruta_archivo):
         raise FileNotFoundError(f"Archivo no encontrado: {ruta_archivo}")
         
     try:
-        doc = Document(ruta_archivo)
+        doc = Document(io.BytesIO((acceso or acceso_predeterminado()).leer(ruta_archivo)))
         texto_completo = "\n".join([p.text for p in doc.paragraphs])
         
         # También extraer texto de tablas
@@ -120,4 +316,80 @@ def extract_text_from_doc(ruta_archivo):
         
     except Exception as e:
         logger.error(f"Error al extraer texto de {ruta_archivo}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def iter_paragraph_texts(ruta_archivo):
+    """
+    Genera de forma incremental el texto de los párrafos del cuerpo de un .docx.
+    Lee directamente 'word/document.xml' del archivo ZIP con un parser incremental,
+    sin cargar estilos, imágenes ni relaciones. Igual que Document.paragraphs,
+    omite los párrafos dentro de tablas y cuadros de texto.
+    
+    Args:
+        ruta_archivo (str or file): Ruta o flujo binario del archivo .docx
+    
+    Yields:
+        str: Texto de cada párrafo, en orden
+        
+    Raises:
+        zipfile.BadZipFile: Si el archivo no es un .docx válido
+        KeyError: Si el paquete no contiene 'word/document.xml'
+        xml.etree.ElementTree.ParseError: Si el XML del documento está dañado
+    """
+    with zipfile.ZipFile(ruta_archivo) as paquete:
+        with paquete.open('word/document.xml') as xml_documento:
+            parrafos = []
+            contenedores = 0
+            
+            for evento, elemento in ET.iterparse(xml_documento, events=('start', 'end')):
+                etiqueta = elemento.tag
+                if evento == 'start':
+                    if etiqueta == _W_P:
+                        parrafos.append([])
+                    elif etiqueta == _W_TBL or etiqueta == _W_TXBX:
+                        contenedores += 1
+                    continue
+                
+                if etiqueta == _W_T:
+                    if parrafos and elemento.text:
+                        parrafos[-1].append(elemento.text)
+                elif etiqueta == _W_TAB:
+                    if parrafos:
+                        parrafos[-1].append('\t')
+                elif etiqueta in _W_SALTOS:
+                    if parrafos:
+                        parrafos[-1].append('\n')
+                elif etiqueta == _W_P:
+                    partes = parrafos.pop()
+                    if not parrafos and not contenedores:
+                        yield ''.join(partes)
+                    elemento.clear()
+                elif etiqueta == _W_TBL or etiqueta == _W_TXBX:
+                    contenedores -= 1
+                    elemento.clear()
+
+def extract_paragraph_texts(ruta_archivo, acceso=None):
+    """
+    Obtiene el texto de los párrafos del cuerpo de un .docx.
+    Usa el lector incremental de XML y, si el archivo no puede leerse de esa
+    forma, recurre a python-docx.
+    
+    Args:
+        ruta_archivo (str or file): Ruta o flujo binario del archivo .docx
+        acceso (AccesoArchivos): Acceso usado para leer una ruta (opcional)
+    
+    Returns:
+        list: Texto de cada párrafo del documento
+    """
+    if not hasattr(ruta_archivo, 'read'):
+        flujo = io.BytesIO((acceso or acceso_predeterminado()).leer(ruta_archivo))
+        flujo.name = ruta_archivo
+        ruta_archivo = flujo
+    try:
+        return list(iter_paragraph_texts(ruta_archivo))
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        logger.warning("Lectura directa de %s fallida (%s), se usará python-docx",
+                       os.path.basename(str(getattr(ruta_archivo, 'name', ruta_archivo))), e)
+        if hasattr(ruta_archivo, 'seek'):
+            ruta_archivo.seek(0)
+        return [p.text for p in Document(ruta_archivo).paragraphs]
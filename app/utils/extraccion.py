@@ -0,0 +1,246 @@
+"""
+Motor de extracción de campos del archivo de aceptación de solicitud.
+Compila una sola vez los patrones configurados en DOCUMENT_CONFIG y los aplica
+sobre ventanas acotadas del texto: un único recorrido localiza todas las anclas
+literales y cada patrón se evalúa solo cerca de su ancla, de modo que agregar un
+campo no agrega otro recorrido completo del documento.
+"""
+
+import re
+import json
+import time
+import hashlib
+import logging
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Versión del algoritmo de extracción: debe incrementarse cuando un cambio en
+# este módulo pueda producir valores distintos para el mismo documento
+VERSION_EXTRACTOR = 1
+
+class ReglaExtraccion:
+    """
+    Patrón compilado junto con la ventana de texto donde debe buscarse.
+    """
+
+    def __init__(self, patron, ancla=None, antes=0, despues=0, posicion=None, longitud=0, ultima=False):
+        """
+        Args:
+            patron (re.Pattern): Patrón compilado
+            ancla (str): Texto literal alrededor del cual se busca (opcional)
+            antes (int): Caracteres antes del ancla incluidos en la ventana
+            despues (int): Caracteres después del final del ancla incluidos en la ventana
+            posicion (str): 'inicio' o 'final' del documento cuando no hay ancla
+            longitud (int): Longitud de la ventana posicional
+            ultima (bool): Tomar la última coincidencia de la ventana
+        """
+        self.patron = patron
+        self.ancla = ancla
+        self.antes = antes
+        self.despues = despues
+        self.posicion = posicion
+        self.longitud = longitud
+        self.ultima = ultima
+
+    def ventanas(self, texto, anclas):
+        """
+        Genera las ventanas (inicio, fin) del texto donde se evalúa la regla.
+
+        Args:
+            texto (str): Texto completo del documento
+            anclas (dict): Posiciones de cada ancla encontrada en el texto
+
+        Yields:
+            tuple: (inicio, fin) de cada ventana, en orden de prioridad
+        """
+        if self.ancla:
+            for posicion in anclas.get(self.ancla, ()):
+                yield (max(0, posicion - self.antes),
+                       min(len(texto), posicion + len(self.ancla) + self.despues))
+        elif self.posicion == 'final':
+            yield (max(0, len(texto) - self.longitud), len(texto))
+        else:
+            yield (0, min(len(texto), self.longitud))
+
+    def buscar(self, texto, anclas):
+        """
+        Busca la regla en sus ventanas.
+
+        Args:
+            texto (str): Texto completo del documento
+            anclas (dict): Posiciones de cada ancla encontrada en el texto
+
+        Returns:
+            str: Valor extraído (primer grupo si el patrón tiene grupos), o None
+        """
+        for inicio, fin in self.ventanas(texto, anclas):
+            if self.ultima:
+                coincidencia = None
+                for coincidencia in self.patron.finditer(texto, inicio, fin):
+                    pass
+            else:
+                coincidencia = self.patron.search(texto, inicio, fin)
+
+            if coincidencia:
+                valor = coincidencia.group(1) if self.patron.groups else coincidencia.group(0)
+                if valor and valor.strip():
+                    return valor.strip()
+        return None
+
+class ResultadoExtraccion:
+    """
+    Resultado de aplicar el motor de extracción sobre un documento.
+
+    Attributes:
+        valores (dict): Valor extraído por campo (solo los encontrados)
+        faltantes (list): Campos requeridos que no se encontraron
+        tiempos_ms (dict): Tiempo de extracción por campo en milisegundos
+    """
+
+    def __init__(self):
+        self.valores = {}
+        self.faltantes = []
+        self.tiempos_ms = {}
+
+    @property
+    def completo(self):
+        """bool: True si se encontraron todos los campos requeridos."""
+        return not self.faltantes
+
+    def establecer(self, campo, valor):
+        """
+        Asigna el valor de un campo obtenido por otro medio (p. ej. el índice de operadores).
+
+        Args:
+            campo (str): Nombre del campo
+            valor (str): Valor del campo
+        """
+        self.valores[campo] = valor
+        if campo in self.faltantes:
+            self.faltantes.remove(campo)
+
+class MotorExtraccion:
+    """
+    Conjunto de campos con sus reglas compiladas y el localizador de anclas.
+    """
+
+    def __init__(self, campos, firma=None):
+        """
+        Args:
+            campos (dict): nombre del campo -> (requerido, lista de ReglaExtraccion)
+            firma (str): Identificador de la configuración de los campos y patrones
+                        (ver desde_configuracion)
+        """
+        self.campos = campos
+        self.firma = firma
+        anclas = sorted({regla.ancla for _, reglas in campos.values() for regla in reglas if regla.ancla},
+                        key=len, reverse=True)
+        self._localizador = re.compile('|'.join(re.escape(ancla) for ancla in anclas)) if anclas else None
+
+    @classmethod
+    def desde_configuracion(cls, campos_config, patrones, sobrescrituras=None):
+        """
+        Construye el motor a partir de la configuración de DOCUMENT_CONFIG.
+
+        Args:
+            campos_config (dict): DOCUMENT_CONFIG["EXTRACTION_FIELDS"]
+            patrones (dict): DOCUMENT_CONFIG["PATTERNS"]
+            sobrescrituras (dict): Patrones que reemplazan a los de settings,
+                                  con claves en cualquier capitalización (opcional)
+
+        Returns:
+            MotorExtraccion: Motor con todos los patrones compilados. Su firma
+                            cambia si cambian los campos, los patrones o
+                            VERSION_EXTRACTOR.
+        """
+        patrones = dict(patrones)
+        for clave, patron in (sobrescrituras or {}).items():
+            patrones[clave.upper()] = patron
+
+        configuracion = json.dumps([VERSION_EXTRACTOR, campos_config, patrones], sort_keys=True, ensure_ascii=False)
+        firma = hashlib.sha256(configuracion.encode('utf-8')).hexdigest()[:16]
+
+        compilados = {}
+        campos = {}
+        for nombre, definicion in campos_config.items():
+            reglas = []
+            for regla in definicion['reglas']:
+                clave = regla['patron']
+                if clave not in compilados:
+                    compilados[clave] = re.compile(patrones[clave])
+                reglas.append(ReglaExtraccion(
+                    compilados[clave],
+                    ancla=regla.get('ancla'),
+                    antes=regla.get('antes', 0),
+                    despues=regla.get('despues', 0),
+                    posicion=regla.get('posicion'),
+                    longitud=regla.get('longitud', 0),
+                    ultima=regla.get('ultima', False)
+                ))
+            campos[nombre] = (definicion.get('requerido', False), reglas)
+
+        return cls(campos, firma)
+
+    def ventana_final(self, campo):
+        """
+        Obtiene la longitud de la ventana del final del documento donde se busca
+        un campo (p. ej. la firma del operador).
+
+        Args:
+            campo (str): Nombre del campo
+
+        Returns:
+            int: Longitud de la ventana, o 0 si el campo no tiene reglas al final
+        """
+        _, reglas = self.campos.get(campo, (False, []))
+        return max((regla.longitud for regla in reglas if not regla.ancla and regla.posicion == 'final'),
+                   default=0)
+
+    def localizar_anclas(self, texto):
+        """
+        Recorre el texto una vez y registra las posiciones de todas las anclas.
+
+        Args:
+            texto (str): Texto completo del documento
+
+        Returns:
+            dict: ancla -> lista de posiciones en orden de aparición
+        """
+        anclas = {}
+        if self._localizador:
+            for coincidencia in self._localizador.finditer(texto):
+                anclas.setdefault(coincidencia.group(0), []).append(coincidencia.start())
+        return anclas
+
+    def extraer(self, texto):
+        """
+        Extrae todos los campos configurados del texto.
+
+        Args:
+            texto (str): Texto completo del documento
+
+        Returns:
+            ResultadoExtraccion: Valores, campos faltantes y tiempos por campo
+        """
+        resultado = ResultadoExtraccion()
+
+        inicio = time.perf_counter()
+        anclas = self.localizar_anclas(texto)
+        resultado.tiempos_ms['_anclas'] = (time.perf_counter() - inicio) * 1000
+
+        for nombre, (requerido, reglas) in self.campos.items():
+            inicio = time.perf_counter()
+            valor = None
+            for regla in reglas:
+                valor = regla.buscar(texto, anclas)
+                if valor:
+                    break
+            resultado.tiempos_ms[nombre] = (time.perf_counter() - inicio) * 1000
+
+            if valor:
+                resultado.valores[nombre] = valor
+            elif requerido:
+                resultado.faltantes.append(nombre)
+
+        return resultado
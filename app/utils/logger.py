@@ -1,14 +1,37 @@
 """
 Utilidades para configurar y gestionar el sistema de logging de la aplicación.
 Proporciona funciones para crear y obtener loggers con configuraciones específicas.
+
+En modo asíncrono el logger solo encola los registros (QueueHandler) y un único
+hilo (QueueListener) los escribe en la consola y en el archivo. La cola es de
+multiprocessing, así que los procesos del pool pueden enviar sus registros al
+mismo listener (ver configurar_logger_worker) en lugar de escribir cada uno en
+el archivo de log.
 """
 
 import os
-import logging
 import sys
+import atexit
+import logging
+import threading
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
-def setup_logger(nombre="app", nivel="INFO", ruta_log=None, console=True, formato=None):
+# Tamaño máximo de cada archivo de log antes de rotarlo y copias que se conservan
+MAX_MB_LOG = 10
+COPIAS_LOG = 5
+
+# Loggers padre de los módulos de la aplicación (logging.getLogger(__name__)).
+# Ejecutada como script, los módulos se importan sin el prefijo 'app'
+LOGGERS_MODULOS = ("app", "utils")
+
+# Listeners de los loggers asíncronos: nombre -> (cola, listener)
+_escuchas = {}
+_bloqueo_escuchas = threading.Lock()
+
+def setup_logger(nombre="app", nivel="INFO", ruta_log=None, console=True, formato=None,
+                 asincrono=False, max_mb=MAX_MB_LOG, copias=COPIAS_LOG, modulos=()):
     """
     Configura y devuelve un logger con la configuración especificada.
     
@@ -18,6 +41,12 @@ def setup_logger(nombre="app", nivel="INFO", ruta_log=None, console=True, format
         ruta_log (str): Ruta donde guardar los archivos de log (opcional)
         console (bool): Indica si se debe mostrar el log en consola
         formato (str): Formato personalizado para los mensajes de log
+        asincrono (bool): Si es True la escritura se hace en un hilo aparte
+                         a través de una cola (ver obtener_cola_log)
+        max_mb (float): Tamaño máximo del archivo de log antes de rotarlo (0 = sin límite)
+        copias (int): Número de archivos rotados que se conservan
+        modulos (tuple): Otros loggers (p. ej. LOGGERS_MODULOS) que escriben en
+                        los mismos destinos, si aún no tienen handlers
         
     Returns:
         logging.Logger: Logger configurado
@@ -37,12 +66,13 @@ def setup_logger(nombre="app", nivel="INFO", ruta_log=None, console=True, format
     if not formato:
         formato = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     formatter = logging.Formatter(formato)
+    handlers = []
     
     # Handler para consola
     if console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # Handler para archivo si se especificó ruta
     if ruta_log:
@@ -53,14 +83,99 @@ def setup_logger(nombre="app", nivel="INFO", ruta_log=None, console=True, format
         fecha = datetime.now().strftime("%Y%m%d")
         archivo_log = os.path.join(ruta_log, f"{nombre}_{fecha}.log")
         
-        # Configurar file handler
-        file_handler = logging.FileHandler(archivo_log, encoding='utf-8')
+        # Configurar file handler con rotación por tamaño
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb else 0
+        file_handler = RotatingFileHandler(archivo_log, maxBytes=max_bytes,
+                                           backupCount=copias, encoding='utf-8')
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if asincrono and handlers:
+        cola = multiprocessing.Queue(-1)
+        listener = QueueListener(cola, *handlers, respect_handler_level=True)
+        listener.start()
+        with _bloqueo_escuchas:
+            _escuchas[nombre] = (cola, listener)
+        handlers = [QueueHandler(cola)]
+        
+        # Registrar la detención después de multiprocessing (que cierra sus colas
+        # al salir) para que se ejecute antes y no se pierdan registros
+        atexit.unregister(detener_loggers)
+        atexit.register(detener_loggers)
+    for handler in handlers:
+        logger.addHandler(handler)
+    
+    # Los módulos de la aplicación no deben terminar en stderr sin formato
+    for nombre_modulo in modulos:
+        logger_modulo = logging.getLogger(nombre_modulo)
+        if not logger_modulo.handlers:
+            logger_modulo.setLevel(nivel_numerico)
+            for handler in handlers:
+                logger_modulo.addHandler(handler)
     
-    logger.info(f"Logger '{nombre}' configurado con nivel {nivel}")
+    logger.info("Logger '%s' configurado con nivel %s", nombre, nivel)
     return logger
 
+def obtener_cola_log(nombre):
+    """
+    Obtiene la cola de un logger asíncrono para compartirla con otros procesos.
+    
+    Args:
+        nombre (str): Nombre del logger
+        
+    Returns:
+        multiprocessing.Queue: Cola del logger, o None si el logger no es asíncrono
+    """
+    with _bloqueo_escuchas:
+        escucha = _escuchas.get(nombre)
+    return escucha[0] if escucha else None
+
+def configurar_logger_worker(nombre, cola, nivel="INFO", modulos=()):
+    """
+    Configura un logger de un proceso del pool para que envíe sus registros a
+    la cola del proceso principal en lugar de escribirlos directamente.
+    
+    Args:
+        nombre (str): Nombre del logger
+        cola (multiprocessing.Queue): Cola obtenida con obtener_cola_log
+        nivel (str): Nivel de logging
+        modulos (tuple): Otros loggers (p. ej. LOGGERS_MODULOS) que también
+                        envían sus registros a la cola
+        
+    Returns:
+        logging.Logger: Logger configurado
+    """
+    nivel_numerico = getattr(logging, nivel.upper(), logging.INFO)
+    handler_cola = QueueHandler(cola)
+    for nombre_logger in (nombre,) + tuple(modulos):
+        logger = logging.getLogger(nombre_logger)
+        logger.setLevel(nivel_numerico)
+        
+        # Los handlers heredados del proceso principal (fork) no deben usarse aquí
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(handler_cola)
+    return logging.getLogger(nombre)
+
+def detener_loggers():
+    """
+    Detiene los listeners de los loggers asíncronos, escribiendo antes los
+    registros pendientes. Se ejecuta automáticamente al salir del programa.
+    """
+    with _bloqueo_escuchas:
+        escuchas = list(_escuchas.items())
+        _escuchas.clear()
+    
+    for nombre, (cola, listener) in escuchas:
+        for nombre_logger in (nombre,) + LOGGERS_MODULOS:
+            logger = logging.getLogger(nombre_logger)
+            for handler in list(logger.handlers):
+                if isinstance(handler, QueueHandler) and handler.queue is cola:
+                    logger.removeHandler(handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
 def get_logger(nombre="app"):
     """
     Obtiene un logger existente o crea uno nuevo.
@@ -97,4 +212,11 @@ def set_log_level(logger, nivel):
     for handler in logger.handlers:
         handler.setLevel(nivel_numerico)
     
+    # En los loggers asíncronos los handlers reales pertenecen al listener
+    with _bloqueo_escuchas:
+        escucha = _escuchas.get(logger.name)
+    if escucha:
+        for handler in escucha[1].handlers:
+            handler.setLevel(nivel_numerico)
+    
     logger.info(f"Nivel de log cambiado a {nivel}")
\ No newline at end of file
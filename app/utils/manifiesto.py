@@ -0,0 +1,250 @@
+"""
+Manifiesto persistente del procesamiento de expedientes.
+Registra, por expediente, la huella del archivo de aceptación y de los formatos
+usados para poder omitir los expedientes cuyas entradas no han cambiado desde la última ejecución.
+"""
+
+import os
+import hashlib
+import sqlite3
+import logging
+from datetime import datetime
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Tamaño de bloque para calcular el hash de los archivos
+TAMANO_BLOQUE_HASH = 1024 * 1024
+
+def huella_archivo(ruta_archivo):
+    """
+    Obtiene la huella rápida (tamaño y fecha de modificación) de un archivo.
+
+    Args:
+        ruta_archivo (str): Ruta al archivo
+
+    Returns:
+        str: Huella con formato 'tamaño:mtime_ns', o None si el archivo no existe
+    """
+    try:
+        stat = os.stat(ruta_archivo)
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def hash_archivo(ruta_archivo, acceso=None):
+    """
+    Calcula el hash SHA-256 del contenido de un archivo.
+
+    Args:
+        ruta_archivo (str): Ruta al archivo
+        acceso (AccesoArchivos): Si se indica, el archivo se lee con su plazo y
+                                 reintentos (puede lanzar TiempoAgotado)
+
+    Returns:
+        str: Hash hexadecimal del contenido
+    """
+    if acceso is not None:
+        return hashlib.sha256(acceso.leer(ruta_archivo)).hexdigest()
+    sha = hashlib.sha256()
+    with open(ruta_archivo, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE_HASH), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+class ManifiestoProcesamiento:
+    """
+    Manifiesto de expedientes procesados almacenado en SQLite.
+    Cada proceso debe abrir su propia instancia; SQLite se encarga de
+    serializar las escrituras concurrentes.
+    """
+
+    def __init__(self, ruta_db, acceso=None):
+        """
+        Abre (o crea) el manifiesto.
+
+        Args:
+            ruta_db (str): Ruta al archivo SQLite del manifiesto
+            acceso (AccesoArchivos): Acceso con plazo para leer los archivos de
+                                     aceptación al calcular su hash (opcional)
+        """
+        self.ruta_db = ruta_db
+        self.acceso = acceso
+        directorio = os.path.dirname(ruta_db)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._conexion = sqlite3.connect(ruta_db, timeout=30)
+        try:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError as e:
+            logger.debug(f"No se pudo activar WAL en el manifiesto: {str(e)}")
+        self._conexion.execute(
+            """CREATE TABLE IF NOT EXISTS expedientes (
+                ruta_expediente TEXT PRIMARY KEY,
+                archivo_aceptacion TEXT NOT NULL,
+                huella_aceptacion TEXT NOT NULL,
+                hash_aceptacion TEXT NOT NULL,
+                ruta_formato TEXT NOT NULL,
+                huella_formato TEXT NOT NULL,
+                ruta_salida TEXT NOT NULL,
+                fecha TEXT NOT NULL
+            )"""
+        )
+        # Documentos adicionales al principal (ver DOCUMENT_TYPES en settings)
+        self._conexion.execute(
+            """CREATE TABLE IF NOT EXISTS documentos (
+                ruta_expediente TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                ruta_formato TEXT NOT NULL,
+                huella_formato TEXT NOT NULL,
+                ruta_salida TEXT NOT NULL,
+                PRIMARY KEY (ruta_expediente, tipo)
+            )"""
+        )
+        # Manifiestos anteriores a los tipos de documento: firma vacía (configuración predeterminada)
+        columnas = {fila[1] for fila in self._conexion.execute("PRAGMA table_info(expedientes)")}
+        if 'firma_documentos' not in columnas:
+            self._conexion.execute(
+                "ALTER TABLE expedientes ADD COLUMN firma_documentos TEXT NOT NULL DEFAULT ''"
+            )
+        # Manifiestos anteriores sin el operador: se vuelven a procesar una vez
+        if 'operador' not in columnas:
+            self._conexion.execute(
+                "ALTER TABLE expedientes ADD COLUMN operador TEXT NOT NULL DEFAULT ''"
+            )
+        self._conexion.commit()
+
+    def obtener(self, ruta_expediente):
+        """
+        Obtiene el registro de un expediente.
+
+        Args:
+            ruta_expediente (str): Ruta del expediente
+
+        Returns:
+            dict: Registro del expediente o None si no existe
+        """
+        cursor = self._conexion.execute(
+            "SELECT archivo_aceptacion, huella_aceptacion, hash_aceptacion, ruta_formato, "
+            "huella_formato, ruta_salida, fecha, firma_documentos, operador FROM expedientes "
+            "WHERE ruta_expediente = ?",
+            (ruta_expediente,)
+        )
+        fila = cursor.fetchone()
+        if not fila:
+            return None
+
+        claves = ('archivo_aceptacion', 'huella_aceptacion', 'hash_aceptacion', 'ruta_formato',
+                  'huella_formato', 'ruta_salida', 'fecha', 'firma_documentos', 'operador')
+        registro = dict(zip(claves, fila))
+        registro['documentos'] = [
+            dict(zip(('tipo', 'ruta_formato', 'huella_formato', 'ruta_salida'), documento))
+            for documento in self._conexion.execute(
+                "SELECT tipo, ruta_formato, huella_formato, ruta_salida FROM documentos "
+                "WHERE ruta_expediente = ? ORDER BY tipo",
+                (ruta_expediente,)
+            )
+        ]
+        return registro
+
+    def registrar(self, ruta_expediente, archivo_aceptacion, ruta_formato, ruta_salida, hash_aceptacion=None,
+                  documentos=None, firma_documentos='', operador=''):
+        """
+        Registra (o actualiza) un expediente procesado correctamente.
+
+        Args:
+            ruta_expediente (str): Ruta del expediente
+            archivo_aceptacion (str): Ruta al archivo de aceptación usado
+            ruta_formato (str): Ruta al formato del documento principal
+            ruta_salida (str): Ruta del documento principal generado
+            hash_aceptacion (str): Hash del archivo de aceptación (se calcula si es None)
+            documentos (list): Documentos adicionales generados, como tuplas
+                              (tipo, ruta_formato, ruta_salida)
+            firma_documentos (str): Firma de la configuración de tipos de documento
+            operador (str): Operador extraído, para comprobar después su formato
+        """
+        if hash_aceptacion is None:
+            hash_aceptacion = hash_archivo(archivo_aceptacion, self.acceso)
+
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO expedientes (ruta_expediente, archivo_aceptacion, huella_aceptacion, "
+            "hash_aceptacion, ruta_formato, huella_formato, ruta_salida, fecha, firma_documentos, operador) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (ruta_expediente, archivo_aceptacion, huella_archivo(archivo_aceptacion), hash_aceptacion,
+             ruta_formato, huella_archivo(ruta_formato) or '', ruta_salida,
+             datetime.now().strftime('%Y-%m-%d %H:%M:%S'), firma_documentos or '', operador or '')
+        )
+        self._conexion.execute("DELETE FROM documentos WHERE ruta_expediente = ?", (ruta_expediente,))
+        if documentos:
+            self._conexion.executemany(
+                "INSERT OR REPLACE INTO documentos VALUES (?, ?, ?, ?, ?)",
+                [(ruta_expediente, tipo, formato, huella_archivo(formato) or '', salida)
+                 for tipo, formato, salida in documentos]
+            )
+        self._conexion.commit()
+
+    def esta_al_dia(self, ruta_expediente, archivo_aceptacion, firma_documentos='', formatos_operador=None):
+        """
+        Indica si un expediente no necesita procesarse de nuevo: el archivo de
+        aceptación, los formatos (y el formato asignado al operador) y la
+        configuración de tipos de documento no cambiaron y los documentos
+        generados existen.
+
+        La comparación se hace con stat; el hash solo se calcula cuando cambió la
+        fecha de modificación pero no el tamaño (p. ej. un archivo re-sincronizado).
+
+        Args:
+            ruta_expediente (str): Ruta del expediente
+            archivo_aceptacion (str): Ruta al archivo de aceptación actual
+            firma_documentos (str): Firma de la configuración de tipos de documento actual
+            formatos_operador (callable): Recibe el operador registrado y devuelve
+                                         los formatos que le corresponden con el
+                                         mapeo actual (opcional)
+
+        Returns:
+            bool: True si el expediente está al día
+        """
+        registro = self.obtener(ruta_expediente)
+        if not registro or registro['archivo_aceptacion'] != archivo_aceptacion:
+            return False
+
+        if registro['firma_documentos'] != (firma_documentos or ''):
+            return False
+
+        # El mapeo puede asignar ahora otro formato al operador
+        if formatos_operador is not None:
+            if not registro['operador']:
+                return False
+            formatos = {registro['ruta_formato']} | {d['ruta_formato'] for d in registro['documentos']}
+            if set(formatos_operador(registro['operador'])) != formatos:
+                return False
+
+        for documento in [registro] + registro['documentos']:
+            if not os.path.exists(documento['ruta_salida']):
+                return False
+            if huella_archivo(documento['ruta_formato']) != documento['huella_formato']:
+                return False
+
+        huella_actual = huella_archivo(archivo_aceptacion)
+        if huella_actual == registro['huella_aceptacion']:
+            return True
+
+        # Mismo tamaño con distinta fecha: confirmar por contenido
+        if huella_actual is None or huella_actual.split(':')[0] != registro['huella_aceptacion'].split(':')[0]:
+            return False
+
+        if hash_archivo(archivo_aceptacion, self.acceso) != registro['hash_aceptacion']:
+            return False
+
+        # El contenido no cambió: actualizar la huella para evitar recalcular el hash
+        self._conexion.execute(
+            "UPDATE expedientes SET huella_aceptacion = ? WHERE ruta_expediente = ?",
+            (huella_actual, ruta_expediente)
+        )
+        self._conexion.commit()
+        return True
+
+    def cerrar(self):
+        """Cierra la conexión con el manifiesto."""
+        self._conexion.close()
@@ -0,0 +1,367 @@
+"""
+Mapeo de operadores a formatos de notificación.
+La relación operador -> formato proviene de dos fuentes: el archivo JSON del
+mapeo ('archivo_mapeo' u operadores.json), que se mantiene a mano y nunca se
+modifica, y los operadores detectados en los formatos que ese archivo no
+menciona. Lo detectado se guarda en un archivo aparte (caché del mapeo) junto
+con la huella (tamaño, fecha y hash) de cada formato y la fecha de la última
+revisión. Mientras la caché no supere la antigüedad configurada se usa tal
+cual, sin abrir ningún formato; al revisarla solo se vuelven a leer los
+formatos nuevos o modificados. La escritura es atómica y se protege con un
+archivo de bloqueo para que varios procesos puedan compartir la misma caché.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import logging
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+
+try:
+    from .manifiesto import hash_archivo
+    from .docx_helper import extract_paragraph_texts
+    from .operadores import normalizar_nombre
+except ImportError:
+    from manifiesto import hash_archivo
+    from docx_helper import extract_paragraph_texts
+    from operadores import normalizar_nombre
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Versión del formato de la caché del mapeo
+VERSION_MAPEO = 3
+
+# Nombre del operador en un formato: un párrafo completo de 3 a 6 palabras en
+# mayúsculas (con tildes y Ñ), como la firma que busca OPERADOR_FIRMA
+PATRON_OPERADOR = re.compile(r'[A-ZÁÉÍÓÚÜÑ]{2,}(?: [A-ZÁÉÍÓÚÜÑ]{2,}){2,5}')
+
+# Palabras en mayúsculas de los formatos que no forman parte de un nombre
+# (comparadas sin tildes)
+PALABRAS_NO_NOMBRE = {
+    'NOTIFICACION', 'CITACION', 'ACREEDOR', 'ACREEDORES', 'SENOR', 'SENORES', 'SENORA', 'DEUDOR',
+    'DEUDORA', 'RADICADO', 'OPERADOR', 'OPERADORA', 'INSOLVENCIA', 'CENTRO', 'CONCILIACION',
+    'AUDIENCIA', 'ACTA', 'AUTO', 'ASUNTO', 'REFERENCIA', 'PROCESO', 'SOLICITUD', 'NEGOCIACION',
+    'DEUDAS', 'PERSONA', 'NATURAL', 'COMERCIANTE'
+}
+
+# Segundos tras los que un archivo de bloqueo se considera abandonado
+BLOQUEO_ABANDONADO = 120
+
+class BloqueoArchivo:
+    """
+    Bloqueo entre procesos basado en la creación exclusiva de un archivo.
+    """
+
+    def __init__(self, ruta, espera=30.0):
+        """
+        Args:
+            ruta (str): Ruta del archivo de bloqueo
+            espera (float): Segundos máximos de espera para obtener el bloqueo
+        """
+        self.ruta = ruta
+        self.espera = espera
+        self._descriptor = None
+
+    def __enter__(self):
+        limite = time.monotonic() + self.espera
+        while True:
+            try:
+                self._descriptor = os.open(self.ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._descriptor, str(os.getpid()).encode())
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.ruta) > BLOQUEO_ABANDONADO:
+                        logger.warning("Se elimina el bloqueo abandonado %s", self.ruta)
+                        os.remove(self.ruta)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > limite:
+                    raise TimeoutError(f"No se pudo obtener el bloqueo {self.ruta}")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        os.close(self._descriptor)
+        self._descriptor = None
+        try:
+            os.remove(self.ruta)
+        except OSError:
+            pass
+        return False
+
+def es_nombre_operador(texto):
+    """
+    Indica si un párrafo de un formato tiene la forma de un nombre completo.
+
+    Args:
+        texto (str): Texto del párrafo (sin espacios repetidos)
+
+    Returns:
+        bool: True si es un nombre plausible del operador
+    """
+    if not PATRON_OPERADOR.fullmatch(texto):
+        return False
+    return not any(palabra in PALABRAS_NO_NOMBRE for palabra in normalizar_nombre(texto).split())
+
+def operador_de_formato(ruta_formato):
+    """
+    Busca el nombre del operador en el texto de un formato. Se prefiere el
+    nombre seguido de su cargo ("Operador(a) de insolvencia"); si no lo hay,
+    se acepta un único párrafo con forma de nombre.
+
+    Args:
+        ruta_formato (str): Ruta al formato (.docx)
+
+    Returns:
+        str: Nombre del operador, o None si no se encontró o es ambiguo
+    """
+    parrafos = [' '.join(texto.split()) for texto in extract_paragraph_texts(ruta_formato)]
+    parrafos = [texto for texto in parrafos if texto]
+    candidatos = []
+    for numero, texto in enumerate(parrafos):
+        if not es_nombre_operador(texto):
+            continue
+        if numero + 1 < len(parrafos) and parrafos[numero + 1].lower().startswith('operador'):
+            return texto
+        if texto not in candidatos:
+            candidatos.append(texto)
+    if len(candidatos) == 1:
+        return candidatos[0]
+    if candidatos:
+        logger.warning("Varios nombres posibles de operador en %s: %s", os.path.basename(ruta_formato),
+                       ', '.join(candidatos))
+    return None
+
+class MapeoOperadores:
+    """
+    Mapeo de operadores con huellas de los formatos y actualización incremental.
+    """
+
+    def __init__(self, ruta_json, ruta_formatos, dias_actualizacion=30, ruta_cache=None):
+        """
+        Args:
+            ruta_json (str): Archivo JSON del mapeo mantenido a mano (solo se lee)
+            ruta_formatos (str): Carpeta de los formatos de los operadores
+            dias_actualizacion (float): Antigüedad máxima de la caché en días antes
+                                       de revisar de nuevo los formatos (0 = siempre)
+            ruta_cache (str): Archivo JSON donde se guardan las huellas y los
+                             operadores detectados (opcional; sin él se revisan
+                             los formatos en cada carga)
+        """
+        self.ruta_json = ruta_json
+        self.ruta_formatos = ruta_formatos
+        self.dias_actualizacion = dias_actualizacion
+        self.ruta_cache = ruta_cache
+        self.formatos_leidos = 0
+
+    def _leer_json(self, ruta):
+        """
+        Returns:
+            dict: Contenido del archivo, o None si no existe o no se puede leer
+        """
+        if not ruta or not os.path.exists(ruta):
+            return None
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("Error al cargar mapeo de operadores %s: %s", ruta, e)
+            return None
+        return datos if isinstance(datos, dict) else None
+
+    def _mapeo_base(self):
+        """
+        Lee el mapeo mantenido a mano.
+
+        Returns:
+            dict: Nombre del operador -> formato (nombre o ruta absoluta)
+        """
+        datos = self._leer_json(self.ruta_json) or {}
+        if 'formatos' in datos and isinstance(datos.get('operadores'), dict):
+            # Archivo con huellas de una versión anterior: las entradas que se
+            # detectaron en los formatos no son del usuario
+            detectados = {huella.get('operador') for huella in datos['formatos'].values()}
+            return {operador: ruta for operador, ruta in datos['operadores'].items() if operador not in detectados}
+        return {operador: ruta for operador, ruta in datos.items() if isinstance(ruta, str)}
+
+    def _leer_cache(self):
+        """
+        Returns:
+            dict: Datos de la caché ('version', 'ruta_formatos', 'actualizado',
+                  'formatos'), o None si no existe o corresponde a otra carpeta
+        """
+        datos = self._leer_json(self.ruta_cache)
+        if not datos or datos.get('version') != VERSION_MAPEO or datos.get('ruta_formatos') != self.ruta_formatos:
+            return None
+        return datos
+
+    def _vigente(self, datos):
+        """
+        Indica si la caché puede usarse sin revisar los formatos.
+        """
+        if not datos or not datos.get('actualizado'):
+            return False
+        try:
+            actualizado = datetime.fromisoformat(datos['actualizado'])
+        except ValueError:
+            return False
+        return datetime.now() - actualizado < timedelta(days=self.dias_actualizacion)
+
+    def _ruta_absoluta(self, ruta):
+        return ruta if os.path.isabs(ruta) else os.path.join(self.ruta_formatos, ruta)
+
+    def obtener(self, forzar=False):
+        """
+        Obtiene el mapeo de operadores, revisando los formatos si la caché
+        superó la antigüedad configurada, si no existe o si se fuerza.
+
+        Args:
+            forzar (bool): Revisar los formatos aunque la caché esté vigente
+
+        Returns:
+            dict: Nombre del operador -> ruta absoluta del formato
+        """
+        self.formatos_leidos = 0
+        base = self._mapeo_base()
+        datos = self._leer_cache()
+        if forzar or not self._vigente(datos):
+            try:
+                datos = self.actualizar(forzar, base)
+            except (OSError, TimeoutError) as e:
+                logger.error("Error al actualizar mapeo de operadores: %s", e)
+        return self._combinar(base, datos or {})
+
+    def _combinar(self, base, datos):
+        """
+        Combina el mapeo mantenido a mano con los operadores detectados. Las
+        entradas del mapeo a mano prevalecen mientras su formato exista.
+
+        Args:
+            base (dict): Mapeo mantenido a mano
+            datos (dict): Datos de la caché
+
+        Returns:
+            dict: Nombre del operador -> ruta absoluta del formato
+        """
+        mantenidos = {}
+        for operador, ruta in base.items():
+            if os.path.exists(self._ruta_absoluta(ruta)):
+                mantenidos[operador] = ruta
+            else:
+                logger.warning("No existe el formato '%s' del operador '%s'", ruta, operador)
+        nombres = {normalizar_nombre(operador) for operador in mantenidos}
+
+        operadores = {}
+        for nombre, huella in sorted(datos.get('formatos', {}).items()):
+            operador = huella.get('operador')
+            if operador and normalizar_nombre(operador) not in nombres:
+                operadores[operador] = nombre
+        operadores.update(mantenidos)
+        return {operador: self._ruta_absoluta(ruta) for operador, ruta in operadores.items()}
+
+    def actualizar(self, forzar=False, base=None):
+        """
+        Revisa los formatos y guarda la caché. Solo se leen los formatos nuevos
+        o cuyo contenido cambió desde la última revisión; los que ya figuran en
+        el mapeo mantenido a mano no se leen.
+
+        Args:
+            forzar (bool): Revisar aunque otro proceso acabe de actualizar la caché
+            base (dict): Mapeo mantenido a mano (si es None se lee)
+
+        Returns:
+            dict: Datos de la caché actualizada
+        """
+        if base is None:
+            base = self._mapeo_base()
+        bloqueo = nullcontext()
+        if self.ruta_cache:
+            directorio = os.path.dirname(self.ruta_cache)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            bloqueo = BloqueoArchivo(f"{self.ruta_cache}.lock")
+
+        with bloqueo:
+            # Otro proceso pudo actualizar la caché mientras se esperaba el bloqueo
+            datos = self._leer_cache()
+            if not forzar and self._vigente(datos):
+                return datos
+
+            if not os.path.isdir(self.ruta_formatos):
+                logger.error("La ruta de formatos no existe: %s", self.ruta_formatos)
+                return datos
+
+            formatos = self._revisar_formatos(datos or {}, base)
+            datos = {
+                'version': VERSION_MAPEO,
+                'ruta_formatos': self.ruta_formatos,
+                'actualizado': datetime.now().isoformat(timespec='seconds'),
+                'formatos': formatos
+            }
+            if self.ruta_cache:
+                self._guardar(datos)
+            logger.info("Mapeo de operadores actualizado: %d formatos, %d leídos",
+                        len(formatos), self.formatos_leidos)
+            return datos
+
+    def _revisar_formatos(self, datos, base):
+        """
+        Calcula la huella de cada formato y lee los que cambiaron.
+
+        Args:
+            datos (dict): Datos de la caché anterior
+            base (dict): Mapeo mantenido a mano
+
+        Returns:
+            dict: Huella y operador detectado por nombre de formato
+        """
+        anteriores = datos.get('formatos', {})
+        referenciados = {os.path.basename(ruta) for ruta in base.values()}
+
+        formatos = {}
+        with os.scandir(self.ruta_formatos) as elementos:
+            for elemento in elementos:
+                if not elemento.name.endswith('.docx') or elemento.name.startswith('~$'):
+                    continue
+                if elemento.name in referenciados:
+                    # Su operador ya figura en el mapeo mantenido a mano
+                    continue
+                stat = elemento.stat()
+                anterior = anteriores.get(elemento.name)
+                if anterior and anterior['tamano'] == stat.st_size and anterior['mtime_ns'] == stat.st_mtime_ns:
+                    formatos[elemento.name] = anterior
+                    continue
+
+                huella = {'tamano': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                          'hash': hash_archivo(elemento.path)}
+                if anterior and anterior['hash'] == huella['hash']:
+                    huella['operador'] = anterior.get('operador')
+                else:
+                    try:
+                        huella['operador'] = operador_de_formato(elemento.path)
+                        self.formatos_leidos += 1
+                    except Exception as e:
+                        logger.error("Error al procesar formato %s: %s", elemento.name, e)
+                        huella['operador'] = None
+                    if huella['operador']:
+                        logger.info("Mapeado operador '%s' a formato '%s'", huella['operador'], elemento.name)
+                formatos[elemento.name] = huella
+        return formatos
+
+    def _guardar(self, datos):
+        """
+        Guarda la caché del mapeo de forma atómica (archivo temporal y reemplazo).
+
+        Args:
+            datos (dict): Datos de la caché
+        """
+        temporal = f"{self.ruta_cache}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=4, ensure_ascii=False)
+        os.replace(temporal, self.ruta_cache)
+        logger.info("Guardada la caché del mapeo de operadores en %s", self.ruta_cache)
@@ -0,0 +1,190 @@
+"""
+Medición y control del uso de memoria del procesamiento en lote.
+Mide la memoria residente (RSS) del proceso actual y de los workers, lleva el
+pico de la ejecución y lo compara con el límite configurado en
+[AVANZADO] memoria_maxima, para que el procesador libere cachés, reduzca la
+lectura anticipada o recicle los workers antes de que el equipo use la memoria
+de intercambio.
+"""
+
+import os
+import sys
+import logging
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Expedientes procesados por cada worker antes de reemplazarlo
+MAX_TAREAS_WORKER = 500
+
+# Resultados entre dos mediciones de la memoria del proceso actual
+INTERVALO_MEDICION = 8
+
+_MB = 1024 * 1024
+
+def _contadores_windows():
+    """
+    Obtiene los contadores de memoria del proceso actual en Windows.
+
+    Returns:
+        ctypes.Structure: Contadores (WorkingSetSize, PeakWorkingSetSize...), o None
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class _Contadores(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    contadores = _Contadores()
+    contadores.cb = ctypes.sizeof(contadores)
+    proceso = ctypes.windll.kernel32.GetCurrentProcess()
+    if ctypes.windll.psapi.GetProcessMemoryInfo(proceso, ctypes.byref(contadores), contadores.cb):
+        return contadores
+    return None
+
+def memoria_actual_mb():
+    """
+    Obtiene la memoria residente actual del proceso.
+
+    Returns:
+        float: Memoria en MB, o None si no se puede medir en este sistema
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm', 'rb') as f:
+                paginas = int(f.read().split()[1])
+            return round(paginas * os.sysconf('SC_PAGE_SIZE') / _MB, 1)
+        if sys.platform == 'win32':
+            contadores = _contadores_windows()
+            return round(contadores.WorkingSetSize / _MB, 1) if contadores else None
+    except (OSError, ValueError, AttributeError) as e:
+        logger.debug(f"No se pudo medir la memoria del proceso: {str(e)}")
+        return None
+    # Otros sistemas: solo se conoce el pico
+    return pico_memoria_mb()
+
+def pico_memoria_mb():
+    """
+    Obtiene el pico de memoria residente del proceso y de sus procesos hijos.
+
+    Returns:
+        float: Pico de memoria en MB, o None si no se puede medir en este sistema
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        propio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        hijos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        # ru_maxrss está en bytes en macOS y en KB en Linux
+        divisor = _MB if sys.platform == 'darwin' else 1024
+        return round(max(propio, hijos) / divisor, 1)
+
+    if sys.platform == 'win32':
+        contadores = _contadores_windows()
+        if contadores:
+            return round(contadores.PeakWorkingSetSize / _MB, 1)
+    return None
+
+class ControlMemoria:
+    """
+    Lleva la memoria de una ejecución (proceso actual y workers) frente al límite.
+    """
+
+    def __init__(self, limite_mb=0):
+        """
+        Args:
+            limite_mb (float): Memoria máxima de toda la ejecución en MB (0 = sin límite)
+        """
+        self.limite_mb = float(limite_mb or 0)
+        self.proceso_mb = None
+        self.workers_mb = {}
+        self.pico_mb = None
+        self.pico_proceso_mb = None
+        self.pico_workers_mb = None
+        self.reciclajes = 0
+        self.liberaciones = 0
+
+    def medir(self):
+        """
+        Mide la memoria del proceso actual y actualiza los picos.
+
+        Returns:
+            float: Memoria total actual (proceso y workers) en MB, o None
+        """
+        self.proceso_mb = memoria_actual_mb()
+        return self._actualizar()
+
+    def registrar_worker(self, pid, memoria_mb):
+        """
+        Registra la memoria informada por un worker al terminar un lote.
+
+        Args:
+            pid (int): Identificador del proceso del worker
+            memoria_mb (float): Memoria residente del worker en MB (o None)
+
+        Returns:
+            float: Memoria total actual en MB, o None
+        """
+        if memoria_mb is not None:
+            self.workers_mb[pid] = memoria_mb
+        return self._actualizar()
+
+    def olvidar_workers(self):
+        """Descarta la memoria de los workers (después de reemplazarlos)."""
+        self.workers_mb = {}
+
+    def _actualizar(self):
+        total = self.total_mb()
+        if self.proceso_mb is not None:
+            self.pico_proceso_mb = max(self.pico_proceso_mb or 0, self.proceso_mb)
+        if self.workers_mb:
+            self.pico_workers_mb = max(self.pico_workers_mb or 0, sum(self.workers_mb.values()))
+        if total is not None:
+            self.pico_mb = max(self.pico_mb or 0, total)
+        return total
+
+    def total_mb(self):
+        """
+        Returns:
+            float: Memoria del proceso actual más la última medida de cada worker, o None
+        """
+        if self.proceso_mb is None and not self.workers_mb:
+            return None
+        return round((self.proceso_mb or 0) + sum(self.workers_mb.values()), 1)
+
+    def excedido(self, memoria_mb=None):
+        """
+        Indica si la memoria supera el límite.
+
+        Args:
+            memoria_mb (float): Memoria a comparar (por defecto, el total actual)
+
+        Returns:
+            bool: True si hay límite y se superó
+        """
+        if memoria_mb is None:
+            memoria_mb = self.total_mb()
+        return bool(self.limite_mb) and memoria_mb is not None and memoria_mb > self.limite_mb
+
+    def resumen(self):
+        """
+        Returns:
+            dict: Límite, picos (total, proceso principal y suma de workers),
+                  liberaciones de cachés y reciclajes de workers
+        """
+        return {
+            'limite_mb': self.limite_mb or None,
+            'pico_mb': self.pico_mb,
+            'pico_proceso_mb': self.pico_proceso_mb,
+            'pico_workers_mb': self.pico_workers_mb,
+            'excedido': self.excedido(self.pico_mb),
+            'liberaciones': self.liberaciones,
+            'reciclajes': self.reciclajes
+        }
@@ -0,0 +1,208 @@
+"""
+Métricas de rendimiento del procesamiento de expedientes.
+Mide la duración de cada etapa del procesamiento de un expediente y resume una
+ejecución completa (percentiles por etapa y expedientes más lentos). Con la
+medición desactivada el costo se reduce a devolver un contexto vacío.
+"""
+
+import os
+import json
+import heapq
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+# Contexto reutilizable para cuando la medición está desactivada
+SIN_MEDICION = nullcontext()
+
+# Número de expedientes más lentos que se incluyen en el resumen
+TOP_EXPEDIENTES = 10
+
+class Etapa:
+    """
+    Contexto que acumula la duración de una etapa en un diccionario de etapas.
+    """
+
+    __slots__ = ('_etapas', '_nombre', '_inicio')
+
+    def __init__(self, etapas, nombre):
+        """
+        Args:
+            etapas (dict): Nombre de etapa -> milisegundos acumulados
+            nombre (str): Nombre de la etapa
+        """
+        self._etapas = etapas
+        self._nombre = nombre
+        self._inicio = 0.0
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        transcurrido = (time.perf_counter() - self._inicio) * 1000
+        self._etapas[self._nombre] = self._etapas.get(self._nombre, 0.0) + transcurrido
+        return False
+
+def percentiles(valores):
+    """
+    Calcula percentiles (método del rango más cercano) de una lista de tiempos.
+
+    Args:
+        valores (list): Tiempos en milisegundos
+
+    Returns:
+        dict: Cantidad, total, p50, p95, p99 y máximo
+    """
+    if not valores:
+        return {'n': 0}
+    ordenados = sorted(valores)
+
+    def rango(p):
+        return round(ordenados[max(0, -(-len(ordenados) * p // 100) - 1)], 2)
+
+    return {'n': len(ordenados), 'total': round(sum(ordenados), 2), 'p50': rango(50),
+            'p95': rango(95), 'p99': rango(99), 'max': round(ordenados[-1], 2)}
+
+class MetricasProcesamiento:
+    """
+    Acumula las métricas de una ejecución de procesar_expedientes.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fin = None
+        self.etapas = {}
+        self.expedientes = []
+        self._mas_lentos = []
+        # Resumen de ControlMemoria (lo asigna el procesador al finalizar)
+        self.memoria = None
+
+    def etapa(self, nombre):
+        """
+        Mide una etapa de la ejecución completa (p. ej. el listado de la ruta base).
+
+        Args:
+            nombre (str): Nombre de la etapa
+
+        Returns:
+            Etapa: Contexto de medición
+        """
+        return _EtapaEjecucion(self, nombre)
+
+    def registrar(self, nombre, milisegundos):
+        """
+        Registra una medición de una etapa.
+
+        Args:
+            nombre (str): Nombre de la etapa
+            milisegundos (float): Duración
+        """
+        self.etapas.setdefault(nombre, []).append(milisegundos)
+
+    def agregar_resultado(self, resultado):
+        """
+        Incorpora las mediciones del resultado de un expediente.
+
+        Args:
+            resultado (dict): Resultado de ProcesadorExpedientes._procesar_expediente
+        """
+        for nombre, milisegundos in (resultado.get('etapas_ms') or {}).items():
+            self.registrar(nombre, milisegundos)
+
+        duracion = resultado.get('duracion_ms')
+        if duracion is None:
+            return
+        self.expedientes.append(duracion)
+        entrada = (duracion, resultado['expediente'], resultado['estado'])
+        if len(self._mas_lentos) < TOP_EXPEDIENTES:
+            heapq.heappush(self._mas_lentos, entrada)
+        else:
+            heapq.heappushpop(self._mas_lentos, entrada)
+
+    def finalizar(self):
+        """Marca el final de la ejecución."""
+        self.fin = time.perf_counter()
+
+    def resumen(self):
+        """
+        Genera el resumen de la ejecución.
+
+        Returns:
+            dict: Duración total, estadísticas por etapa, expedientes más lentos
+                  y memoria frente al límite configurado
+        """
+        fin = self.fin if self.fin is not None else time.perf_counter()
+        return {
+            'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'total_s': round(fin - self.inicio, 3),
+            'expedientes': percentiles(self.expedientes),
+            'etapas_ms': {nombre: percentiles(valores) for nombre, valores in self.etapas.items()},
+            'mas_lentos': [
+                {'expediente': nombre, 'estado': estado, 'duracion_ms': duracion}
+                for duracion, nombre, estado in sorted(self._mas_lentos, reverse=True)
+            ],
+            'memoria': self.memoria
+        }
+
+    def reporte(self):
+        """
+        Genera el resumen en texto para el log.
+
+        Returns:
+            str: Resumen legible
+        """
+        resumen = self.resumen()
+        lineas = [f"Resumen de rendimiento ({resumen['total_s']} s, "
+                  f"{resumen['expedientes']['n']} expedientes):"]
+        lineas.append(f"  {'etapa':<14}{'n':>7}{'total ms':>12}{'p50':>9}{'p95':>9}{'max':>9}")
+        filas = [('expediente', resumen['expedientes'])] + list(resumen['etapas_ms'].items())
+        for nombre, datos in filas:
+            if not datos['n']:
+                continue
+            lineas.append(f"  {nombre:<14}{datos['n']:>7}{datos['total']:>12.1f}"
+                          f"{datos['p50']:>9.1f}{datos['p95']:>9.1f}{datos['max']:>9.1f}")
+        if resumen['mas_lentos']:
+            lineas.append("  Expedientes más lentos:")
+            for lento in resumen['mas_lentos']:
+                lineas.append(f"    {lento['duracion_ms']:>9.1f} ms  {lento['expediente']} ({lento['estado']})")
+        memoria = resumen['memoria']
+        if memoria and memoria.get('pico_mb') is not None:
+            limite = f" de {memoria['limite_mb']:.0f} MB" if memoria.get('limite_mb') else ""
+            linea = f"  Memoria: pico {memoria['pico_mb']:.1f} MB{limite}"
+            if memoria.get('pico_workers_mb') is not None:
+                linea += (f" (proceso principal {memoria['pico_proceso_mb'] or 0:.1f} MB, "
+                          f"workers {memoria['pico_workers_mb']:.1f} MB)")
+            if memoria.get('liberaciones') or memoria.get('reciclajes'):
+                linea += (f"; cachés liberadas {memoria['liberaciones']} veces, "
+                          f"workers reciclados {memoria['reciclajes']} veces")
+            lineas.append(linea)
+        return "\n".join(lineas)
+
+    def guardar(self, ruta_archivo):
+        """
+        Guarda el resumen en un archivo JSON.
+
+        Args:
+            ruta_archivo (str): Ruta del archivo
+        """
+        directorio = os.path.dirname(ruta_archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+            json.dump(self.resumen(), f, ensure_ascii=False, indent=2)
+
+class _EtapaEjecucion(Etapa):
+    """
+    Etapa de la ejecución completa: registra cada medición por separado.
+    """
+
+    __slots__ = ('_metricas',)
+
+    def __init__(self, metricas, nombre):
+        super().__init__(None, nombre)
+        self._metricas = metricas
+
+    def __exit__(self, *exc):
+        self._metricas.registrar(self._nombre, (time.perf_counter() - self._inicio) * 1000)
+        return False
@@ -0,0 +1,144 @@
+"""
+Índice de operadores de insolvencia.
+Normaliza los nombres del mapeo de operadores (tildes, espacios y mayúsculas) y
+los combina en un único patrón compilado para detectarlos en un texto con un
+solo recorrido; la resolución del formato de un operador detectado es una
+búsqueda directa en diccionario.
+"""
+
+import re
+import unicodedata
+import logging
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Versión de la detección de operadores: debe incrementarse cuando un cambio en
+# este módulo pueda detectar otro operador en el mismo texto (forma parte de la
+# versión de la caché de extracciones)
+VERSION_DETECCION = 2
+
+# Variantes con tilde o diéresis que se consideran equivalentes a cada letra
+_VARIANTES_LETRAS = {
+    'A': 'AÁÀÂÄ',
+    'E': 'EÉÈÊË',
+    'I': 'IÍÌÎÏ',
+    'O': 'OÓÒÔÖ',
+    'U': 'UÚÙÛÜ',
+    'N': 'NÑ',
+    'C': 'CÇ'
+}
+
+def normalizar_nombre(nombre):
+    """
+    Normaliza un nombre para compararlo: sin tildes, en mayúsculas y con
+    los espacios internos reducidos a uno.
+
+    Args:
+        nombre (str): Nombre a normalizar
+
+    Returns:
+        str: Nombre normalizado
+    """
+    descompuesto = unicodedata.normalize('NFKD', nombre)
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_tildes.upper().split())
+
+def _patron_nombre(nombre_normalizado):
+    """
+    Construye la expresión regular que reconoce un nombre normalizado en un texto
+    sin normalizar (con o sin tildes y cualquier espaciado). Distingue mayúsculas:
+    el nombre de la firma está en mayúsculas, y así un operador cuyo nombre es
+    también una palabra común no se reconoce en el cuerpo del documento.
+
+    Args:
+        nombre_normalizado (str): Nombre ya normalizado
+
+    Returns:
+        str: Expresión regular del nombre
+    """
+    partes = []
+    for palabra in nombre_normalizado.split(' '):
+        letras = []
+        for letra in palabra:
+            variantes = _VARIANTES_LETRAS.get(letra)
+            letras.append(f"[{variantes}]" if variantes else re.escape(letra))
+        partes.append(''.join(letras))
+    return r'\s+'.join(partes)
+
+class IndiceOperadores:
+    """
+    Índice de operadores construido a partir del mapeo operador -> formato.
+    """
+
+    def __init__(self, operadores_formatos):
+        """
+        Args:
+            operadores_formatos (dict): Nombre del operador -> ruta del formato
+        """
+        # nombre normalizado -> (nombre original, ruta del formato)
+        self._operadores = {}
+        for nombre, ruta in operadores_formatos.items():
+            normalizado = normalizar_nombre(nombre)
+            if normalizado:
+                self._operadores[normalizado] = (nombre, ruta)
+
+        # Los nombres más largos primero para que prevalezca la coincidencia más completa
+        nombres = sorted(self._operadores, key=len, reverse=True)
+        if nombres:
+            alternativas = '|'.join(_patron_nombre(nombre) for nombre in nombres)
+            self._patron = re.compile(rf'(?<!\w)(?:{alternativas})(?!\w)')
+        else:
+            self._patron = None
+
+    def __len__(self):
+        return len(self._operadores)
+
+    def detectar(self, texto, ultimo=True):
+        """
+        Detecta un operador conocido en un texto.
+
+        Args:
+            texto (str): Texto donde buscar
+            ultimo (bool): Si es True devuelve el último operador que aparece
+                          (la firma suele estar al final del documento)
+
+        Returns:
+            str: Nombre del operador tal como figura en el mapeo, o None
+        """
+        if not self._patron or not texto:
+            return None
+
+        coincidencia = None
+        if ultimo:
+            for coincidencia in self._patron.finditer(texto):
+                pass
+        else:
+            coincidencia = self._patron.search(texto)
+
+        if not coincidencia:
+            return None
+        return self._operadores[normalizar_nombre(coincidencia.group(0))][0]
+
+    def resolver(self, operador):
+        """
+        Obtiene la ruta del formato de un operador.
+
+        Args:
+            operador (str): Nombre del operador (detectado o extraído del documento)
+
+        Returns:
+            str: Ruta al formato, o None si el operador no está en el índice
+        """
+        if not operador:
+            return None
+
+        entrada = self._operadores.get(normalizar_nombre(operador))
+        if entrada:
+            return entrada[1]
+
+        # Nombre extraído con texto adicional alrededor: buscar un operador conocido dentro
+        detectado = self.detectar(operador, ultimo=False)
+        if detectado:
+            return self._operadores[normalizar_nombre(detectado)][1]
+        return None
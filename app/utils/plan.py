@@ -0,0 +1,127 @@
+"""
+Plan de procesamiento: predicción de lo que haría una ejecución real.
+Agrupa los resultados de una ejecución en modo simulación por motivo (se
+generaría la notificación, está al día, se ignora, falta el cuaderno, el archivo
+de aceptación o algún dato, operador sin formato, archivos que no respondieron
+o expediente a cargo de otro equipo) y resume los campos faltantes y los operadores desconocidos más frecuentes.
+"""
+
+import os
+import json
+import time
+from collections import Counter
+from datetime import datetime
+
+# Motivo del resultado de cada expediente, en el orden en que se informan
+MOTIVO_GENERAR = "generar"
+MOTIVO_AL_DIA = "al_dia"
+MOTIVO_IGNORADO_00 = "ignorado_00"
+MOTIVO_SIN_CUADERNO = "sin_cuaderno"
+MOTIVO_SIN_ACEPTACION = "sin_aceptacion"
+MOTIVO_DATOS_FALTANTES = "datos_faltantes"
+MOTIVO_OPERADOR_DESCONOCIDO = "operador_desconocido"
+MOTIVO_TIEMPO_AGOTADO = "tiempo_agotado"
+MOTIVO_OTRO_NODO = "otro_nodo"
+MOTIVO_ERROR = "error"
+
+DESCRIPCION_MOTIVOS = {
+    MOTIVO_GENERAR: "Se generará la notificación",
+    MOTIVO_AL_DIA: "Al día (sin cambios)",
+    MOTIVO_IGNORADO_00: "Ignorados por ' 00 '",
+    MOTIVO_SIN_CUADERNO: "Sin '01. CUADERNO PRINCIPAL'",
+    MOTIVO_SIN_ACEPTACION: "Sin archivo de aceptación",
+    MOTIVO_DATOS_FALTANTES: "Datos requeridos faltantes",
+    MOTIVO_OPERADOR_DESCONOCIDO: "Operador sin formato",
+    MOTIVO_TIEMPO_AGOTADO: "Archivos sin respuesta",
+    MOTIVO_OTRO_NODO: "A cargo de otro equipo",
+    MOTIVO_ERROR: "Errores",
+}
+
+class PlanProcesamiento:
+    """
+    Acumula los resultados de una simulación y genera el reporte del plan.
+    """
+
+    def __init__(self, ruta_base=None):
+        """
+        Args:
+            ruta_base (str): Carpeta de los expedientes (solo informativa)
+        """
+        self.ruta_base = ruta_base
+        self.expedientes = {motivo: [] for motivo in DESCRIPCION_MOTIVOS}
+        self.faltantes = Counter()
+        self.operadores_desconocidos = Counter()
+        self.inicio = time.perf_counter()
+        self.fin = None
+
+    def agregar_resultado(self, resultado):
+        """
+        Incorpora el resultado de un expediente.
+
+        Args:
+            resultado (dict): Resultado de ProcesadorExpedientes._procesar_expediente
+        """
+        motivo = resultado.get('motivo') or MOTIVO_ERROR
+        self.expedientes.setdefault(motivo, []).append(resultado['expediente'])
+        if motivo == MOTIVO_DATOS_FALTANTES:
+            self.faltantes.update(resultado.get('faltantes') or [])
+        elif motivo == MOTIVO_OPERADOR_DESCONOCIDO:
+            self.operadores_desconocidos[(resultado.get('info') or {}).get('operador')] += 1
+
+    def finalizar(self):
+        """Marca el final de la simulación."""
+        self.fin = time.perf_counter()
+
+    def resumen(self):
+        """
+        Genera el resumen del plan.
+
+        Returns:
+            dict: Cantidad por motivo, campos faltantes, operadores desconocidos y
+                  nombres de los expedientes de cada motivo
+        """
+        fin = self.fin if self.fin is not None else time.perf_counter()
+        return {
+            'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'ruta_expedientes': self.ruta_base,
+            'duracion_s': round(fin - self.inicio, 3),
+            'total': sum(len(nombres) for nombres in self.expedientes.values()),
+            'motivos': {motivo: len(nombres) for motivo, nombres in self.expedientes.items()},
+            'faltantes': dict(self.faltantes.most_common()),
+            'operadores_desconocidos': dict(self.operadores_desconocidos.most_common()),
+            'expedientes': {motivo: sorted(nombres) for motivo, nombres in self.expedientes.items() if nombres}
+        }
+
+    def reporte(self):
+        """
+        Genera el plan en texto.
+
+        Returns:
+            str: Reporte legible
+        """
+        resumen = self.resumen()
+        lineas = [f"Plan de procesamiento ({resumen['total']} elementos, {resumen['duracion_s']} s):"]
+        for motivo, cantidad in resumen['motivos'].items():
+            lineas.append(f"  {DESCRIPCION_MOTIVOS.get(motivo, motivo):<32}{cantidad:>7}")
+        if resumen['faltantes']:
+            lineas.append("  Campos faltantes:")
+            for campo, cantidad in resumen['faltantes'].items():
+                lineas.append(f"    {campo:<30}{cantidad:>7}")
+        if resumen['operadores_desconocidos']:
+            lineas.append("  Operadores sin formato:")
+            for operador, cantidad in resumen['operadores_desconocidos'].items():
+                lineas.append(f"    {str(operador):<30}{cantidad:>7}")
+        return "\n".join(lineas)
+
+    def guardar(self, ruta_archivo):
+        """
+        Guarda el resumen en un archivo JSON.
+
+        Args:
+            ruta_archivo (str): Ruta del archivo
+        """
+        directorio = os.path.dirname(ruta_archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+            json.dump(self.resumen(), f, ensure_ascii=False, indent=2)
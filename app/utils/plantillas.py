@@ -0,0 +1,202 @@
+"""
+Caché de formatos (plantillas) de operadores.
+Cada formato .docx se lee e interpreta una sola vez por proceso; para cada
+notificación se entrega una copia independiente del árbol XML del documento
+sobre la que se aplican los reemplazos. Al guardar solo se reescriben las partes
+modificadas y el resto del paquete se copia tal cual desde la plantilla.
+"""
+
+import io
+import copy
+import logging
+import threading
+from docx import Document
+from docx.document import Document as DocumentoDocx
+from docx.opc.constants import CONTENT_TYPE
+from docx.opc.oxml import serialize_part_xml
+from docx.oxml.ns import qn
+
+try:
+    from .manifiesto import huella_archivo
+    from .acceso_archivos import acceso_predeterminado
+    from .docx_helper import compile_replacements, replace_text_in_element, write_docx_parts
+except ImportError:
+    from manifiesto import huella_archivo
+    from acceso_archivos import acceso_predeterminado
+    from docx_helper import compile_replacements, replace_text_in_element, write_docx_parts
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Tipos de contenido de encabezados y pies de página
+_TIPOS_ENCABEZADO = (CONTENT_TYPE.WML_HEADER, CONTENT_TYPE.WML_FOOTER)
+
+class Plantilla:
+    """
+    Plantilla interpretada: bytes originales del paquete, documento de python-docx
+    y partes de encabezado/pie de página con su texto para descartar rápidamente
+    las que no contienen textos a reemplazar.
+    """
+
+    def __init__(self, datos):
+        """
+        Args:
+            datos (bytes): Contenido completo del archivo .docx
+        """
+        self.datos = datos
+        self.documento = Document(io.BytesIO(datos))
+        self.nombre_documento = self.documento.part.partname.lstrip('/')
+
+        # nombre del miembro ZIP -> (elemento XML, texto concatenado)
+        self.encabezados = {}
+        for parte in self.documento.part.package.iter_parts():
+            if parte.content_type in _TIPOS_ENCABEZADO:
+                texto = ''.join(t.text or '' for t in parte.element.iter(qn('w:t')))
+                self.encabezados[parte.partname.lstrip('/')] = (parte.element, texto)
+
+class DocumentoRenderizado(DocumentoDocx):
+    """
+    Documento de Word construido sobre una copia del árbol XML de una plantilla.
+    Comparte el paquete (estilos, imágenes, relaciones) con la plantilla original,
+    que solo se lee; al guardarse escribe el cuerpo propio y los encabezados
+    modificados, copiando las demás partes sin recomprimir.
+    """
+
+    def __init__(self, plantilla):
+        """
+        Args:
+            plantilla (Plantilla): Plantilla de la que se copia el cuerpo
+        """
+        super().__init__(copy.deepcopy(plantilla.documento.element), plantilla.documento.part)
+        self._plantilla = plantilla
+        self._encabezados = {}
+
+    def replace_text(self, reemplazos):
+        """
+        Aplica reemplazos al cuerpo y a los encabezados/pies de página que los contienen.
+
+        Args:
+            reemplazos (list): Lista de diccionarios con claves 'original' y 'nuevo'
+
+        Returns:
+            dict: Número de reemplazos realizados por texto original
+        """
+        compilado = compile_replacements(reemplazos)
+        conteo = replace_text_in_element(self.element, compilado)
+
+        patron = compilado[0]
+        if patron is None:
+            return conteo
+
+        for nombre, (elemento, texto) in self._plantilla.encabezados.items():
+            if nombre not in self._encabezados:
+                if not patron.search(texto):
+                    continue
+                self._encabezados[nombre] = copy.deepcopy(elemento)
+            copia = self._encabezados[nombre]
+            for original, cantidad in replace_text_in_element(copia, compilado).items():
+                conteo[original] += cantidad
+        return conteo
+
+    def save(self, path_or_stream):
+        """
+        Guarda el documento reescribiendo solo las partes propias de esta copia.
+
+        Args:
+            path_or_stream (str or file): Ruta o flujo de destino
+        """
+        partes = {self._plantilla.nombre_documento: serialize_part_xml(self.element)}
+        for nombre, elemento in self._encabezados.items():
+            partes[nombre] = serialize_part_xml(elemento)
+        write_docx_parts(self._plantilla.datos, partes, path_or_stream)
+
+class CachePlantillas:
+    """
+    Caché de plantillas .docx interpretadas, invalidada cuando cambian el
+    tamaño o la fecha de modificación del archivo.
+    """
+
+    def __init__(self, acceso=None):
+        """
+        Args:
+            acceso (AccesoArchivos): Acceso a archivos con plazo y reintentos
+                                     (por defecto, el predeterminado)
+        """
+        self.acceso = acceso or acceso_predeterminado()
+        # ruta -> (huella, Plantilla)
+        self._plantillas = {}
+        self._bloqueo = threading.Lock()
+
+    def obtener(self, ruta_plantilla):
+        """
+        Obtiene la plantilla interpretada, cargándola si no está en caché o cambió.
+
+        Args:
+            ruta_plantilla (str): Ruta al archivo .docx del formato
+
+        Returns:
+            Plantilla: Plantilla original (no debe modificarse)
+        """
+        huella = huella_archivo(ruta_plantilla)
+        with self._bloqueo:
+            entrada = self._plantillas.get(ruta_plantilla)
+            if entrada and entrada[0] == huella:
+                return entrada[1]
+
+        return self.agregar(ruta_plantilla, huella, self.acceso.leer(ruta_plantilla))
+
+    def contiene(self, ruta_plantilla):
+        """
+        Indica si una plantilla ya está cargada (sin comprobar si cambió).
+
+        Args:
+            ruta_plantilla (str): Ruta al archivo .docx del formato
+
+        Returns:
+            bool: True si la plantilla está en la caché
+        """
+        with self._bloqueo:
+            return ruta_plantilla in self._plantillas
+
+    def agregar(self, ruta_plantilla, huella, datos):
+        """
+        Carga en la caché una plantilla leída por adelantado.
+
+        Args:
+            ruta_plantilla (str): Ruta al archivo .docx del formato
+            huella (str): Huella del archivo tomada antes de leerlo
+            datos (bytes): Contenido del archivo
+
+        Returns:
+            Plantilla: Plantilla interpretada
+        """
+        plantilla = Plantilla(datos)
+        logger.debug("Plantilla cargada en caché: %s", ruta_plantilla)
+        with self._bloqueo:
+            self._plantillas[ruta_plantilla] = (huella, plantilla)
+        return plantilla
+
+    def nuevo_documento(self, ruta_plantilla):
+        """
+        Entrega un documento independiente basado en la plantilla indicada.
+
+        Args:
+            ruta_plantilla (str): Ruta al archivo .docx del formato
+
+        Returns:
+            DocumentoRenderizado: Documento listo para aplicar reemplazos y guardar
+        """
+        return DocumentoRenderizado(self.obtener(ruta_plantilla))
+
+    def invalidar(self, ruta_plantilla=None):
+        """
+        Elimina una plantilla de la caché, o todas si no se indica ruta.
+
+        Args:
+            ruta_plantilla (str): Ruta de la plantilla a eliminar (opcional)
+        """
+        with self._bloqueo:
+            if ruta_plantilla is None:
+                self._plantillas.clear()
+            else:
+                self._plantillas.pop(ruta_plantilla, None)
@@ -0,0 +1,253 @@
+"""
+Detección de cambios en la carpeta de expedientes para el modo de vigilancia.
+En Linux se usa inotify (a través de ctypes, sin dependencias adicionales); en
+los demás sistemas, o si inotify no está disponible, se compara periódicamente
+una instantánea de la estructura de carpetas construida con el índice de
+directorios, de modo que cada sondeo solo lista las carpetas que cambiaron.
+"""
+
+import os
+import sys
+import time
+import errno
+import struct
+import select
+import logging
+
+try:
+    from .directorios import IndiceExpedientes, CARPETA_CUADERNO
+    from .manifiesto import huella_archivo
+except ImportError:
+    from directorios import IndiceExpedientes, CARPETA_CUADERNO
+    from manifiesto import huella_archivo
+
+# Configurar logger para este módulo
+logger = logging.getLogger(__name__)
+
+# Constantes de inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENTO = struct.Struct('iIII')
+
+# Eventos observados en cada nivel de la estructura
+_MASCARA_RAIZ = _IN_CREATE | _IN_MOVED_TO | _IN_DELETE | _IN_MOVED_FROM
+_MASCARA_EXPEDIENTE = _IN_CREATE | _IN_MOVED_TO | _IN_DELETE | _IN_MOVED_FROM | _IN_DELETE_SELF
+_MASCARA_CUADERNO = _IN_CREATE | _IN_MOVED_TO | _IN_MODIFY | _IN_CLOSE_WRITE | _IN_DELETE | _IN_DELETE_SELF
+
+class ObservadorSondeo:
+    """
+    Observador que compara instantáneas de la carpeta de expedientes.
+    """
+
+    def __init__(self, ruta_base, intervalo=5.0, excluir=None):
+        """
+        Args:
+            ruta_base (str): Carpeta que contiene los expedientes
+            intervalo (float): Segundos entre sondeos
+            excluir (callable): Función que recibe el nombre de una carpeta y
+                               devuelve True si no debe vigilarse
+        """
+        self.ruta_base = ruta_base
+        self.intervalo = intervalo
+        self.excluir = excluir
+        self._indice = IndiceExpedientes(ruta_base)
+        self._huellas = self._instantanea()
+
+    def _instantanea(self):
+        """
+        Returns:
+            dict: Nombre del expediente -> (archivo de aceptación, huella)
+        """
+        huellas = {}
+        for nombre, entrada in self._indice.escanear(excluir=self.excluir):
+            if entrada is None:
+                continue
+            huella = None
+            if entrada['aceptacion']:
+                huella = huella_archivo(os.path.join(self.ruta_base, nombre, entrada['cuaderno'],
+                                                     entrada['aceptacion']))
+            huellas[nombre] = (entrada['aceptacion'], huella)
+        return huellas
+
+    def esperar(self, timeout, detener):
+        """
+        Espera hasta el siguiente sondeo y devuelve los expedientes que cambiaron.
+
+        Args:
+            timeout (float): Tiempo máximo de espera en segundos
+            detener (threading.Event): Evento que interrumpe la espera
+
+        Returns:
+            set: Nombres de los expedientes con cambios
+        """
+        if detener.wait(min(timeout, self.intervalo)):
+            return set()
+        try:
+            huellas = self._instantanea()
+        except OSError as e:
+            logger.warning("No se pudo sondear %s: %s", self.ruta_base, e)
+            return set()
+        cambios = {nombre for nombre, huella in huellas.items() if self._huellas.get(nombre) != huella}
+        self._huellas = huellas
+        return cambios
+
+    def cerrar(self):
+        """Libera los recursos del observador."""
+
+class ObservadorInotify:
+    """
+    Observador basado en inotify. Vigila la ruta base, cada carpeta de
+    expediente y su cuaderno principal.
+    """
+
+    def __init__(self, ruta_base, excluir=None):
+        """
+        Args:
+            ruta_base (str): Carpeta que contiene los expedientes
+            excluir (callable): Función que recibe el nombre de una carpeta y
+                               devuelve True si no debe vigilarse
+
+        Raises:
+            OSError: Si inotify no está disponible o no se pueden crear las vigilancias
+        """
+        import ctypes
+        import ctypes.util
+
+        self.ruta_base = ruta_base
+        self.excluir = excluir
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._ctypes = ctypes
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            numero = ctypes.get_errno()
+            raise OSError(numero, os.strerror(numero))
+
+        # Descriptor de vigilancia -> (nombre del expediente o None para la raíz, es_cuaderno)
+        self._vigilancias = {}
+        try:
+            self._vigilar(ruta_base, _MASCARA_RAIZ, None, False)
+            with os.scandir(ruta_base) as elementos:
+                for elemento in elementos:
+                    if elemento.is_dir() and not (excluir and excluir(elemento.name)):
+                        self._vigilar_expediente(elemento.name)
+        except OSError:
+            self.cerrar()
+            raise
+
+    def _vigilar(self, ruta, mascara, expediente, es_cuaderno):
+        descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(ruta), mascara)
+        if descriptor < 0:
+            numero = self._ctypes.get_errno()
+            raise OSError(numero, os.strerror(numero), ruta)
+        self._vigilancias[descriptor] = (expediente, es_cuaderno)
+
+    def _vigilar_expediente(self, nombre):
+        ruta = os.path.join(self.ruta_base, nombre)
+        self._vigilar(ruta, _MASCARA_EXPEDIENTE, nombre, False)
+        cuaderno = os.path.join(ruta, CARPETA_CUADERNO)
+        if os.path.isdir(cuaderno):
+            self._vigilar(cuaderno, _MASCARA_CUADERNO, nombre, True)
+
+    def esperar(self, timeout, detener):
+        """
+        Espera eventos de inotify y devuelve los expedientes afectados.
+
+        Args:
+            timeout (float): Tiempo máximo de espera en segundos
+            detener (threading.Event): Evento que interrumpe la espera (se revisa
+                                       al menos una vez por segundo)
+
+        Returns:
+            set: Nombres de los expedientes con cambios, o None si se perdieron
+                 eventos y hay que revisar todos los expedientes
+        """
+        limite = time.monotonic() + timeout
+        while not detener.is_set():
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return set()
+            listos, _, _ = select.select([self._fd], [], [], min(restante, 1.0))
+            if listos:
+                break
+        else:
+            return set()
+
+        try:
+            datos = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return set()
+            raise
+
+        cambios = set()
+        posicion = 0
+        while posicion + _EVENTO.size <= len(datos):
+            descriptor, mascara, _, longitud = _EVENTO.unpack_from(datos, posicion)
+            posicion += _EVENTO.size
+            nombre = os.fsdecode(datos[posicion:posicion + longitud].rstrip(b'\0'))
+            posicion += longitud
+
+            if mascara & _IN_Q_OVERFLOW:
+                return None
+            if mascara & _IN_IGNORED:
+                self._vigilancias.pop(descriptor, None)
+                continue
+
+            expediente, es_cuaderno = self._vigilancias.get(descriptor, (None, False))
+            try:
+                if expediente is None:
+                    # Evento en la raíz: carpeta de expediente creada o movida
+                    if not nombre or (self.excluir and self.excluir(nombre)):
+                        continue
+                    if mascara & _IN_ISDIR and mascara & (_IN_CREATE | _IN_MOVED_TO):
+                        self._vigilar_expediente(nombre)
+                    cambios.add(nombre)
+                elif not es_cuaderno:
+                    # Evento en el expediente: cuaderno principal creado o movido
+                    if nombre == CARPETA_CUADERNO and mascara & _IN_ISDIR \
+                            and mascara & (_IN_CREATE | _IN_MOVED_TO):
+                        self._vigilar(os.path.join(self.ruta_base, expediente, nombre),
+                                      _MASCARA_CUADERNO, expediente, True)
+                    cambios.add(expediente)
+                else:
+                    cambios.add(expediente)
+            except OSError as e:
+                logger.warning("No se pudo vigilar una carpeta nueva de %s: %s", expediente or nombre, e)
+                cambios.add(expediente or nombre)
+        return cambios
+
+    def cerrar(self):
+        """Libera el descriptor de inotify."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+def crear_observador(ruta_base, intervalo=5.0, excluir=None):
+    """
+    Crea el observador más eficiente disponible en el sistema.
+
+    Args:
+        ruta_base (str): Carpeta que contiene los expedientes
+        intervalo (float): Segundos entre sondeos si no hay inotify
+        excluir (callable): Función que recibe el nombre de una carpeta y
+                           devuelve True si no debe vigilarse
+
+    Returns:
+        ObservadorInotify u ObservadorSondeo
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            return ObservadorInotify(ruta_base, excluir)
+        except (OSError, AttributeError) as e:
+            logger.warning("inotify no disponible (%s), se vigilará por sondeo", e)
+    return ObservadorSondeo(ruta_base, intervalo, excluir)
@@ -0,0 +1,5 @@
+"""
+Herramientas de medición de rendimiento del procesador de expedientes.
+Incluye un generador de expedientes sintéticos y una prueba de rendimiento de
+extremo a extremo que se ejecutan sin acceso a las carpetas reales de clientes.
+"""
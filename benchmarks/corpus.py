@@ -0,0 +1,247 @@
+"""
+Generador de un árbol sintético de expedientes para pruebas de rendimiento.
+
+Crea carpetas con la misma estructura que la ruta institucional
+("NNN NOMBRE/01. CUADERNO PRINCIPAL/Aceptación de solicitud....docx"), formatos
+de notificación por operador y el archivo de mapeo de operadores. Una fracción
+configurable de expedientes incluye casos problemáticos: carpetas " 00 ",
+expedientes sin cuaderno principal, documentos dañados, datos faltantes y
+operadores sin formato.
+
+Uso:
+    python -m benchmarks.corpus DIRECTORIO --expedientes 5000
+"""
+
+import io
+import os
+import sys
+import json
+import random
+import argparse
+from xml.sax.saxutils import escape
+
+from docx import Document
+
+# Permitir la ejecución como script desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.docx_helper import write_docx_parts
+
+# Operadores con formato y uno sin formato (para el caso "operador desconocido")
+OPERADORES = [
+    "DIANA PATRICIA MANGA GUERRERO",
+    "MARÍA FERNANDA LÓPEZ TORRES",
+    "JORGE ELIÉCER PATIÑO ROJAS",
+    "ANDREA CAROLINA MEJÍA SALAZAR"
+]
+OPERADOR_SIN_FORMATO = "PEDRO PABLO ARIZA GUERRERO"
+
+NOMBRES = ["JUAN", "CARLOS", "LUIS", "ANDRES", "JOSE", "MARIA", "ANA", "LAURA", "DIANA", "SANDRA",
+           "CAMILO", "FELIPE", "PAOLA", "ELVIN", "CECILIA", "JORGE", "MARTHA", "RICARDO", "SOFIA", "DAVID"]
+APELLIDOS = ["PEREZ", "GOMEZ", "RODRIGUEZ", "MARTINEZ", "GARCIA", "LOPEZ", "TORRES", "DURAN", "RAMIREZ",
+             "SANCHEZ", "CASTRO", "VARGAS", "MORALES", "ORTIZ", "JIMENEZ", "HERRERA", "MEDINA", "ROJAS"]
+MESES = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre",
+         "octubre", "noviembre", "diciembre"]
+
+PARRAFOS_RELLENO = [
+    "De conformidad con lo dispuesto en los artículos 531 y siguientes del Código General del Proceso, "
+    "este centro de conciliación procede a pronunciarse sobre la solicitud presentada.",
+    "Revisada la documentación aportada, se encuentra que la solicitud cumple con los requisitos "
+    "exigidos por el artículo 539 del Código General del Proceso.",
+    "Se ordena comunicar la presente decisión a los acreedores relacionados en la solicitud, en la "
+    "forma prevista por la ley, para que concurran a la audiencia.",
+    "Los acreedores podrán presentar sus objeciones a la relación de acreencias dentro de la "
+    "audiencia, conforme al procedimiento establecido.",
+    "Se advierte a los acreedores que a partir de la aceptación no podrán iniciarse nuevos procesos "
+    "ejecutivos contra el deudor y se suspenderán los que estuvieren en curso.",
+    "El operador designado manifiesta no estar incurso en causal de impedimento alguna y acepta el "
+    "encargo conforme a las tarifas reglamentarias vigentes.",
+    "Las comunicaciones podrán remitirse a la dirección electrónica registrada por el centro de "
+    "conciliación para efectos del presente trámite."
+]
+
+_PARRAFO = '<w:p><w:r><w:t xml:space="preserve">{}</w:t></w:r></w:p>'
+_PARRAFO_NEGRITA = ('<w:p><w:r><w:t xml:space="preserve">{}</w:t></w:r>'
+                    '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{}</w:t></w:r></w:p>')
+
+class GeneradorCorpus:
+    """
+    Generador determinista (según la semilla) de expedientes sintéticos.
+    """
+
+    def __init__(self, directorio, semilla=0):
+        """
+        Args:
+            directorio (str): Carpeta donde se crea el corpus
+            semilla (int): Semilla del generador aleatorio
+        """
+        self.directorio = directorio
+        self.ruta_expedientes = os.path.join(directorio, "expedientes")
+        self.ruta_formatos = os.path.join(directorio, "formatos")
+        self.archivo_mapeo = os.path.join(directorio, "operadores.json")
+        self.aleatorio = random.Random(semilla)
+
+        # Documento base de python-docx: se reutiliza su paquete y solo se
+        # reescribe word/document.xml para cada expediente
+        base = io.BytesIO()
+        Document().save(base)
+        self._base = base.getvalue()
+        documento = Document(io.BytesIO(self._base)).part.blob.decode('utf-8')
+        inicio_cuerpo = documento.index('<w:body>') + len('<w:body>')
+        self._prefijo = documento[:inicio_cuerpo]
+        self._sufijo = documento[documento.index('<w:sectPr'):]
+
+    def _documento(self, parrafos_xml):
+        """
+        Genera el contenido de un .docx con los párrafos indicados.
+
+        Args:
+            parrafos_xml (list): Párrafos ya convertidos a XML
+
+        Returns:
+            bytes: Contenido del .docx
+        """
+        xml = (self._prefijo + ''.join(parrafos_xml) + self._sufijo).encode('utf-8')
+        salida = io.BytesIO()
+        write_docx_parts(self._base, {'word/document.xml': xml}, salida)
+        return salida.getvalue()
+
+    def _fecha(self):
+        return f"{self.aleatorio.randint(1, 28)} de {self.aleatorio.choice(MESES)} de 2025"
+
+    def _aceptacion(self, numero, deudor, operador, completo=True):
+        """
+        Genera el texto de un archivo de aceptación de solicitud.
+
+        Args:
+            numero (int): Número del expediente
+            deudor (str): Nombre del deudor
+            operador (str): Nombre del operador que firma
+            completo (bool): Si es False se omite la cédula (datos faltantes)
+
+        Returns:
+            bytes: Contenido del .docx
+        """
+        p = lambda texto: _PARRAFO.format(escape(texto))
+        parrafos = [
+            p("CENTRO DE CONCILIACIÓN CORPORACIÓN AVANCEMOS S.A.S."),
+            p(f"Radicado: 2025-{numero:05d}"),
+            p("AUTO DE ACEPTACIÓN DE SOLICITUD DE NEGOCIACIÓN DE DEUDAS"),
+            p("Deudor"),
+            p(deudor),
+        ]
+        if completo:
+            cedula = f"{self.aleatorio.randint(1, 99)}.{self.aleatorio.randint(0, 999):03d}.{self.aleatorio.randint(0, 999):03d}"
+            parrafos.append(p(f"CC No. {cedula}"))
+        parrafos.append(p(f"El deudor presentó solicitud de negociación de sus deudas ante este centro "
+                          f"el día {self._fecha()}, la cual fue repartida al operador designado."))
+        for _ in range(self.aleatorio.randint(25, 60)):
+            parrafos.append(p(self.aleatorio.choice(PARRAFOS_RELLENO)))
+        parrafos.append(p(f"Se fija fecha para la audiencia de negociación de pasivos que se llevará a cabo "
+                          f"el día {self._fecha()} a las 9:00 a.m."))
+        parrafos.append(p("Notifíquese y cúmplase."))
+        parrafos.append(p("Atentamente,"))
+        parrafos.append(_PARRAFO_NEGRITA.format("", escape(operador)))
+        parrafos.append(p("Operador(a) de insolvencia"))
+        return self._documento(parrafos)
+
+    def _formato(self, operador):
+        """
+        Genera el formato de notificación a acreedores de un operador.
+
+        Args:
+            operador (str): Nombre del operador
+
+        Returns:
+            bytes: Contenido del .docx
+        """
+        p = lambda texto: _PARRAFO.format(escape(texto))
+        parrafos = [
+            p(operador),
+            p("Operador(a) de insolvencia"),
+            p("Señores"),
+            p("ACREEDORES"),
+            _PARRAFO_NEGRITA.format("", "**Deudor:**"),
+            _PARRAFO_NEGRITA.format("", "**C.C.**"),
+            _PARRAFO_NEGRITA.format("", "**Radicado:**"),
+            p("Por medio de la presente se les comunica que el deudor presentó solicitud el día "
+              "**\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_**"),
+            p("y se fijó la audiencia de negociación de deudas para el día "
+              "**\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_\\_-**"),
+        ] + [p(texto) for texto in PARRAFOS_RELLENO]
+        return self._documento(parrafos)
+
+    def generar(self, cantidad, proporcion_problemas=0.1, proporcion_notificaciones=0.3):
+        """
+        Genera el árbol de expedientes.
+
+        Args:
+            cantidad (int): Número de expedientes a crear
+            proporcion_problemas (float): Fracción de expedientes con algún problema
+            proporcion_notificaciones (float): Fracción con carpeta "02. NOTIFICACIONES" ya creada
+
+        Returns:
+            dict: Cantidad de expedientes creados por tipo
+        """
+        os.makedirs(self.ruta_expedientes, exist_ok=True)
+        os.makedirs(self.ruta_formatos, exist_ok=True)
+
+        mapeo = {}
+        for indice, operador in enumerate(OPERADORES, start=1):
+            nombre_formato = f"{indice:02d}. NOTIFICACION ACREEDORES {operador.split()[0]}.docx"
+            with open(os.path.join(self.ruta_formatos, nombre_formato), 'wb') as f:
+                f.write(self._formato(operador))
+            mapeo[operador] = nombre_formato
+        with open(self.archivo_mapeo, 'w', encoding='utf-8') as f:
+            json.dump(mapeo, f, indent=4, ensure_ascii=False)
+
+        problemas = ("ignorado_00", "sin_cuaderno", "documento_danado", "datos_faltantes", "operador_desconocido")
+        resumen = {tipo: 0 for tipo in ("valido",) + problemas}
+        for numero in range(1, cantidad + 1):
+            deudor = " ".join([self.aleatorio.choice(NOMBRES), self.aleatorio.choice(NOMBRES),
+                               self.aleatorio.choice(APELLIDOS), self.aleatorio.choice(APELLIDOS)])
+            tipo = "valido"
+            if self.aleatorio.random() < proporcion_problemas:
+                tipo = self.aleatorio.choice(problemas)
+            resumen[tipo] += 1
+
+            if tipo == "ignorado_00":
+                nombre_carpeta = f"{numero:03d} 00 {deudor}"
+            else:
+                nombre_carpeta = f"{numero:03d} {deudor}"
+            ruta_expediente = os.path.join(self.ruta_expedientes, nombre_carpeta)
+            os.makedirs(ruta_expediente, exist_ok=True)
+            if tipo == "sin_cuaderno":
+                continue
+
+            cuaderno = os.path.join(ruta_expediente, "01. CUADERNO PRINCIPAL")
+            os.makedirs(cuaderno, exist_ok=True)
+            if self.aleatorio.random() < proporcion_notificaciones:
+                os.makedirs(os.path.join(ruta_expediente, "02. NOTIFICACIONES"), exist_ok=True)
+
+            if tipo == "documento_danado":
+                contenido = bytes(self.aleatorio.getrandbits(8) for _ in range(2048))
+            else:
+                operador = OPERADOR_SIN_FORMATO if tipo == "operador_desconocido" else self.aleatorio.choice(OPERADORES)
+                contenido = self._aceptacion(numero, deudor, operador, completo=(tipo != "datos_faltantes"))
+
+            nombre_archivo = f"Aceptación de solicitud {deudor.title()}.docx"
+            with open(os.path.join(cuaderno, nombre_archivo), 'wb') as f:
+                f.write(contenido)
+
+        return resumen
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un árbol sintético de expedientes")
+    parser.add_argument("directorio", help="Carpeta donde se crea el corpus")
+    parser.add_argument("--expedientes", type=int, default=1000, help="Número de expedientes")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador aleatorio")
+    parser.add_argument("--problemas", type=float, default=0.1, help="Fracción de expedientes con problemas")
+    args = parser.parse_args(argv)
+
+    generador = GeneradorCorpus(args.directorio, args.semilla)
+    resumen = generador.generar(args.expedientes, args.problemas)
+    print(json.dumps(resumen, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Prueba de rendimiento de extremo a extremo de ProcesadorExpedientes.
+
+Genera (o reutiliza) un corpus sintético, ejecuta procesar_expedientes sobre él y
+reporta expedientes por segundo, percentiles de latencia por etapa y el pico de
+memoria. El resultado puede guardarse como línea base y compararse en ejecuciones
+posteriores para detectar regresiones. No requiere acceso a red ni a las carpetas
+reales de expedientes.
+
+Uso:
+    python -m benchmarks.rendimiento --expedientes 5000 --workers 4
+    python -m benchmarks.rendimiento --linea-base benchmarks/linea_base.json --guardar-linea-base
+    python -m benchmarks.rendimiento --latencia-ms 20 --bloqueo-s 5 --proporcion-bloqueo 0.02 --timeout 1
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+from collections import defaultdict
+
+# Permitir la ejecución como script desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.procesador import ProcesadorExpedientes
+from app.utils.memoria import pico_memoria_mb
+from benchmarks.corpus import GeneradorCorpus
+from benchmarks.sistema_lento import SistemaArchivosLento
+
+def ejecutar(directorio, workers=1, nivel_log='WARNING', sistema_archivos=None, timeout=None):
+    """
+    Ejecuta procesar_expedientes sobre un corpus y mide el rendimiento.
+
+    Args:
+        directorio (str): Carpeta del corpus (ver GeneradorCorpus)
+        workers (int): Número de procesos
+        nivel_log (str): Nivel de log del procesador
+        sistema_archivos (SistemaArchivos): Sistema de archivos a usar (p. ej. uno lento)
+        timeout (float): Plazo de cada lectura o escritura (timeout_conexion)
+
+    Returns:
+        dict: Resultados de la medición
+    """
+    ruta_log = os.path.join(directorio, "logs")
+    shutil.rmtree(ruta_log, ignore_errors=True)
+    config = {
+        'ruta_expedientes': os.path.join(directorio, "expedientes"),
+        'ruta_formatos': os.path.join(directorio, "formatos"),
+        'archivo_mapeo': os.path.join(directorio, "operadores.json"),
+        'ruta_log': ruta_log,
+        'nivel_log': nivel_log,
+        'log_consola': False
+    }
+    if sistema_archivos is not None:
+        config['sistema_archivos'] = sistema_archivos
+    if timeout is not None:
+        config['timeout_conexion'] = timeout
+
+    estados = defaultdict(int)
+    motivos = defaultdict(int)
+
+    def registrar(resultado):
+        estados[resultado['estado']] += 1
+        motivos[resultado['motivo']] += 1
+
+    inicio = time.perf_counter()
+    procesador = ProcesadorExpedientes(config, workers=workers, forzar=True)
+    inicializacion = time.perf_counter() - inicio
+    procesador.procesar_expedientes(al_procesar=registrar)
+    total = time.perf_counter() - inicio
+
+    # Las etapas las mide el propio procesador (también dentro de los workers)
+    resumen = procesador.metricas.resumen()
+    etapas = {'expediente': resumen['expedientes'], **resumen['etapas_ms']}
+
+    expedientes = sum(estados.values())
+    return {
+        'expedientes': expedientes,
+        'workers': procesador.workers,
+        'segundos': round(total, 3),
+        'inicializacion_s': round(inicializacion, 3),
+        'expedientes_por_segundo': round(expedientes / total, 2) if total else None,
+        'estados': dict(estados),
+        'motivos': dict(motivos),
+        'etapas_ms': etapas,
+        'pico_memoria_mb': pico_memoria_mb(),
+        'mas_lentos': resumen['mas_lentos']
+    }
+
+def comparar(resultado, linea_base, tolerancia):
+    """
+    Compara un resultado con la línea base.
+
+    Args:
+        resultado (dict): Resultado actual
+        linea_base (dict): Resultado de referencia
+        tolerancia (float): Pérdida de rendimiento admitida (fracción)
+
+    Returns:
+        tuple: (lista de líneas del reporte, True si hay regresión)
+    """
+    lineas = []
+    actual = resultado['expedientes_por_segundo']
+    base = linea_base['expedientes_por_segundo']
+    variacion = (actual - base) / base if base else 0
+    lineas.append(f"Expedientes/s: {actual} (línea base {base}, {variacion:+.1%})")
+
+    for etapa, medidas in resultado['etapas_ms'].items():
+        base_etapa = linea_base.get('etapas_ms', {}).get(etapa, {})
+        if 'p95' in medidas and base_etapa.get('p95'):
+            lineas.append(f"p95 {etapa}: {medidas['p95']} ms (línea base {base_etapa['p95']} ms)")
+
+    if resultado.get('pico_memoria_mb') and linea_base.get('pico_memoria_mb'):
+        lineas.append(f"Pico de memoria: {resultado['pico_memoria_mb']} MB "
+                      f"(línea base {linea_base['pico_memoria_mb']} MB)")
+
+    return lineas, variacion < -tolerancia
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de rendimiento del procesador de expedientes")
+    parser.add_argument("--directorio", help="Carpeta del corpus (por defecto, una carpeta temporal)")
+    parser.add_argument("--expedientes", type=int, default=1000, help="Número de expedientes a generar")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del corpus")
+    parser.add_argument("--workers", type=int, default=1, help="Número de procesos (0 = todos los núcleos)")
+    parser.add_argument("--reutilizar", action="store_true", help="Reutilizar el corpus si ya existe")
+    parser.add_argument("--latencia-ms", type=float, default=0, help="Latencia simulada de cada lectura o escritura")
+    parser.add_argument("--bloqueo-s", type=float, default=0,
+                        help="Duración simulada de la primera lectura de un archivo bloqueado")
+    parser.add_argument("--proporcion-bloqueo", type=float, default=0,
+                        help="Fracción de archivos que se bloquean en su primera lectura")
+    parser.add_argument("--timeout", type=float, help="Plazo de cada lectura o escritura en segundos "
+                                                      "(por defecto, el de la configuración)")
+    parser.add_argument("--linea-base", help="Archivo JSON con la línea base")
+    parser.add_argument("--guardar-linea-base", action="store_true", help="Guardar el resultado como línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Pérdida de rendimiento admitida (fracción)")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar el resultado")
+    args = parser.parse_args(argv)
+
+    directorio = args.directorio or tempfile.mkdtemp(prefix="corpus_expedientes_")
+    temporal = not args.directorio
+
+    try:
+        if not (args.reutilizar and os.path.isdir(os.path.join(directorio, "expedientes"))):
+            inicio = time.perf_counter()
+            tipos = GeneradorCorpus(directorio, args.semilla).generar(args.expedientes)
+            print(f"Corpus generado en {time.perf_counter() - inicio:.1f} s: {tipos}", file=sys.stderr)
+
+        sistema = None
+        if args.latencia_ms or (args.bloqueo_s and args.proporcion_bloqueo):
+            sistema = SistemaArchivosLento(args.latencia_ms, args.bloqueo_s, args.proporcion_bloqueo, args.semilla)
+        resultado = ejecutar(directorio, args.workers, sistema_archivos=sistema, timeout=args.timeout)
+        resultado['corpus'] = {'expedientes': args.expedientes, 'semilla': args.semilla}
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+        codigo = 0
+        if args.linea_base and os.path.exists(args.linea_base) and not args.guardar_linea_base:
+            with open(args.linea_base, 'r', encoding='utf-8') as f:
+                lineas, regresion = comparar(resultado, json.load(f), args.tolerancia)
+            print("\n".join(lineas), file=sys.stderr)
+            if regresion:
+                print("Regresión de rendimiento respecto a la línea base", file=sys.stderr)
+                codigo = 1
+
+        if args.linea_base and args.guardar_linea_base:
+            with open(args.linea_base, 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, ensure_ascii=False, indent=2)
+            print(f"Línea base guardada en {args.linea_base}", file=sys.stderr)
+
+        return codigo
+
+    finally:
+        if temporal:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
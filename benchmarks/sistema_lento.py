@@ -0,0 +1,70 @@
+"""
+Sistema de archivos local lento para pruebas del acceso con plazo.
+
+Simula una carpeta sincronizada con OneDrive sobre el disco local: cada
+operación tarda una latencia fija y una fracción de los archivos (elegida de
+forma determinista por su nombre) se queda detenida la primera vez que se lee,
+como un archivo que solo está en la nube y se descarga al abrirlo. Se usa como
+'sistema_archivos' en la configuración del procesador.
+
+Uso:
+    python -m benchmarks.rendimiento --latencia-ms 20 --bloqueo-s 5 --proporcion-bloqueo 0.02 --timeout 1
+"""
+
+import os
+import sys
+import time
+import zlib
+
+# Permitir la ejecución como script desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.acceso_archivos import SistemaArchivos
+
+class SistemaArchivosLento(SistemaArchivos):
+    """
+    Sistema de archivos real con latencia y bloqueos simulados. Los archivos ya
+    descargados se recuerdan por proceso, de modo que un reintento posterior
+    (al final del lote) los encuentra disponibles.
+    """
+
+    def __init__(self, latencia_ms=0, bloqueo_s=0, proporcion_bloqueo=0, semilla=0):
+        """
+        Args:
+            latencia_ms (float): Duración adicional de cada lectura o escritura
+            bloqueo_s (float): Duración de la primera lectura de un archivo bloqueado
+            proporcion_bloqueo (float): Fracción de los archivos que se bloquean (0 a 1)
+            semilla (int): Semilla para elegir los archivos bloqueados
+        """
+        self.latencia_ms = float(latencia_ms)
+        self.bloqueo_s = float(bloqueo_s)
+        self.proporcion_bloqueo = float(proporcion_bloqueo)
+        self.semilla = semilla
+        self.descargados = set()
+
+    def bloqueado(self, ruta_archivo):
+        """
+        Indica si un archivo está entre los que se bloquean al leerlos.
+
+        Args:
+            ruta_archivo (str): Ruta al archivo
+
+        Returns:
+            bool: True si la primera lectura del archivo se detiene
+        """
+        clave = f"{self.semilla}:{os.path.basename(ruta_archivo)}".encode('utf-8')
+        return zlib.crc32(clave) / 0x100000000 < self.proporcion_bloqueo
+
+    def leer(self, ruta_archivo):
+        self._esperar()
+        if self.bloqueo_s and ruta_archivo not in self.descargados and self.bloqueado(ruta_archivo):
+            time.sleep(self.bloqueo_s)
+        self.descargados.add(ruta_archivo)
+        return super().leer(ruta_archivo)
+
+    def escribir(self, ruta_archivo, datos):
+        self._esperar()
+        super().escribir(ruta_archivo, datos)
+
+    def _esperar(self):
+        if self.latencia_ms:
+            time.sleep(self.latencia_ms / 1000)
@@ -156,6 +156,8 @@ def crear_ejecutable(nombre_app, version):
             "--clean",
             f"--add-data=app;app",
             f"--add-data=data;data",
+            # Módulos importados de forma diferida (PEP 562)
+            "--hidden-import=app.procesador",
             icon_param,
             f"--version-file=file_version_info.txt",
             "run.py"
@@ -5,9 +5,15 @@ Este script inicia la interfaz gráfica de usuario y gestiona la inicialización
 de la aplicación.
 """
 
+import time
+
+# Referencia para medir el tiempo de arranque
+INICIO_ARRANQUE = time.perf_counter()
+
 import os
 import sys
 import traceback
+import multiprocessing
 from pathlib import Path
 
 # Asegurarse de que la ruta actual está en el path
@@ -17,20 +23,31 @@ if current_dir not in sys.path:
 
 # Intentar importaciones con manejo de errores
 try:
+    # Medidor de arranque (módulo liviano, solo biblioteca estándar)
+    from app.utils.arranque import MedidorArranque
+    medidor = MedidorArranque(INICIO_ARRANQUE)
+    
+    # Medición detallada de importaciones (equivalente a -X importtime)
+    if "--medir-importaciones" in sys.argv or os.environ.get("PROCESADOR_MEDIR_IMPORTACIONES"):
+        medidor.activar_importaciones()
+    
     # Inicializar la aplicación
-    from app import init_app
-    init_app()
+    with medidor.medir("importar app"):
+        from app import init_app
+        init_app()
     
     # Importar configuraciones
-    from app.config import CONFIG
-    from app.config.settings import UI_CONFIG, DEFAULT_PATHS
+    with medidor.medir("cargar configuración"):
+        from app.config import CONFIG
+        from app.config.settings import UI_CONFIG, DEFAULT_PATHS
     
     # Importar módulo de logging
     from app.utils.logger import setup_logger
     
     # Importar interfaz gráfica
-    import customtkinter as ctk
-    from app.ui.main_window import SeleccionadorExpedientes
+    with medidor.medir("importar interfaz gráfica"):
+        import customtkinter as ctk
+        from app.ui.main_window import SeleccionadorExpedientes
     
 except ImportError as e:
     # Si falla alguna importación, mostrar mensaje de error y salir
@@ -70,7 +87,8 @@ def main():
         
         # Iniciar interfaz gráfica
         logger.info("Iniciando interfaz gráfica")
-        app = SeleccionadorExpedientes()
+        with medidor.medir("crear ventana"):
+            app = SeleccionadorExpedientes()
         
         # Configurar ventana principal
         ancho_minimo = CONFIG.getint("INTERFAZ", "ancho_minimo", fallback=800)
@@ -88,6 +106,23 @@ def main():
         # Mensaje de bienvenida en el log
         logger.info("Aplicación iniciada correctamente")
         
+        # Una vez visible la ventana, precargar el procesador en segundo plano
+        # y registrar el reporte de arranque
+        def finalizar_arranque():
+            medidor.marcar("precarga completa")
+            medidor.desactivar_importaciones()
+            logger.info(medidor.reporte())
+            try:
+                medidor.guardar(log_path)
+            except Exception as e:
+                logger.warning(f"No se pudo guardar el reporte de arranque: {str(e)}")
+        
+        def ventana_visible():
+            medidor.marcar("ventana visible")
+            app.iniciar_precarga(al_terminar=finalizar_arranque)
+        
+        app.after(0, ventana_visible)
+        
         # Iniciar el bucle principal de la aplicación
         app.mainloop()
         
@@ -120,4 +155,6 @@ def main():
     return 0
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""
+Configuración común de las pruebas: permite importar 'app' y 'benchmarks'
+desde la raíz del proyecto.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
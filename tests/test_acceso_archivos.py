@@ -0,0 +1,93 @@
+"""
+Pruebas del acceso a archivos con plazo sobre un sistema de archivos lento
+(benchmarks/sistema_lento.py) y del aplazamiento de los expedientes sin respuesta.
+"""
+
+import json
+import threading
+
+import pytest
+from docx import Document
+
+from app.procesador import ProcesadorExpedientes
+from app.utils.acceso_archivos import AccesoArchivos, TiempoAgotado, _HilosPlazo
+from app.utils.plan import MOTIVO_TIEMPO_AGOTADO
+from benchmarks.sistema_lento import SistemaArchivosLento
+
+class SistemaContado(SistemaArchivosLento):
+    """Sistema lento que cuenta las lecturas de cada archivo."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lecturas = {}
+
+    def leer(self, ruta_archivo):
+        self.lecturas[ruta_archivo] = self.lecturas.get(ruta_archivo, 0) + 1
+        return super().leer(ruta_archivo)
+
+def _nombres_aceptacion(sistema):
+    """Un nombre de archivo de aceptación que se bloquea y otro que no."""
+    nombres = [f"Aceptación de solicitud {numero}.docx" for numero in range(100)]
+    bloqueado = next(nombre for nombre in nombres if sistema.bloqueado(nombre))
+    libre = next(nombre for nombre in nombres if not sistema.bloqueado(nombre))
+    return bloqueado, libre
+
+def test_lectura_bloqueada_agota_el_plazo_y_luego_responde(tmp_path):
+    sistema = SistemaArchivosLento(bloqueo_s=0.5, proporcion_bloqueo=1)
+    ruta = tmp_path / "archivo.docx"
+    ruta.write_bytes(b"contenido")
+    acceso = AccesoArchivos(timeout=0.1, intentos=0, sistema=sistema)
+
+    with pytest.raises(TiempoAgotado):
+        acceso.leer(str(ruta))
+    # Una vez descargado, el archivo responde dentro del plazo
+    AccesoArchivos(timeout=2, intentos=0, sistema=sistema).leer(str(ruta))
+    assert acceso.leer(str(ruta)) == b"contenido"
+
+def test_hilos_plazo_fallan_de_inmediato_al_llegar_al_maximo():
+    hilos = _HilosPlazo(max_hilos=2)
+    liberar = threading.Event()
+    detenidas = [hilos.ejecutar(liberar.wait) for _ in range(2)]
+    try:
+        with pytest.raises(TiempoAgotado):
+            hilos.ejecutar(liberar.wait)
+    finally:
+        liberar.set()
+    for futuro in detenidas:
+        assert futuro.result(5)
+
+def test_expediente_sin_respuesta_se_aplaza_al_final_del_lote(tmp_path):
+    sistema = SistemaContado(bloqueo_s=1, proporcion_bloqueo=0.5)
+    bloqueado, libre = _nombres_aceptacion(sistema)
+    ruta_expedientes = tmp_path / "expedientes"
+    for expediente, aceptacion in (("001 BLOQUEADO", bloqueado), ("002 LIBRE", libre)):
+        cuaderno = ruta_expedientes / expediente / "01. CUADERNO PRINCIPAL"
+        cuaderno.mkdir(parents=True)
+        documento = Document()
+        documento.add_paragraph("Radicado: 2025-001")
+        documento.save(str(cuaderno / aceptacion))
+    (tmp_path / "formatos").mkdir()
+    archivo_mapeo = tmp_path / "operadores.json"
+    archivo_mapeo.write_text(json.dumps({}), encoding='utf-8')
+
+    procesador = ProcesadorExpedientes({
+        'ruta_expedientes': str(ruta_expedientes),
+        'ruta_formatos': str(tmp_path / "formatos"),
+        'archivo_mapeo': str(archivo_mapeo),
+        'ruta_log': str(tmp_path / "logs"),
+        'nivel_log': 'ERROR',
+        'log_consola': False,
+        'log_asincrono': False,
+        'canalizacion': False,
+        'timeout_conexion': 0.2,
+        'intentos_reconexion': 0,
+        'sistema_archivos': sistema,
+    }, workers=1)
+    resultados = []
+    procesador.procesar_expedientes(al_procesar=resultados.append)
+
+    # El bloqueado se reintenta después del que respondió
+    assert [resultado['expediente'] for resultado in resultados] == ["002 LIBRE", "001 BLOQUEADO"]
+    assert resultados[1]['motivo'] == MOTIVO_TIEMPO_AGOTADO
+    ruta_bloqueado = str(ruta_expedientes / "001 BLOQUEADO" / "01. CUADERNO PRINCIPAL" / bloqueado)
+    assert sistema.lecturas[ruta_bloqueado] == 2
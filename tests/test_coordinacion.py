@@ -0,0 +1,78 @@
+"""
+Pruebas de las concesiones de expedientes entre equipos.
+"""
+
+import json
+import time
+
+from app.utils.coordinacion import (ConcesionesExpedientes, en_particion, CONCESION_ACTIVA,
+                                    CONCESION_TERMINADA)
+
+def _leer(carpeta, nombre):
+    with open(carpeta / f"{nombre}.json", encoding='utf-8') as f:
+        return json.load(f)
+
+def test_concesion_activa_de_otro_equipo_no_se_toma(tmp_path):
+    equipo_a = ConcesionesExpedientes(str(tmp_path), nodo="A")
+    equipo_b = ConcesionesExpedientes(str(tmp_path), nodo="B")
+    try:
+        assert equipo_a.tomar("001", "10:1")
+        assert not equipo_b.tomar("001", "10:1")
+    finally:
+        equipo_a.cerrar()
+        equipo_b.cerrar()
+
+def test_concesion_vencida_se_recupera(tmp_path):
+    equipo_a = ConcesionesExpedientes(str(tmp_path), nodo="A", duracion=60)
+    equipo_b = ConcesionesExpedientes(str(tmp_path), nodo="B", duracion=60)
+    try:
+        assert equipo_a.tomar("001", "10:1")
+        # El equipo A dejó de renovarla hace más de 'duracion' segundos
+        concesion = _leer(tmp_path, "001")
+        concesion['renovada'] = time.time() - 120
+        (tmp_path / "001.json").write_text(json.dumps(concesion), encoding='utf-8')
+
+        assert equipo_b.tomar("001", "10:1")
+        assert equipo_b.recuperadas == 1
+        concesion = _leer(tmp_path, "001")
+        assert concesion['nodo'] == "B" and concesion['estado'] == CONCESION_ACTIVA
+    finally:
+        equipo_b.cerrar()
+
+def test_concesion_terminada_se_respeta_mientras_no_cambie_el_archivo(tmp_path):
+    equipo_a = ConcesionesExpedientes(str(tmp_path), nodo="A")
+    equipo_b = ConcesionesExpedientes(str(tmp_path), nodo="B")
+    try:
+        assert equipo_a.tomar("001", "10:1")
+        equipo_a.terminar("001")
+        assert _leer(tmp_path, "001")['estado'] == CONCESION_TERMINADA
+
+        assert not equipo_b.tomar("001", "10:1")
+        # Otro archivo de aceptación o un procesamiento forzado sí la toman
+        assert equipo_b.tomar("001", "10:1", forzar=True)
+        equipo_b.terminar("001")
+        assert equipo_a.tomar("001", "20:2")
+    finally:
+        equipo_a.cerrar()
+        equipo_b.cerrar()
+
+def test_renovar_no_reactiva_una_concesion_terminada(tmp_path):
+    concesiones = ConcesionesExpedientes(str(tmp_path), nodo="A")
+    try:
+        assert concesiones.tomar("001", "10:1")
+        concesiones.terminar("001")
+        assert concesiones.renovar() == 0
+        assert _leer(tmp_path, "001")['estado'] == CONCESION_TERMINADA
+    finally:
+        concesiones.cerrar()
+
+def test_cerrar_libera_las_concesiones_activas(tmp_path):
+    concesiones = ConcesionesExpedientes(str(tmp_path), nodo="A")
+    assert concesiones.tomar("001", "10:1")
+    concesiones.cerrar()
+    assert not (tmp_path / "001.json").exists()
+
+def test_particion_reparte_cada_expediente_a_un_solo_equipo():
+    for numero in range(20):
+        nombre = f"{numero:03d} EXPEDIENTE"
+        assert sum(en_particion(nombre, nodo, 3) for nodo in (1, 2, 3)) == 1
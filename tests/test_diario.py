@@ -0,0 +1,57 @@
+"""
+Pruebas del diario del lote usado para reanudar un procesamiento interrumpido.
+"""
+
+from app.utils.diario import DiarioLote, leer_lote_interrumpido
+
+def _resultado(expediente, estado='procesado'):
+    return {'expediente': expediente, 'estado': estado, 'motivo': 'generar'}
+
+def test_ultima_linea_truncada_reanuda_desde_la_ultima_completa(tmp_path):
+    ruta = tmp_path / "diario_lote.jsonl"
+    diario = DiarioLote(str(ruta))
+    diario.iniciar("/expedientes")
+    diario.registrar(_resultado("001"))
+    diario.registrar(_resultado("002", 'al_dia'))
+    diario.registrar(_resultado("003"))
+    diario.cerrar(terminado=False)
+    # Cierre inesperado mientras se escribía la última línea
+    contenido = ruta.read_bytes()
+    ruta.write_bytes(contenido[:-15])
+
+    terminados = leer_lote_interrumpido(str(ruta), "/expedientes")
+
+    assert sorted(terminados) == ["001", "002"]
+    assert terminados["002"]['estado'] == 'al_dia'
+
+def test_reanudar_despues_de_una_linea_truncada(tmp_path):
+    ruta = tmp_path / "diario_lote.jsonl"
+    diario = DiarioLote(str(ruta))
+    diario.iniciar("/expedientes")
+    diario.registrar(_resultado("001"))
+    diario.registrar(_resultado("002"))
+    diario.cerrar(terminado=False)
+    ruta.write_bytes(ruta.read_bytes()[:-15])
+
+    diario = DiarioLote(str(ruta))
+    diario.iniciar("/expedientes", continuar=True)
+    diario.registrar(_resultado("003"))
+    diario.cerrar(terminado=False)
+
+    assert sorted(leer_lote_interrumpido(str(ruta), "/expedientes")) == ["001", "003"]
+
+def test_lote_terminado_u_otra_ruta_no_se_reanudan(tmp_path):
+    ruta = tmp_path / "diario_lote.jsonl"
+    diario = DiarioLote(str(ruta))
+    diario.iniciar("/expedientes")
+    diario.registrar(_resultado("001"))
+    diario.cerrar(terminado=False)
+
+    assert leer_lote_interrumpido(str(ruta), "/otros") is None
+
+    diario = DiarioLote(str(ruta))
+    diario.iniciar("/expedientes", continuar=True)
+    diario.cerrar(terminado=True)
+
+    assert leer_lote_interrumpido(str(ruta), "/expedientes") is None
+    assert leer_lote_interrumpido(str(tmp_path / "no_existe.jsonl"), "/expedientes") is None
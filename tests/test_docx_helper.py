@@ -0,0 +1,80 @@
+"""
+Pruebas de la escritura de documentos por partes y del reemplazo de texto.
+"""
+
+import io
+import zipfile
+
+from docx import Document
+from docx.shared import Pt
+
+from app.utils.docx_helper import write_docx_parts, replace_text_in_doc
+
+def _plantilla():
+    doc = Document()
+    doc.add_paragraph("Deudor: **Deudor:**")
+    flujo = io.BytesIO()
+    doc.save(flujo)
+    return flujo.getvalue()
+
+def test_write_docx_parts_se_abre_y_conserva_los_miembros(tmp_path):
+    plantilla = _plantilla()
+    with zipfile.ZipFile(io.BytesIO(plantilla)) as zip_plantilla:
+        documento = zip_plantilla.read('word/document.xml')
+        originales = {nombre: zip_plantilla.read(nombre) for nombre in zip_plantilla.namelist()}
+    nuevo = documento.replace(b'**Deudor:**', b'JUAN P\xc3\x89REZ')
+    destino = tmp_path / "salida.docx"
+
+    write_docx_parts(plantilla, {'word/document.xml': nuevo}, io.FileIO(destino, 'wb'))
+
+    with zipfile.ZipFile(destino) as zip_salida:
+        assert zip_salida.testzip() is None
+        assert zip_salida.namelist() == list(originales)
+        for nombre, datos in originales.items():
+            if nombre == 'word/document.xml':
+                assert zip_salida.read(nombre) == nuevo
+            else:
+                assert zip_salida.read(nombre) == datos
+    textos = [parrafo.text for parrafo in Document(str(destino)).paragraphs]
+    assert "Deudor: JUAN PÉREZ" in textos
+
+def test_write_docx_parts_copia_los_datos_comprimidos(tmp_path):
+    plantilla = _plantilla()
+    destino = io.BytesIO()
+
+    write_docx_parts(plantilla, {}, destino)
+
+    with zipfile.ZipFile(io.BytesIO(plantilla)) as original, zipfile.ZipFile(destino) as copia:
+        for info in original.infolist():
+            copiado = copia.getinfo(info.filename)
+            assert (copiado.CRC, copiado.compress_size, copiado.compress_type) == \
+                (info.CRC, info.compress_size, info.compress_type)
+
+def test_reemplazo_repartido_en_varios_runs_conserva_el_formato():
+    doc = Document()
+    parrafo = doc.add_paragraph()
+    parrafo.add_run("Señor ")
+    primero = parrafo.add_run("**Deu")
+    primero.bold = True
+    primero.font.size = Pt(14)
+    parrafo.add_run("dor:")
+    ultimo = parrafo.add_run("** y fin")
+    ultimo.italic = True
+
+    reemplazado = replace_text_in_doc(doc, [{'original': '**Deudor:**', 'nuevo': 'JUAN PÉREZ'}])
+
+    assert reemplazado
+    assert parrafo.text == "Señor JUAN PÉREZ y fin"
+    runs = parrafo.runs
+    assert runs[1].text == "JUAN PÉREZ"
+    assert runs[1].bold and runs[1].font.size == Pt(14)
+    assert runs[2].text == ""
+    assert runs[3].text == " y fin" and runs[3].italic
+
+def test_reemplazo_en_tablas_y_sin_coincidencias():
+    doc = Document()
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "C.C. **C.C.**"
+
+    assert replace_text_in_doc(doc, [{'original': '**C.C.**', 'nuevo': '123'}])
+    assert doc.tables[0].cell(0, 0).text == "C.C. 123"
+    assert not replace_text_in_doc(doc, [{'original': '**Radicado:**', 'nuevo': '1'}])